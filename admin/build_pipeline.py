@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Miami Alliance 3PL - Static Build Pipeline
+==========================================
+Shared write path for generated site files (blog.html, blog/page/*,
+blog/category/*, sitemaps). Every artifact is hashed and written only when
+its content changed, via a temp file and rename, so unchanged outputs keep
+their mtime and don't dirty git. The site deploys from git (GitHub Pages),
+so what changed since the last deploy is simply the pushed diff.
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+
+def sha256_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def write_atomic_bytes(path, data):
+    """Write bytes via a temp file in the same directory and rename it into place."""
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+            handle.flush()
+            os.fsync(handle.fileno())
+        if path.exists():
+            shutil.copymode(path, tmp_name)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+def write_atomic(path, text):
+    """Write text via a temp file in the same directory and rename it into place."""
+    write_atomic_bytes(path, text.encode("utf-8"))
+
+
+class BuildPipeline:
+    """
+    Content-addressed writer for generated artifacts.
+
+    write() compares the new content's SHA-256 with the file on disk and
+    only replaces the file when they differ; with dry_run nothing is
+    touched but the same bookkeeping happens.
+    """
+
+    def __init__(self, dry_run=False):
+        self.dry_run = dry_run
+        self.written, self.unchanged, self.removed = [], [], []
+
+    def write(self, path, content):
+        """Write str/bytes to `path` if it differs from what is there. Returns True if changed."""
+        path = Path(path)
+        data = content.encode("utf-8") if isinstance(content, str) else content
+
+        if path.exists() and sha256_bytes(path.read_bytes()) == sha256_bytes(data):
+            self.unchanged.append(path)
+            return False
+
+        self.written.append(path)
+        if not self.dry_run:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            write_atomic_bytes(path, data)
+        return True
+
+    def remove(self, path):
+        """Delete a generated artifact that is no longer produced."""
+        path = Path(path)
+        self.removed.append(path)
+        if not self.dry_run:
+            path.unlink(missing_ok=True)
+
+    def report(self, label="files"):
+        verb = "Would write" if self.dry_run else "Wrote"
+        return (f"{verb} {len(self.written)} {label} "
+                f"({len(self.unchanged)} unchanged, {len(self.removed)} removed).")
+
@@ -41,10 +41,65 @@ function formatDate(d) {
   return d.toISOString().split("T")[0];
 }
 
-function generateInvoiceNumber() {
+// Invoice numbers come from the shared counters/{series} documents (also used
+// by generate_storage_invoice.py). One transaction reserves the whole run's
+// block; numbers left unused when an invoice cannot be written are recorded as
+// gaps on the counter instead of being reused. A missing counter starts above
+// the highest number already issued in the series, since earlier invoices in
+// the same month were numbered at random (e.g. INV-2026-03-4013).
+function highestIssued(snapshot, series) {
+  let highest = 0;
+  snapshot.forEach((doc) => {
+    const sequence = Number(String(doc.data().invoice_number).slice(series.length + 1));
+    if (Number.isInteger(sequence) && sequence > highest) highest = sequence;
+  });
+  return highest;
+}
+
+async function reserveInvoiceNumbers(count) {
   const now = new Date();
-  const rand = String(Math.floor(Math.random() * 9000) + 1000);
-  return `INV-${now.getFullYear()}-${String(now.getMonth() + 1).padStart(2, "0")}-${rand}`;
+  const series = `INV-${now.getFullYear()}-${String(now.getMonth() + 1).padStart(2, "0")}`;
+  const ref = db.collection("counters").doc(series);
+  const issued = db
+    .collection("invoices")
+    .where("invoice_number", ">=", `${series}-`)
+    .where("invoice_number", "<", `${series}.`);
+
+  const start = await db.runTransaction(async (tx) => {
+    const snap = await tx.get(ref);
+    const next = snap.exists
+      ? snap.data().next || 1
+      : highestIssued(await tx.get(issued), series) + 1;
+    tx.set(
+      ref,
+      { next: next + count, updated_at: now.toISOString() },
+      { merge: true },
+    );
+    return next;
+  });
+
+  const numbers = Array.from(
+    { length: count },
+    (_, i) => `${series}-${String(start + i).padStart(4, "0")}`,
+  );
+  return { series, start, numbers };
+}
+
+async function recordGap(series, start, end, reason) {
+  await db
+    .collection("counters")
+    .doc(series)
+    .set(
+      {
+        gaps: admin.firestore.FieldValue.arrayUnion({
+          start,
+          end,
+          reason,
+          recorded_at: new Date().toISOString(),
+        }),
+      },
+      { merge: true },
+    );
 }
 
 // ─── Main ────────────────────────────────────────────────────
@@ -100,193 +155,209 @@ async function main() {
 
   const results = [];
   const now = new Date();
-
-  for (const customer of customers) {
-    const custName =
-      customer.company_name || customer.name || customer.email || "Unknown";
-    const custEmail = customer.email || "N/A";
-
-    console.log(`  🔹 ${custName} (${custEmail})`);
-
-    // Check for unbilled events
-    let unbilledEvents = [];
-    try {
-      const eventsSnap = await db
-        .collection("billable_events")
-        .where("customer_id", "==", customer.id)
-        .where("invoiced", "==", false)
-        .get();
-
-      eventsSnap.forEach((doc) => {
-        unbilledEvents.push({ id: doc.id, ...doc.data() });
-      });
-    } catch (e) {
-      // Collection may not exist or no matching docs
-    }
-
-    // Check for unbilled activity log entries
-    let unbilledActivities = [];
-    try {
-      const actSnap = await db
-        .collection("activity_log")
-        .where("customer_id", "==", customer.id)
-        .where("billed", "==", false)
-        .get();
-
-      actSnap.forEach((doc) => {
-        unbilledActivities.push({ id: doc.id, ...doc.data() });
-      });
-    } catch (e) {
-      // May not exist
-    }
-
-    // Check for active shipments
-    let activeShipments = [];
-    try {
-      const shipSnap = await db
-        .collection("shipments")
-        .where("user_id", "==", customer.id)
-        .get();
-
-      shipSnap.forEach((doc) => {
-        activeShipments.push({ id: doc.id, ...doc.data() });
-      });
-    } catch (e) {
-      // May not exist
-    }
-
-    // Build line items from unbilled events
-    const lineItems = [];
-    let subtotal = 0;
-
-    if (unbilledEvents.length > 0) {
-      // Group events by type
-      const grouped = {};
-      unbilledEvents.forEach((evt) => {
-        const key = `${evt.event_type || "service"}|${evt.unit || "unit"}|${evt.rate || 0}`;
-        if (!grouped[key]) {
-          grouped[key] = {
-            category: evt.event_type || "service",
-            billing_item_id: evt.event_type || "service",
-            description: evt.description || evt.event_type || "Service",
-            unit: evt.unit || "unit",
-            rate: Number(evt.rate) || 0,
-            quantity: 0,
-            amount: 0,
-          };
-        }
-        grouped[key].quantity += Number(evt.quantity) || 1;
-        grouped[key].amount += Number(evt.amount) || 0;
-      });
-
-      Object.values(grouped).forEach((li) => {
-        lineItems.push(li);
-        subtotal += li.amount;
-      });
-    }
-
-    if (unbilledActivities.length > 0) {
-      const grouped = {};
-      unbilledActivities.forEach((act) => {
-        const type = act.billing_item_id || act.activity_type || "custom";
-        const key = `${type}|${act.unit || "unit"}|${Number(act.rate || 0).toFixed(4)}`;
-        if (!grouped[key]) {
-          grouped[key] = {
-            category: act.quote_category || type,
-            billing_item_id: type,
-            description: act.description || type,
-            unit: act.unit || "unit",
-            rate: Number(act.rate) || 0,
-            quantity: 0,
-            amount: 0,
-          };
-        }
-        grouped[key].quantity += Number(act.quantity) || 1;
-        grouped[key].amount += Number(act.amount) || 0;
-      });
-
-      Object.values(grouped).forEach((li) => {
-        lineItems.push(li);
-        subtotal += li.amount;
-      });
-    }
-
-    // If no billable items found, create a statement request (zero-balance or storage check)
-    if (lineItems.length === 0) {
-      lineItems.push({
-        category: "statement",
-        billing_item_id: "monthly_statement",
-        description: "Monthly Account Statement — No outstanding charges",
-        unit: "statement",
-        rate: 0,
-        quantity: 1,
-        amount: 0,
-      });
-    }
-
-    // Generate the invoice/request
-    const invNumber = generateInvoiceNumber();
-    const dueDate = new Date(now.getTime() + DUE_DAYS * 24 * 60 * 60 * 1000);
-
-    const invoiceData = {
-      invoice_number: invNumber,
-      customer_id: customer.id,
-      customer_name: custName,
-      customer_email: custEmail,
-      billing_period_start: formatDate(BILLING_PERIOD_START),
-      billing_period_end: formatDate(BILLING_PERIOD_END),
-      billing_cycle: "monthly",
-      due_date: formatDate(dueDate),
-      line_items: lineItems,
-      subtotal: subtotal,
-      tax_rate: 0,
-      tax_amount: 0,
-      total: subtotal,
-      amount_paid: 0,
-      status: "draft",
-      notes: `Auto-generated monthly billing request for ${custName}. ${unbilledEvents.length} billable events, ${unbilledActivities.length} activity entries, ${activeShipments.length} shipments on record.`,
-      source: "batch_client_request",
-      activity_count: unbilledEvents.length + unbilledActivities.length,
-      shipment_count: activeShipments.length,
-      created_at: now.toISOString(),
-      created_by: "symbio-admin",
-    };
-
-    // Write to Firestore
-    const invoiceRef = await db.collection("invoices").add(invoiceData);
-
-    // Mark billable events as invoiced
-    for (const evt of unbilledEvents) {
-      await db.collection("billable_events").doc(evt.id).update({
-        invoiced: true,
+  const block = await reserveInvoiceNumbers(customers.length);
+  let used = 0;
+
+  try {
+    for (const [index, customer] of customers.entries()) {
+      const custName =
+        customer.company_name || customer.name || customer.email || "Unknown";
+      const custEmail = customer.email || "N/A";
+
+      console.log(`  🔹 ${custName} (${custEmail})`);
+
+      // Check for unbilled events
+      let unbilledEvents = [];
+      try {
+        const eventsSnap = await db
+          .collection("billable_events")
+          .where("customer_id", "==", customer.id)
+          .where("invoiced", "==", false)
+          .get();
+
+        eventsSnap.forEach((doc) => {
+          unbilledEvents.push({ id: doc.id, ...doc.data() });
+        });
+      } catch (e) {
+        // Collection may not exist or no matching docs
+      }
+
+      // Check for unbilled activity log entries
+      let unbilledActivities = [];
+      try {
+        const actSnap = await db
+          .collection("activity_log")
+          .where("customer_id", "==", customer.id)
+          .where("billed", "==", false)
+          .get();
+
+        actSnap.forEach((doc) => {
+          unbilledActivities.push({ id: doc.id, ...doc.data() });
+        });
+      } catch (e) {
+        // May not exist
+      }
+
+      // Check for active shipments
+      let activeShipments = [];
+      try {
+        const shipSnap = await db
+          .collection("shipments")
+          .where("user_id", "==", customer.id)
+          .get();
+
+        shipSnap.forEach((doc) => {
+          activeShipments.push({ id: doc.id, ...doc.data() });
+        });
+      } catch (e) {
+        // May not exist
+      }
+
+      // Build line items from unbilled events
+      const lineItems = [];
+      let subtotal = 0;
+
+      if (unbilledEvents.length > 0) {
+        // Group events by type
+        const grouped = {};
+        unbilledEvents.forEach((evt) => {
+          const key = `${evt.event_type || "service"}|${evt.unit || "unit"}|${evt.rate || 0}`;
+          if (!grouped[key]) {
+            grouped[key] = {
+              category: evt.event_type || "service",
+              billing_item_id: evt.event_type || "service",
+              description: evt.description || evt.event_type || "Service",
+              unit: evt.unit || "unit",
+              rate: Number(evt.rate) || 0,
+              quantity: 0,
+              amount: 0,
+            };
+          }
+          grouped[key].quantity += Number(evt.quantity) || 1;
+          grouped[key].amount += Number(evt.amount) || 0;
+        });
+
+        Object.values(grouped).forEach((li) => {
+          lineItems.push(li);
+          subtotal += li.amount;
+        });
+      }
+
+      if (unbilledActivities.length > 0) {
+        const grouped = {};
+        unbilledActivities.forEach((act) => {
+          const type = act.billing_item_id || act.activity_type || "custom";
+          const key = `${type}|${act.unit || "unit"}|${Number(act.rate || 0).toFixed(4)}`;
+          if (!grouped[key]) {
+            grouped[key] = {
+              category: act.quote_category || type,
+              billing_item_id: type,
+              description: act.description || type,
+              unit: act.unit || "unit",
+              rate: Number(act.rate) || 0,
+              quantity: 0,
+              amount: 0,
+            };
+          }
+          grouped[key].quantity += Number(act.quantity) || 1;
+          grouped[key].amount += Number(act.amount) || 0;
+        });
+
+        Object.values(grouped).forEach((li) => {
+          lineItems.push(li);
+          subtotal += li.amount;
+        });
+      }
+
+      // If no billable items found, create a statement request (zero-balance or storage check)
+      if (lineItems.length === 0) {
+        lineItems.push({
+          category: "statement",
+          billing_item_id: "monthly_statement",
+          description: "Monthly Account Statement — No outstanding charges",
+          unit: "statement",
+          rate: 0,
+          quantity: 1,
+          amount: 0,
+        });
+      }
+
+      // Generate the invoice/request
+      const invNumber = block.numbers[index];
+      const dueDate = new Date(now.getTime() + DUE_DAYS * 24 * 60 * 60 * 1000);
+
+      const invoiceData = {
+        invoice_number: invNumber,
+        customer_id: customer.id,
+        customer_name: custName,
+        customer_email: custEmail,
+        billing_period_start: formatDate(BILLING_PERIOD_START),
+        billing_period_end: formatDate(BILLING_PERIOD_END),
+        billing_cycle: "monthly",
+        due_date: formatDate(dueDate),
+        line_items: lineItems,
+        subtotal: subtotal,
+        tax_rate: 0,
+        tax_amount: 0,
+        total: subtotal,
+        amount_paid: 0,
+        status: "draft",
+        notes: `Auto-generated monthly billing request for ${custName}. ${unbilledEvents.length} billable events, ${unbilledActivities.length} activity entries, ${activeShipments.length} shipments on record.`,
+        source: "batch_client_request",
+        activity_count: unbilledEvents.length + unbilledActivities.length,
+        shipment_count: activeShipments.length,
+        created_at: now.toISOString(),
+        created_by: "symbio-admin",
+      };
+
+      // Write to Firestore
+      const invoiceRef = await db.collection("invoices").add(invoiceData);
+      used = index + 1;
+
+      // Mark billable events as invoiced
+      for (const evt of unbilledEvents) {
+        await db.collection("billable_events").doc(evt.id).update({
+          invoiced: true,
+          invoice_id: invoiceRef.id,
+        });
+      }
+
+      // Mark activities as billed
+      for (const act of unbilledActivities) {
+        await db.collection("activity_log").doc(act.id).update({
+          billed: true,
+          invoice_id: invoiceRef.id,
+        });
+      }
+
+      const statusEmoji = subtotal > 0 ? "💰" : "📋";
+      console.log(
+        `    ${statusEmoji} ${invNumber} → $${subtotal.toFixed(2)} (${lineItems.length} items) [${invoiceRef.id}]`,
+      );
+
+      results.push({
+        customer: custName,
+        email: custEmail,
+        invoice_number: invNumber,
         invoice_id: invoiceRef.id,
+        total: subtotal,
+        line_items: lineItems.length,
+        unbilled_events: unbilledEvents.length,
+        unbilled_activities: unbilledActivities.length,
+        shipments: activeShipments.length,
       });
     }
-
-    // Mark activities as billed
-    for (const act of unbilledActivities) {
-      await db.collection("activity_log").doc(act.id).update({
-        billed: true,
-        invoice_id: invoiceRef.id,
-      });
+  } catch (err) {
+    // Numbers reserved for invoices that were never written stay out of use
+    if (used < block.numbers.length) {
+      await recordGap(
+        block.series,
+        block.start + used,
+        block.start + block.numbers.length - 1,
+        "not written",
+      );
     }
-
-    const statusEmoji = subtotal > 0 ? "💰" : "📋";
-    console.log(
-      `    ${statusEmoji} ${invNumber} → $${subtotal.toFixed(2)} (${lineItems.length} items) [${invoiceRef.id}]`,
-    );
-
-    results.push({
-      customer: custName,
-      email: custEmail,
-      invoice_number: invNumber,
-      invoice_id: invoiceRef.id,
-      total: subtotal,
-      line_items: lineItems.length,
-      unbilled_events: unbilledEvents.length,
-      unbilled_activities: unbilledActivities.length,
-      shipments: activeShipments.length,
-    });
+    throw err;
   }
 
   // 3. Summary
@@ -34,7 +34,7 @@ Updated: 2026-02-21 — v2.0 major upgrade
 import argparse
 import json
 import sys
-import urllib.request
+import time
 import urllib.error
 import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta, timezone
@@ -43,6 +43,14 @@ import html as html_mod
 import re
 import traceback
 
+try:
+    from admin import feed_registry, feed_stream, http_cache, keyword_scoring
+except ImportError:  # run as a script from admin/
+    import feed_registry
+    import feed_stream
+    import http_cache
+    import keyword_scoring
+
 # ─── CONFIGURATION ───────────────────────────────────────────────────────────
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
@@ -54,6 +62,13 @@ KPI_STATE_FILE = LOG_DIR / ".daily-kpi-state.json"
 
 # Timeouts (seconds)
 HTTP_TIMEOUT = 15
+INTEL_USER_AGENT = "Miami3PL-Intel/2.0 (Symbio Operations)"
+
+# Shared with update_blog_news.py (admin/.http_cache); revalidates with ETag/Last-Modified
+HTTP_CACHE = http_cache.HttpCache()
+
+# Shared with update_blog_news.py (admin/.feed_health.json); adapts timeouts, skips failing feeds
+FEED_REGISTRY = feed_registry.FeedRegistry()
 
 # NWS API endpoints (free, no auth)
 NWS_ALERTS_URL = "https://api.weather.gov/alerts/active?area=FL"
@@ -76,33 +91,10 @@ FED_REG_CBP_AGENCIES = [
     "office-of-foreign-assets-control",
 ]
 
-# RSS feeds
+# RSS feeds (defined in feed_registry.py, shared with update_blog_news.py)
 RSS_FEEDS = {
-    "freightwaves": {
-        "url": "https://www.freightwaves.com/feed",
-        "name": "FreightWaves",
-        "category": "freight",
-    },
-    "supply_chain_dive": {
-        "url": "https://www.supplychaindive.com/feeds/news/",
-        "name": "Supply Chain Dive",
-        "category": "supply-chain",
-    },
-    "transport_topics": {
-        "url": "https://www.ttnews.com/rss.xml",
-        "name": "Transport Topics",
-        "category": "freight",
-    },
-    "logistics_mgmt": {
-        "url": "https://feeds.feedburner.com/logisticsmgmt/latest",
-        "name": "Logistics Management",
-        "category": "warehousing",
-    },
-    "sfbj": {
-        "url": "https://feeds.bizjournals.com/bizj_southflorida",
-        "name": "South FL Business Journal",
-        "category": "local",
-    },
+    key: feed_registry.FEED_SOURCES[key]
+    for key in ["freightwaves", "supply_chain_dive", "transport_topics", "logistics_mgmt", "sfbj"]
 }
 
 # Relevance keywords for Miami 3PL — weighted categories
@@ -132,18 +124,34 @@ DISRUPTION_KEYWORDS = {
     "low": ["trend", "forecast", "market", "report", "study", "analysis"],
 }
 
+# Relevance (capped at 15) and disruption severity from one pass over the text
+INTEL_SCORER = keyword_scoring.KeywordScorer(
+    {
+        "relevance": keyword_scoring.Weighted(RELEVANCE_KEYWORDS, cap=15),
+        "severity": keyword_scoring.Ranked(
+            {level: DISRUPTION_KEYWORDS[level] for level in ["critical", "high", "medium", "low"]},
+            default="info",
+        ),
+    },
+    normalize=str.lower,
+)
+
 
 # ─── UTILITY FUNCTIONS ──────────────────────────────────────────────────────
 
 def fetch_url(url, timeout=HTTP_TIMEOUT, headers=None):
-    """Fetch URL content with timeout and error handling."""
-    req_headers = {"User-Agent": "Miami3PL-Intel/2.0 (Symbio Operations)"}
+    """
+    Fetch URL content with timeout and error handling.
+
+    Weather alerts and the JSON APIs are time-sensitive, so the shared
+    cache only saves their download (304), never serves them unchecked.
+    """
+    req_headers = {"User-Agent": INTEL_USER_AGENT}
     if headers:
         req_headers.update(headers)
-    req = urllib.request.Request(url, headers=req_headers)
     try:
-        with urllib.request.urlopen(req, timeout=timeout) as resp:
-            return resp.read().decode("utf-8", errors="replace")
+        body, _ = HTTP_CACHE.fetch(url, req_headers, timeout=timeout, ttl=0)
+        return body.decode("utf-8", errors="replace")
     except (urllib.error.URLError, urllib.error.HTTPError, TimeoutError) as e:
         return None
 
@@ -159,59 +167,94 @@ def fetch_json(url, timeout=HTTP_TIMEOUT):
     return None
 
 
-def parse_rss(xml_text, max_items=5):
-    """Parse RSS/XML feed and return list of {title, link, pubDate, description}."""
-    items = []
-    if not xml_text:
-        return items
+def _rss_entry(title, link, pub, desc):
+    # Clean HTML from description
+    desc = re.sub(r"<[^>]+>", "", html_mod.unescape(desc))[:200]
+    return {"title": title, "link": link, "pubDate": pub, "description": desc}
+
+
+def parse_feed_stream(chunks, max_items=5):
+    """
+    Parse RSS/Atom from an iterable of chunks, stopping after `max_items` entries.
+
+    RSS <item>s anywhere in the document win; top-level Atom <entry>s are
+    the fallback when there are none. Reading stops once the kind that will
+    be returned has `max_items`: titled RSS items, or Atom entries when no
+    RSS item has been seen (an Atom feed). A parse error keeps what was
+    parsed before it.
+    """
+    ns = {"atom": feed_stream.ATOM_NS}
+    rss_items, atom_items = [], []
+    rss_seen = atom_seen = 0
     try:
-        root = ET.fromstring(xml_text)
-        # Handle both RSS and Atom feeds
-        ns = {"atom": "http://www.w3.org/2005/Atom"}
-        # RSS 2.0
-        for item in root.findall(".//item")[:max_items]:
-            title = item.findtext("title", "").strip()
-            link = item.findtext("link", "").strip()
-            pub = item.findtext("pubDate", "").strip()
-            desc = item.findtext("description", "").strip()
-            # Clean HTML from description
-            desc = re.sub(r"<[^>]+>", "", html_mod.unescape(desc))[:200]
-            if title:
-                items.append({"title": title, "link": link, "pubDate": pub, "description": desc})
-        # Atom fallback
-        if not items:
-            for entry in root.findall("atom:entry", ns)[:max_items]:
-                title = entry.findtext("atom:title", "", ns).strip()
-                link_el = entry.find("atom:link", ns)
-                link = link_el.get("href", "") if link_el is not None else ""
-                pub = entry.findtext("atom:published", "", ns).strip()
-                desc = entry.findtext("atom:summary", "", ns).strip()
-                desc = re.sub(r"<[^>]+>", "", html_mod.unescape(desc))[:200]
+        for kind, element, depth in feed_stream.iter_feed_entries(chunks):
+            if kind == "item" and rss_seen < max_items:
+                rss_seen += 1
+                title = element.findtext("title", "").strip()
                 if title:
-                    items.append({"title": title, "link": link, "pubDate": pub, "description": desc})
+                    rss_items.append(_rss_entry(
+                        title,
+                        element.findtext("link", "").strip(),
+                        element.findtext("pubDate", "").strip(),
+                        element.findtext("description", "").strip(),
+                    ))
+            elif kind == "entry" and depth == 1 and atom_seen < max_items:
+                atom_seen += 1
+                title = element.findtext("atom:title", "", ns).strip()
+                link_el = element.find("atom:link", ns)
+                if title:
+                    atom_items.append(_rss_entry(
+                        title,
+                        link_el.get("href", "") if link_el is not None else "",
+                        element.findtext("atom:published", "", ns).strip(),
+                        element.findtext("atom:summary", "", ns).strip(),
+                    ))
+            rss_done, atom_done = rss_seen >= max_items, atom_seen >= max_items
+            if (rss_done and rss_items) or (atom_done and (rss_done or not rss_seen)):
+                break
     except ET.ParseError:
         pass
+    return rss_items or atom_items
+
+
+def parse_rss(xml_text, max_items=5):
+    """Parse RSS/XML feed and return list of {title, link, pubDate, description}."""
+    if not xml_text:
+        return []
+    return parse_feed_stream([xml_text], max_items)
+
+
+def fetch_rss(url, max_items=5, timeout=HTTP_TIMEOUT):
+    """
+    Stream and parse a feed, reading only as far as the first `max_items` entries.
+    Feeds FEED_REGISTRY has marked as failing are skipped ([]).
+    """
+    if not FEED_REGISTRY.allow(url):
+        return []
+    started = time.monotonic()
+    response = {}
+    chunks = HTTP_CACHE.stream(url, {"User-Agent": INTEL_USER_AGENT},
+                               timeout=FEED_REGISTRY.timeout(url, timeout), result=response)
+    try:
+        items = parse_feed_stream(chunks, max_items)
+    except (urllib.error.URLError, urllib.error.HTTPError, TimeoutError) as exc:
+        FEED_REGISTRY.record(url, time.monotonic() - started, error=exc)
+        return []
+    finally:
+        chunks.close()
+    # Server response time only: cache hits and early stops say nothing about the timeout
+    FEED_REGISTRY.record(url, response.get("latency"), len(items))
     return items
 
 
 def relevance_score(text):
     """Score text relevance to Miami 3PL operations using weighted keywords (0-15)."""
-    text_lower = text.lower()
-    score = 0
-    for kw, weight in RELEVANCE_KEYWORDS.items():
-        if kw in text_lower:
-            score += weight
-    return min(score, 15)
+    return INTEL_SCORER.score(text)["relevance"]
 
 
 def disruption_severity(text):
     """Assess disruption severity from text content."""
-    text_lower = text.lower()
-    for level in ["critical", "high", "medium", "low"]:
-        for kw in DISRUPTION_KEYWORDS[level]:
-            if kw in text_lower:
-                return level
-    return "info"
+    return INTEL_SCORER.score(text)["severity"]
 
 
 def now_est():
@@ -297,12 +340,9 @@ def generate_weather():
             })
 
     # NHC tropical weather
-    nhc_data = fetch_url(NHC_ATLANTIC_RSS)
-    if nhc_data:
-        nhc_items = parse_rss(nhc_data, max_items=2)
-        for item in nhc_items:
-            if any(kw in item["title"].lower() for kw in ["tropical", "hurricane", "storm", "disturbance"]):
-                section["items"].append({"name": "NHC", "forecast": item["title"]})
+    for item in fetch_rss(NHC_ATLANTIC_RSS, max_items=2):
+        if any(kw in item["title"].lower() for kw in ["tropical", "hurricane", "storm", "disturbance"]):
+            section["items"].append({"name": "NHC", "forecast": item["title"]})
 
     return section
 
@@ -313,8 +353,7 @@ def generate_ports():
 
     for key in ["freightwaves", "transport_topics"]:
         feed = RSS_FEEDS[key]
-        raw = fetch_url(feed["url"])
-        items = parse_rss(raw, max_items=3)
+        items = fetch_rss(feed["url"], max_items=3)
         for item in items:
             score = relevance_score(item["title"] + " " + item.get("description", ""))
             section["headlines"].append({
@@ -412,12 +451,11 @@ def generate_disruptions():
     # Fetch disruption-relevant headlines from supply chain feeds
     for key in ["supply_chain_dive", "freightwaves"]:
         feed = RSS_FEEDS[key]
-        raw = fetch_url(feed["url"])
-        items = parse_rss(raw, max_items=5)
+        items = fetch_rss(feed["url"], max_items=5)
         for item in items:
             combined = item["title"] + " " + item.get("description", "")
-            severity = disruption_severity(combined)
-            relevance = relevance_score(combined)
+            scores = INTEL_SCORER.score(combined)
+            severity, relevance = scores["severity"], scores["relevance"]
 
             if severity in ["critical", "high"] and relevance >= 2:
                 section["active"].append({
@@ -467,8 +505,7 @@ def generate_news():
 
     for key in ["supply_chain_dive", "logistics_mgmt", "sfbj"]:
         feed = RSS_FEEDS[key]
-        raw = fetch_url(feed["url"])
-        items = parse_rss(raw, max_items=3)
+        items = fetch_rss(feed["url"], max_items=3)
         for item in items:
             score = relevance_score(item["title"] + " " + item.get("description", ""))
             section["stories"].append({
@@ -777,7 +814,13 @@ def main():
                         help="Output format (default: whatsapp)")
     parser.add_argument("--dry-run", action="store_true",
                         help="Fetch and format but don't deliver")
+    parser.add_argument("--no-http-cache", action="store_true",
+                        help="Always download in full instead of using the conditional-GET cache")
+    parser.add_argument("--no-feed-registry", action="store_true",
+                        help="Fetch every feed with the default timeout and record no feed health stats")
     args = parser.parse_args()
+    HTTP_CACHE.enabled = not args.no_http_cache
+    FEED_REGISTRY.enabled = not args.no_feed_registry
 
     start_time = datetime.now(timezone.utc)
     sections_ok = []
@@ -817,6 +860,11 @@ def main():
             })
             print(f"WARNING: Section '{key}' failed: {e}", file=sys.stderr)
 
+    try:
+        FEED_REGISTRY.save()
+    except OSError as e:
+        print(f"WARNING: Could not save feed health: {e}", file=sys.stderr)
+
     # Format output
     if args.output == "json":
         output = format_json(sections)
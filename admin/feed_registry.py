@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Miami Alliance 3PL - Feed Registry
+==================================
+Shared feed sources and per-source health for update_blog_news.py and
+daily_intel_briefing.py.
+
+FEED_SOURCES defines every RSS/Atom source once (register_source() adds
+more); each tool picks the sources it uses by key. FeedRegistry keeps
+recent fetch outcomes per feed URL in admin/.feed_health.json and uses
+them to:
+
+    - set each feed's timeout from its observed latency, the time the
+      server took to respond (HttpCache reports it; cache hits have none):
+      FEED_TIMEOUT_HEADROOM x p95, within [MIN_FEED_TIMEOUT, default].
+      After a failure the next attempt (including the retry after a
+      breaker cooldown) gets the full default, so a feed that became
+      slower can record its new latency instead of timing out forever;
+    - skip feeds that keep failing: after BREAKER_FAILURES consecutive
+      failures the feed is left out for BREAKER_COOLDOWN seconds
+      (doubling on each further failure, up to BREAKER_MAX_COOLDOWN), then
+      tried once again;
+    - report latency percentiles, failure rate and item yield per feed.
+
+    registry = FeedRegistry()
+    if registry.allow(url):
+        timeout = registry.timeout(url, default=20)
+        ...
+        registry.record(url, latency, items=len(items))   # or error=exc
+    registry.save()
+
+save() merges into the file under an exclusive lock, so both tools (or two
+runs of one) can update it at the same time without losing history.
+
+Usage:
+    python3 admin/feed_registry.py                # Health report for every feed
+    python3 admin/feed_registry.py --reset URL    # Forget a feed's history (closes its breaker)
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks
+    fcntl = None
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+FEED_HEALTH_PATH = PROJECT_ROOT / "admin" / ".feed_health.json"
+FEED_HEALTH_VERSION = 1
+
+FEED_SOURCES = {
+    "freightwaves": {
+        "url": "https://www.freightwaves.com/feed",
+        "name": "FreightWaves",
+        "category": "freight",
+    },
+    "supply_chain_dive": {
+        "url": "https://www.supplychaindive.com/feeds/news/",
+        "name": "Supply Chain Dive",
+        "category": "supply-chain",
+    },
+    "dc_velocity": {
+        "url": "https://www.dcvelocity.com/rss/",
+        "name": "DC Velocity",
+        "category": "warehousing",
+    },
+    "transport_topics": {
+        "url": "https://www.ttnews.com/rss.xml",
+        "name": "Transport Topics",
+        "category": "freight",
+    },
+    "logistics_mgmt": {
+        "url": "https://feeds.feedburner.com/logisticsmgmt/latest",
+        "name": "Logistics Management",
+        "category": "warehousing",
+    },
+    "sfbj": {
+        "url": "https://feeds.bizjournals.com/bizj_southflorida",
+        "name": "South FL Business Journal",
+        "category": "local",
+    },
+}
+
+HISTORY_LENGTH = 30  # Fetch outcomes kept per feed
+MIN_LATENCY_SAMPLES = 5  # Successful fetches needed before the timeout adapts
+FEED_TIMEOUT_HEADROOM = 3.0
+MIN_FEED_TIMEOUT = 5.0
+BREAKER_FAILURES = 3
+BREAKER_COOLDOWN = 6 * 3600
+BREAKER_MAX_COOLDOWN = 3 * 86400
+
+
+def register_source(key, url, name, category):
+    """Add (or replace) a feed source in FEED_SOURCES."""
+    FEED_SOURCES[key] = {"url": url, "name": name, "category": category}
+    return FEED_SOURCES[key]
+
+
+def sources(keys):
+    """Copies of the FEED_SOURCES entries for `keys`, in order."""
+    return [dict(FEED_SOURCES[key]) for key in keys]
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+class FeedRegistry:
+    """Per-feed fetch history with adaptive timeouts and a circuit breaker."""
+
+    def __init__(self, path=FEED_HEALTH_PATH, enabled=True):
+        self.path = Path(path)
+        self.enabled = enabled
+        self.feeds = {}
+        self._new = {}  # url -> history entries recorded since loading
+        self._reset = set()
+        if enabled and self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as handle:
+                if fcntl:
+                    fcntl.flock(handle, fcntl.LOCK_SH)
+                self.feeds = self._parse(handle.read())
+
+    def _parse(self, raw):
+        try:
+            data = json.loads(raw) if raw.strip() else {}
+        except ValueError as exc:
+            print(f"  [WARN] Ignoring unreadable feed health {self.path}: {exc}", file=sys.stderr)
+            return {}
+        return data.get("feeds", {}) if data.get("version") == FEED_HEALTH_VERSION else {}
+
+    def _feed(self, url):
+        return self.feeds.setdefault(url, {"history": [], "consecutive_failures": 0, "open_until": 0})
+
+    def allow(self, url, now=None):
+        """False while the feed's circuit breaker is open."""
+        if not self.enabled or url not in self.feeds:
+            return True
+        return (time.time() if now is None else now) >= self.feeds[url]["open_until"]
+
+    def timeout(self, url, default):
+        """
+        Seconds to wait on `url`: headroom over its p95 latency, capped at
+        `default`. A feed whose last fetch failed gets `default`.
+        """
+        feed = self.feeds.get(url, {}) if self.enabled else {}
+        if feed.get("consecutive_failures"):
+            return default
+        latencies = [latency for _, latency, items in feed.get("history", [])
+                     if items is not None and latency is not None]
+        if len(latencies) < MIN_LATENCY_SAMPLES:
+            return default
+        return min(default, max(MIN_FEED_TIMEOUT, FEED_TIMEOUT_HEADROOM * percentile(latencies, 0.95)))
+
+    def record(self, url, latency, items=0, error=None, name=None, now=None):
+        """
+        Record one fetch of `url`: `items` fetched, or the `error` it failed
+        with. `latency` is None when no request reached the server (a fresh
+        cache hit); only latencies of successful fetches shape the timeout.
+        Failures count towards the circuit breaker; a success closes it.
+        """
+        if not self.enabled:
+            return
+        now = time.time() if now is None else now
+        feed = self._feed(url)
+        if name:
+            feed["name"] = name
+        entry = [now, round(latency, 3) if latency is not None else None, items if error is None else None]
+        feed["history"] = (feed["history"] + [entry])[-HISTORY_LENGTH:]
+        self._new.setdefault(url, []).append(entry)
+        if error is None:
+            feed["consecutive_failures"] = 0
+            feed["open_until"] = 0
+            feed["last_success_at"] = now
+            return
+        feed["consecutive_failures"] += 1
+        feed["last_error"] = str(error)[:200]
+        extra = feed["consecutive_failures"] - BREAKER_FAILURES
+        if extra >= 0:
+            feed["open_until"] = now + min(BREAKER_COOLDOWN * 2 ** extra, BREAKER_MAX_COOLDOWN)
+
+    def reset(self, url):
+        self.feeds.pop(url, None)
+        self._new.pop(url, None)
+        self._reset.add(url)
+
+    def _merge(self, on_disk):
+        """
+        Fold what this registry recorded into `on_disk` (the file's current
+        feeds): histories are combined by time, and the breaker state comes
+        from whichever side fetched the feed last.
+        """
+        for url in self._reset:
+            on_disk.pop(url, None)
+        for url, entries in self._new.items():
+            ours, theirs = self.feeds[url], on_disk.get(url)
+            if theirs is None:
+                on_disk[url] = ours
+                continue
+            history = sorted(theirs["history"] + entries, key=lambda entry: entry[0])[-HISTORY_LENGTH:]
+            latest = ours if entries[-1][0] >= (theirs["history"][-1][0] if theirs["history"] else 0) else theirs
+            on_disk[url] = dict(latest, history=history)
+        return on_disk
+
+    def save(self):
+        """Merge this run's records into the file under an exclusive lock."""
+        if not self.enabled or not (self._new or self._reset):
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a+", encoding="utf-8") as handle:
+            if fcntl:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+            handle.seek(0)
+            self.feeds = self._merge(self._parse(handle.read()))
+            handle.seek(0)
+            handle.truncate()
+            json.dump({"version": FEED_HEALTH_VERSION, "feeds": self.feeds}, handle, sort_keys=True)
+            handle.flush()
+            os.fsync(handle.fileno())
+        self._new, self._reset = {}, set()
+
+    def stats(self, url, default_timeout, now=None):
+        """Health summary for one feed."""
+        feed = self.feeds.get(url, {"history": [], "consecutive_failures": 0, "open_until": 0})
+        history = feed["history"]
+        successes = [(latency, items) for _, latency, items in history if items is not None]
+        latencies = [latency for latency, _ in successes if latency is not None]
+        return {
+            "name": feed.get("name", url),
+            "fetches": len(history),
+            "failure_rate": (len(history) - len(successes)) / len(history) if history else 0.0,
+            "p50": percentile(latencies, 0.5) if latencies else None,
+            "p95": percentile(latencies, 0.95) if latencies else None,
+            "mean_items": sum(items for _, items in successes) / len(successes) if successes else None,
+            "timeout": self.timeout(url, default_timeout),
+            "open": not self.allow(url, now),
+            "last_error": feed.get("last_error"),
+        }
+
+    def report(self, default_timeout=20):
+        lines = [f"{'feed':28s} {'fetches':>7s} {'fail':>5s} {'p50 s':>6s} {'p95 s':>6s} "
+                 f"{'items':>5s} {'timeout':>7s}  state"]
+        for url in sorted(self.feeds, key=lambda url: self.feeds[url].get("name", url)):
+            stats = self.stats(url, default_timeout)
+
+            def seconds(value):
+                return f"{value:6.2f}" if value is not None else f"{'-':>6s}"
+
+            items = f"{stats['mean_items']:5.1f}" if stats["mean_items"] is not None else f"{'-':>5s}"
+            state = "SKIPPED (failing)" if stats["open"] else "ok"
+            lines.append(f"{stats['name'][:28]:28s} {stats['fetches']:7d} {stats['failure_rate']:5.0%} "
+                         f"{seconds(stats['p50'])} {seconds(stats['p95'])} {items} "
+                         f"{stats['timeout']:6.1f}s  {state}")
+        return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show per-feed fetch health.")
+    parser.add_argument("--path", default=str(FEED_HEALTH_PATH), help="Feed health file")
+    parser.add_argument("--reset", metavar="URL", help="Forget a feed's history and close its breaker")
+    args = parser.parse_args()
+
+    registry = FeedRegistry(args.path)
+    if args.reset:
+        registry.reset(args.reset)
+        registry.save()
+        print(f"Reset {args.reset}")
+        return
+    if not registry.feeds:
+        print(f"No feed history in {registry.path}")
+        return
+    print(registry.report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Miami Alliance 3PL - Streaming Feed Parser
+==========================================
+Incremental RSS/Atom parsing shared by update_blog_news.py and
+daily_intel_briefing.py. iter_feed_entries() feeds byte chunks (e.g. from
+HttpCache.stream()) into an XMLPullParser and yields each RSS <item> and
+Atom <entry> as soon as its end tag arrives. Once the consumer moves on,
+the element is cleared and detached from its parent, so memory stays
+bounded by one entry. The consumer can stop at any point, and no more of
+the response is parsed (HttpCache.stream() still reads the rest into its
+cache).
+
+    for kind, entry, depth in iter_feed_entries(cache.stream(url)):
+        ...
+        if enough:
+            break
+"""
+
+import xml.etree.ElementTree as ET
+
+ATOM_NS = "http://www.w3.org/2005/Atom"
+ATOM_ENTRY = f"{{{ATOM_NS}}}entry"
+RSS_ITEM = "item"
+
+
+def iter_feed_entries(chunks):
+    """
+    Yield (kind, element, depth) for each RSS item ('item') and Atom entry
+    ('entry') in a feed given as an iterable of bytes/str chunks. `depth`
+    is the element's nesting level (the document root is 0).
+
+    The element is only valid until the next iteration. Malformed XML
+    raises ET.ParseError, after any entries that parsed before the error
+    have been yielded.
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    stack = []
+
+    def drain():
+        for event, element in parser.read_events():
+            if event == "start":
+                stack.append(element)
+                continue
+            stack.pop()
+            if element.tag == RSS_ITEM or element.tag == ATOM_ENTRY:
+                yield ("item" if element.tag == RSS_ITEM else "entry"), element, len(stack)
+                element.clear()
+                if stack:
+                    stack[-1].remove(element)
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from drain()
+    parser.close()
+    yield from drain()
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Miami Alliance 3PL - HTTP Conditional-GET Cache
+===============================================
+Shared on-disk cache for feed and API downloads (update_blog_news.py,
+daily_intel_briefing.py). Each response body is stored with its ETag and
+Last-Modified headers:
+
+    - within `ttl` seconds of the last download/revalidation the cached
+      body is returned without touching the network;
+    - after that the request carries If-None-Match / If-Modified-Since and
+      a 304 reuses the cached body;
+    - past `max_bytes` the least recently used entries are evicted.
+
+stream() hands the body over chunk by chunk as it downloads, for
+incremental parsers that may stop early (see feed_stream.py). When they
+do, the connection is closed and the partial body is discarded rather
+than cached: an early stop costs only the bytes actually parsed.
+
+Entries live in admin/.http_cache/<key>.body + <key>.json (one pair per
+URL and request-header set), written atomically so concurrent fetches
+from worker threads are safe.
+
+Usage:
+    python3 admin/http_cache.py            # Show cache size and entries
+    python3 admin/http_cache.py --clear    # Delete every entry
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+HTTP_CACHE_DIR = PROJECT_ROOT / "admin" / ".http_cache"
+
+# Reuse a body without revalidating for this long (covers manual reruns after cron)
+DEFAULT_TTL = 15 * 60
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+STREAM_CHUNK_SIZE = 16 * 1024
+
+
+def _write_atomic(path, data):
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+class HttpCache:
+    """ETag/Last-Modified cache in front of urllib.request.urlopen."""
+
+    def __init__(self, directory=HTTP_CACHE_DIR, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES,
+                 enabled=True):
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.fresh = self.revalidated = self.fetched = 0
+        self.bytes_saved = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(url, headers=None):
+        parts = [url] + [f"{name.lower()}:{value}" for name, value in sorted((headers or {}).items())]
+        return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()[:32]
+
+    def _paths(self, key):
+        return self.directory / f"{key}.json", self.directory / f"{key}.body"
+
+    def _load(self, key):
+        meta_path, body_path = self._paths(key)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            body = body_path.read_bytes()
+        except (OSError, ValueError):
+            return None, None
+        if len(body) != meta.get("size"):
+            return None, None
+        return meta, body
+
+    def _store(self, key, meta, body=None):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        meta_path, body_path = self._paths(key)
+        if body is not None:
+            _write_atomic(body_path, body)
+        _write_atomic(meta_path, json.dumps(meta, sort_keys=True).encode("utf-8"))
+
+    def _count(self, outcome, saved=0):
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+            self.bytes_saved += saved
+
+    def fetch(self, url, headers=None, timeout=30, ttl=None):
+        """
+        GET `url` through the cache. Returns (body_bytes, outcome) where
+        outcome is 'fresh' (served from disk), 'revalidated' (304) or
+        'fetched'. `ttl` overrides the cache's own for this request; 0
+        always asks the server (conditionally), for time-sensitive data.
+        Network and HTTP errors propagate as from urlopen.
+        """
+        result = {}
+        body = b"".join(self._chunks(url, headers, timeout, STREAM_CHUNK_SIZE, result, ttl))
+        return body, result["outcome"]
+
+    def stream(self, url, headers=None, timeout=30, chunk_size=STREAM_CHUNK_SIZE, result=None):
+        """
+        GET `url` through the cache as an iterator of byte chunks, read from
+        the network as they are consumed. Closing the iterator early stops
+        the download; the cut-short body is not cached (an entry already
+        on disk is left as it was).
+
+        Once the first chunk is out, `result` (a dict, if given) holds the
+        'outcome' as for fetch() and the 'latency': seconds until the server
+        responded, or None for a fresh entry that never left the disk.
+        """
+        return self._chunks(url, headers, timeout, chunk_size, {} if result is None else result)
+
+    def _chunks(self, url, headers, timeout, chunk_size, result, ttl=None):
+        headers = dict(headers or {})
+        result["latency"] = None
+        if not self.enabled:
+            result["outcome"] = "fetched"
+            started = time.monotonic()
+            with urllib.request.urlopen(urllib.request.Request(url, headers=headers),
+                                        timeout=timeout) as resp:
+                result["latency"] = time.monotonic() - started
+                yield from iter(lambda: resp.read(chunk_size), b"")
+            return
+
+        key = self.key(url, headers)
+        meta, body = self._load(key)
+        now = time.time()
+        if meta and now - meta["checked_at"] < (self.ttl if ttl is None else ttl):
+            result["outcome"] = "fresh"
+            self._count("fresh", len(body))
+            yield body
+            return
+
+        request_headers = dict(headers)
+        if meta and meta.get("etag"):
+            request_headers["If-None-Match"] = meta["etag"]
+        if meta and meta.get("last_modified"):
+            request_headers["If-Modified-Since"] = meta["last_modified"]
+        request = urllib.request.Request(url, headers=request_headers)
+        started = time.monotonic()
+        try:
+            resp = urllib.request.urlopen(request, timeout=timeout)
+        except urllib.error.HTTPError as exc:
+            if exc.code != 304 or meta is None:
+                raise
+            result["latency"] = time.monotonic() - started
+            meta["checked_at"] = now
+            self._store(key, meta)
+            result["outcome"] = "revalidated"
+            self._count("revalidated", len(body))
+            yield body
+            return
+
+        result["outcome"] = "fetched"
+        result["latency"] = time.monotonic() - started
+        self._count("fetched")
+        with resp:
+            etag, last_modified = resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+            if "no-store" in (resp.headers.get("Cache-Control") or "").lower():
+                yield from iter(lambda: resp.read(chunk_size), b"")
+                return
+
+            # Spool to a temp file beside the entry rather than holding the body in memory
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.directory, prefix=f".{key}.", suffix=".tmp")
+            size = 0
+            try:
+                with os.fdopen(fd, "wb") as spool:
+                    for chunk in iter(lambda: resp.read(chunk_size), b""):
+                        spool.write(chunk)
+                        size += len(chunk)
+                        yield chunk
+                os.replace(tmp_name, self._paths(key)[1])
+            finally:
+                if os.path.exists(tmp_name):
+                    os.unlink(tmp_name)
+
+        self._store(key, {"url": url, "etag": etag, "last_modified": last_modified,
+                          "size": size, "checked_at": now})
+        self.evict()
+
+    def entries(self):
+        """(meta_path, meta) for every readable entry, least recently checked first."""
+        entries = []
+        for meta_path in self.directory.glob("*.json"):
+            try:
+                entries.append((meta_path, json.loads(meta_path.read_text(encoding="utf-8"))))
+            except (OSError, ValueError):
+                continue
+        return sorted(entries, key=lambda entry: entry[1].get("checked_at", 0))
+
+    def evict(self):
+        """Drop least recently checked entries until the cache fits in max_bytes."""
+        with self._lock:
+            entries = self.entries()
+            total = sum(meta.get("size", 0) for _, meta in entries)
+            for meta_path, meta in entries:
+                if total <= self.max_bytes:
+                    break
+                meta_path.unlink(missing_ok=True)
+                meta_path.with_suffix(".body").unlink(missing_ok=True)
+                total -= meta.get("size", 0)
+
+    def clear(self):
+        for path in self.directory.glob("*"):
+            path.unlink(missing_ok=True)
+
+    def report(self):
+        return (f"HTTP cache: {self.fresh} fresh, {self.revalidated} revalidated (304), "
+                f"{self.fetched} downloaded - {self.bytes_saved / 1024:.0f} KB not re-downloaded")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect the shared HTTP feed cache.")
+    parser.add_argument("--dir", default=str(HTTP_CACHE_DIR), help="Cache directory")
+    parser.add_argument("--clear", action="store_true", help="Delete every cached response")
+    args = parser.parse_args()
+
+    cache = HttpCache(args.dir)
+    if args.clear:
+        cache.clear()
+        print(f"Cleared {cache.directory}")
+        return
+    entries = cache.entries()
+    total = sum(meta.get("size", 0) for _, meta in entries)
+    print(f"{len(entries)} entries, {total / 1024:.0f} KB in {cache.directory}")
+    for _, meta in reversed(entries):
+        checked = time.strftime("%Y-%m-%d %H:%M", time.localtime(meta.get("checked_at", 0)))
+        print(f"  {checked}  {meta.get('size', 0) / 1024:7.1f} KB  {meta.get('url')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Miami Alliance 3PL - Keyword Scoring
+====================================
+Shared keyword scoring for update_blog_news.py and daily_intel_briefing.py.
+
+A KeywordScorer compiles any number of scoring dimensions into one
+matcher and scores a text for all of them in a single pass:
+
+    Weighted(keywords, cap=None)   sum of weights of the keywords present
+                                   (a list counts each entry once; a dict
+                                   maps keyword -> weight), optionally capped
+    Ranked(levels, default)        the first level (in dict order) with any
+                                   keyword present, e.g. a severity rating
+
+A keyword scores when it occurs anywhere in the normalized text as a
+substring, and at most once per text, exactly like the
+`sum(... for kw in keywords if kw in text)` loops this replaces.
+
+    scorer = KeywordScorer({
+        "relevance": Weighted({"warehouse": 3, "freight": 1}, cap=15),
+        "severity": Ranked({"critical": ["hurricane"], "high": ["strike"]}, default="info"),
+    })
+    scorer.score("Hurricane closes Miami warehouse")
+    # {"relevance": 3, "severity": "critical"}
+"""
+
+import re
+from collections import Counter
+
+
+def normalize_whitespace(value):
+    """Lower-case and collapse whitespace (the news updater's normalization)."""
+    return re.sub(r"\s+", " ", (value or "")).strip().lower()
+
+
+class KeywordMatcher:
+    """
+    A keyword vocabulary compiled into one regex that finds every keyword
+    occurring in a text in one pass.
+
+    The regex is a trie of every keyword, so at any position it matches
+    the longest keyword starting there. Shorter keywords inside a match are
+    implied by it (`contains`), and the scan resumes at the first offset
+    inside the match where a keyword running past its end could start
+    (`resume`), so overlapping keywords are still found.
+    """
+
+    def __init__(self, vocabulary):
+        vocabulary = set(vocabulary)
+        self.vocabulary = vocabulary
+        self.contains = {kw: [other for other in vocabulary if other in kw] for kw in vocabulary}
+        prefixes = {kw[:end] for kw in vocabulary for end in range(1, len(kw))}
+        self.resume = {
+            kw: next((i for i in range(1, len(kw)) if kw[i:] in prefixes), len(kw))
+            for kw in vocabulary
+        }
+        self.pattern = re.compile(self._trie_pattern(vocabulary)) if vocabulary else None
+
+    @staticmethod
+    def _trie_pattern(words):
+        trie = {}
+        for word in words:
+            node = trie
+            for char in word:
+                node = node.setdefault(char, {})
+            node[""] = {}
+
+        def emit(node):
+            # Children before the end marker so the longest keyword wins
+            branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+            if "" in node:
+                branches.append("")
+            if len(branches) == 1:
+                return branches[0]
+            return "(?:" + "|".join(branches) + ")"
+
+        return emit(trie)
+
+    def scan(self, text, end=None):
+        """Yield (keyword, start) for the longest keyword at each matching position."""
+        if self.pattern is None:
+            return
+        end = len(text) if end is None else end
+        search = self.pattern.search
+        match = search(text, 0, end)
+        while match:
+            keyword = match.group()
+            yield keyword, match.start()
+            match = search(text, match.start() + self.resume[keyword], end)
+
+    def found(self, text, end=None):
+        """Set of keywords occurring in text[:end]."""
+        keywords = set()
+        for keyword, _ in self.scan(text, end):
+            keywords.update(self.contains[keyword])
+        return keywords
+
+
+class Weighted:
+    """Sum of keyword weights, optionally capped."""
+
+    def __init__(self, keywords, cap=None):
+        self.weights = dict(keywords) if isinstance(keywords, dict) else dict(Counter(keywords))
+        self.cap = cap
+
+
+class Ranked:
+    """First level (in order) with a keyword present, else `default`."""
+
+    def __init__(self, levels, default=None):
+        self.levels = {level: list(keywords) for level, keywords in levels.items()}
+        self.default = default
+
+
+class KeywordScorer:
+    """Scores a text on several Weighted/Ranked dimensions with one KeywordMatcher pass."""
+
+    def __init__(self, dimensions, normalize=normalize_whitespace):
+        self.dimensions = dict(dimensions)
+        self.normalize = normalize
+        # keyword -> [(dimension, weight)] and keyword -> [(dimension, rank)]
+        self._weights, self._ranks = {}, {}
+        self._levels = {}
+        for name, dimension in self.dimensions.items():
+            if isinstance(dimension, Weighted):
+                for kw, weight in dimension.weights.items():
+                    self._weights.setdefault(kw, []).append((name, weight))
+            elif isinstance(dimension, Ranked):
+                self._levels[name] = list(dimension.levels)
+                for rank, keywords in enumerate(dimension.levels.values()):
+                    for kw in keywords:
+                        self._ranks.setdefault(kw, []).append((name, rank))
+            else:
+                raise TypeError(f"Unknown scoring dimension for {name!r}: {dimension!r}")
+        self.matcher = KeywordMatcher(set(self._weights) | set(self._ranks))
+
+    def evaluate(self, keywords):
+        """{dimension: score} for a set of keywords already found in a text."""
+        totals = {name: 0 for name, dim in self.dimensions.items() if isinstance(dim, Weighted)}
+        best = {name: len(levels) for name, levels in self._levels.items()}
+        for kw in keywords:
+            for name, weight in self._weights.get(kw, ()):
+                totals[name] += weight
+            for name, rank in self._ranks.get(kw, ()):
+                if rank < best[name]:
+                    best[name] = rank
+        scores = {}
+        for name, dimension in self.dimensions.items():
+            if isinstance(dimension, Weighted):
+                total = totals[name]
+                scores[name] = total if dimension.cap is None else min(total, dimension.cap)
+            else:
+                levels = self._levels[name]
+                scores[name] = levels[best[name]] if best[name] < len(levels) else dimension.default
+        return scores
+
+    def score(self, text):
+        """{dimension: score} for `text`."""
+        return self.evaluate(self.matcher.found(self.normalize(text)))
+
+    def score_split(self, head, tail):
+        """
+        Scores for `head` alone and for "head tail", from one pass.
+
+        Matches are split at the head boundary; the head is only re-scanned
+        if a keyword straddles it. Returns (head_scores, full_scores).
+        """
+        head, tail = self.normalize(head), self.normalize(tail)
+        full = f"{head} {tail}" if head and tail else head or tail
+
+        head_found, full_found = set(), set()
+        straddles = False
+        contains = self.matcher.contains
+        for keyword, start in self.matcher.scan(full):
+            full_found.update(contains[keyword])
+            if start + len(keyword) <= len(head):
+                head_found.update(contains[keyword])
+            elif start < len(head):
+                straddles = True
+        if straddles:
+            head_found = self.matcher.found(head)
+        return self.evaluate(head_found), self.evaluate(full_found)
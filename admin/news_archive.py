@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Miami Alliance 3PL - Daily News Archive
+=======================================
+Rolling history of the articles update_blog_news.py puts on blog.html,
+which otherwise only ever shows today's selection.
+
+Each day's selection is appended to a JSON Lines partition,
+admin/news_archive/<year>/<YYYY-MM-DD>.jsonl (one compact record per
+article). admin/news_archive/index.json maps every day to its article
+count, per-category and per-source counts and a hash of the partition, so
+query() only opens the partitions that can match a date range, category
+or source.
+
+Weekly and monthly digest pages are generated from the archive without
+any network calls. periods() lists them with a key derived from the
+hashes of the partitions they cover, and index.json remembers the key each
+page was last built from, so a digest is only re-rendered when one of its
+days changed (see update_blog_news.build_digest_pages()).
+
+Usage:
+    python3 admin/news_archive.py                       # Days, articles and digests in the archive
+    python3 admin/news_archive.py --since 2026-10-01    # Articles archived since a date
+    python3 admin/news_archive.py --category ports --source FreightWaves
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+NEWS_ARCHIVE_DIR = PROJECT_ROOT / "admin" / "news_archive"
+NEWS_ARCHIVE_VERSION = 1
+
+RECORD_FIELDS = ("date", "title", "description", "source", "category", "link",
+                 "relevance_score", "us_score", "featured")
+
+
+def _write_atomic(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def week_id(day):
+    """ISO week of a date, e.g. '2026-W42'."""
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def month_id(day):
+    return f"{day.year}-{day.month:02d}"
+
+
+class NewsArchive:
+    """Date-partitioned JSONL archive of selected articles, indexed by date, category and source."""
+
+    def __init__(self, directory=NEWS_ARCHIVE_DIR, enabled=True):
+        self.directory = Path(directory)
+        self.enabled = enabled
+        self.days, self.digests = {}, {}
+        self._dirty = False
+        index_path = self.directory / "index.json"
+        if enabled and index_path.exists():
+            try:
+                data = json.loads(index_path.read_text(encoding="utf-8"))
+                if data.get("version") == NEWS_ARCHIVE_VERSION:
+                    self.days = data.get("days", {})
+                    self.digests = data.get("digests", {})
+            except (OSError, ValueError) as exc:
+                print(f"  [WARN] Ignoring unreadable news archive index {index_path}: {exc}", file=sys.stderr)
+
+    def partition_path(self, day):
+        return self.directory / day[:4] / f"{day}.jsonl"
+
+    @staticmethod
+    def to_record(article, featured=False):
+        record = {field: article.get(field) for field in RECORD_FIELDS}
+        record["date"] = article["date"].replace(tzinfo=None).isoformat(timespec="seconds")
+        record["featured"] = featured
+        return record
+
+    def read(self, day):
+        """Records of one day (oldest appended first), with `date` parsed."""
+        path = self.partition_path(day)
+        if day not in self.days or not path.exists():
+            return []
+        records = []
+        for line in path.read_text(encoding="utf-8").splitlines():
+            if line:
+                record = json.loads(line)
+                record["date"] = datetime.fromisoformat(record["date"])
+                records.append(dict(record, archived_on=day))
+        return records
+
+    def append(self, day, articles, lookback_days=0):
+        """
+        Add `articles` (the first one featured) to the partition for `day`
+        (a date). Articles whose link is already archived on `day` or the
+        `lookback_days` before it are skipped, so a story that stays on
+        blog.html for several days is archived once. Returns the number of
+        records added.
+        """
+        if not self.enabled:
+            return 0
+        key = day.isoformat()
+        known = set()
+        for offset in range(lookback_days + 1):
+            known.update(record["link"] for record in self.read((day - timedelta(days=offset)).isoformat()))
+
+        path = self.partition_path(key)
+        lines = path.read_text(encoding="utf-8").splitlines() if key in self.days and path.exists() else []
+        added = 0
+        for position, article in enumerate(articles):
+            record = self.to_record(article, featured=position == 0)
+            if not record["link"] or record["link"] in known:
+                continue
+            known.add(record["link"])
+            lines.append(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+            added += 1
+        if not added:
+            return 0
+
+        text = "\n".join(lines) + "\n"
+        _write_atomic(path, text)
+        records = [json.loads(line) for line in lines]
+        self.days[key] = {
+            "count": len(records),
+            "sha256": hashlib.sha256(text.encode("utf-8")).hexdigest(),
+            "categories": self._counts(records, "category"),
+            "sources": self._counts(records, "source"),
+        }
+        self._dirty = True
+        return added
+
+    @staticmethod
+    def _counts(records, field):
+        counts = {}
+        for record in records:
+            counts[record[field]] = counts.get(record[field], 0) + 1
+        return dict(sorted(counts.items()))
+
+    def query(self, start=None, end=None, category=None, source=None):
+        """
+        Archived records between `start` and `end` (dates, inclusive),
+        optionally for one category and/or source, newest day first. Only
+        partitions whose index entry has a match are read.
+        """
+        records = []
+        for day in sorted(self.days, reverse=True):
+            entry = self.days[day]
+            if (start and day < start.isoformat()) or (end and day > end.isoformat()):
+                continue
+            if (category and category not in entry["categories"]) or (source and source not in entry["sources"]):
+                continue
+            records.extend(
+                record for record in self.read(day)
+                if (not category or record["category"] == category) and (not source or record["source"] == source)
+            )
+        return records
+
+    def periods(self):
+        """
+        Digest periods as {(kind, period_id): (days, key)} for kind 'week'
+        and 'month'; `days` are newest first and `key` changes whenever any
+        of their partitions does.
+        """
+        grouped = {}
+        for day in sorted(self.days, reverse=True):
+            parsed = date.fromisoformat(day)
+            for kind, period in (("week", week_id(parsed)), ("month", month_id(parsed))):
+                grouped.setdefault((kind, period), []).append(day)
+        return {
+            period: (days, hashlib.sha256(
+                "\n".join(f"{day}:{self.days[day]['sha256']}" for day in days).encode("utf-8")
+            ).hexdigest())
+            for period, days in grouped.items()
+        }
+
+    def digest_is_current(self, name, key):
+        return self.digests.get(name) == key
+
+    def mark_digest(self, name, key):
+        if self.digests.get(name) != key:
+            self.digests[name] = key
+            self._dirty = True
+
+    def save(self):
+        if not self.enabled or not self._dirty:
+            return
+        payload = {"version": NEWS_ARCHIVE_VERSION, "days": self.days, "digests": self.digests}
+        _write_atomic(self.directory / "index.json", json.dumps(payload, indent=1, sort_keys=True) + "\n")
+        self._dirty = False
+
+    def report(self):
+        articles = sum(entry["count"] for entry in self.days.values())
+        return f"News archive: {articles} articles over {len(self.days)} days, {len(self.digests)} digest pages"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the daily news archive.")
+    parser.add_argument("--dir", default=str(NEWS_ARCHIVE_DIR), help="Archive directory")
+    parser.add_argument("--since", type=date.fromisoformat, help="First day (YYYY-MM-DD)")
+    parser.add_argument("--until", type=date.fromisoformat, help="Last day (YYYY-MM-DD)")
+    parser.add_argument("--category", help="Only this category (e.g. ports)")
+    parser.add_argument("--source", help="Only this source (e.g. FreightWaves)")
+    args = parser.parse_args()
+
+    archive = NewsArchive(args.dir)
+    print(archive.report())
+    if not (args.since or args.until or args.category or args.source):
+        for day in sorted(archive.days, reverse=True)[:14]:
+            entry = archive.days[day]
+            print(f"  {day}  {entry['count']:3d} articles  {', '.join(entry['categories'])}")
+        return
+    for record in archive.query(args.since, args.until, args.category, args.source):
+        print(f"  {record['archived_on']}  {record['category']:13s} {record['source'][:20]:20s} {record['title'][:70]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Miami Alliance 3PL - Sitemap Builder
+====================================
+Builds sitemap.xml from a list of URL entries ({loc, lastmod, changefreq,
+priority}). Small sites get a single <urlset>; past `max_urls` entries
+sitemap.xml becomes a <sitemapindex> pointing at gzip-compressed children:
+
+    sitemap-pages.xml.gz         hand-maintained site pages
+    sitemap-blog-index.xml.gz    blog archive, category and news digest pages
+    sitemap-blog-N.xml.gz        blog posts, oldest first, max_urls per file
+
+Children are compressed deterministically (no gzip timestamp) and a file
+is only rewritten when its bytes change, so a new post touches the
+newest posts child and the index.
+
+Used by update_blog_from_files.py; entries for pages outside /blog/ are
+read back from the existing sitemap so hand edits to them are kept.
+update_blog_news.py only swaps the news digest entries in
+(replace_digest_entries()).
+"""
+
+import gzip
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+try:
+    from admin import build_pipeline
+except ImportError:  # run as a script from admin/
+    import build_pipeline
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SITEMAP_PATH = PROJECT_ROOT / "sitemap.xml"
+SITE_URL = "https://miamialliance3pl.com"
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+
+# Split into an index + gzip children past this many URLs (protocol limit: 50,000)
+SITEMAP_MAX_URLS = 2000
+CHILD_PREFIX = "sitemap-"
+ENTRY_FIELDS = ("loc", "lastmod", "changefreq", "priority")
+BLOG_PREFIX = f"{SITE_URL}/blog/"
+BLOG_INDEX_PREFIXES = (f"{BLOG_PREFIX}page/", f"{BLOG_PREFIX}category/")
+NEWS_DIGEST_PREFIX = f"{BLOG_PREFIX}news/"
+
+
+def parse_sitemap(data):
+    """Parse sitemap XML bytes. Returns (kind, entries) with kind 'urlset' or 'sitemapindex'."""
+    root = ET.fromstring(data)
+    kind = root.tag.rsplit("}", 1)[-1]
+    item_tag = "url" if kind == "urlset" else "sitemap"
+    entries = []
+    for item in root.findall(f"{{{SITEMAP_NS}}}{item_tag}"):
+        entry = {}
+        for field in ENTRY_FIELDS:
+            node = item.find(f"{{{SITEMAP_NS}}}{field}")
+            if node is not None and node.text:
+                entry[field] = node.text.strip()
+        entries.append(entry)
+    return kind, entries
+
+
+def read_sitemap_file(path):
+    data = Path(path).read_bytes()
+    return gzip.decompress(data) if str(path).endswith(".gz") else data
+
+
+def load_entries(path=SITEMAP_PATH):
+    """All URL entries in a sitemap, following a sitemap index to its local children."""
+    path = Path(path)
+    if not path.exists():
+        return []
+    kind, entries = parse_sitemap(read_sitemap_file(path))
+    if kind == "urlset":
+        return entries
+
+    urls = []
+    for child in entries:
+        child_path = path.parent / child["loc"].rsplit("/", 1)[-1]
+        if child_path.exists():
+            urls.extend(load_entries(child_path))
+    return urls
+
+
+def render_urlset(entries):
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>', f'<urlset xmlns="{SITEMAP_NS}">']
+    for entry in entries:
+        lines.append("  <url>")
+        for field in ENTRY_FIELDS:
+            if entry.get(field):
+                lines.append(f"    <{field}>{escape(str(entry[field]))}</{field}>")
+        lines.append("  </url>")
+    lines.append("</urlset>")
+    return "\n".join(lines) + "\n"
+
+
+def render_index(children):
+    """children: list of (file_name, lastmod)."""
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>', f'<sitemapindex xmlns="{SITEMAP_NS}">']
+    for name, lastmod in children:
+        lines.append("  <sitemap>")
+        lines.append(f"    <loc>{SITE_URL}/{name}</loc>")
+        if lastmod:
+            lines.append(f"    <lastmod>{lastmod}</lastmod>")
+        lines.append("  </sitemap>")
+    lines.append("</sitemapindex>")
+    return "\n".join(lines) + "\n"
+
+
+def plan_sitemaps(pages, index_pages, posts, max_urls=SITEMAP_MAX_URLS):
+    """
+    File name -> bytes for every sitemap file to publish.
+
+    `pages`, `index_pages` and `posts` are entry lists; posts should be
+    oldest first so that chunk boundaries stay put as posts are added.
+    """
+    entries = pages + index_pages + posts
+    if len(entries) <= max_urls:
+        return {"sitemap.xml": render_urlset(entries).encode("utf-8")}
+
+    groups = [("sitemap-pages.xml.gz", pages), ("sitemap-blog-index.xml.gz", index_pages)]
+    for number, start in enumerate(range(0, len(posts), max_urls), start=1):
+        groups.append((f"sitemap-blog-{number}.xml.gz", posts[start:start + max_urls]))
+
+    files = {}
+    children = []
+    for name, group in groups:
+        if not group:
+            continue
+        xml = render_urlset(group).encode("utf-8")
+        files[name] = gzip.compress(xml, mtime=0)
+        children.append((name, max((entry.get("lastmod", "") for entry in group), default="")))
+    files["sitemap.xml"] = render_index(children).encode("utf-8")
+    return files
+
+
+def news_digest_entries(archive, root=PROJECT_ROOT):
+    """
+    Entries for the weekly and monthly digests in blog/news/ (see
+    update_blog_news.build_digest_pages()), dated by the newest archived
+    day each one covers. `archive` is a news_archive.NewsArchive.
+    """
+    digest_dir = Path(root) / "blog" / "news"
+    return [{
+        "loc": f"{NEWS_DIGEST_PREFIX}{period}.html",
+        "lastmod": days[0],
+        "changefreq": "weekly",
+        "priority": "0.4",
+    } for (_, period), (days, _) in sorted(archive.periods().items())
+        if (digest_dir / f"{period}.html").exists()]
+
+
+def replace_digest_entries(digests, path=SITEMAP_PATH, max_urls=SITEMAP_MAX_URLS, pipeline=None):
+    """
+    Rewrite the existing sitemap with `digests` as its news digest entries
+    and everything else kept, for runs that rebuild digests without the
+    blog metadata. Returns (written, unchanged, removed) as sync_sitemaps().
+    """
+    path = Path(path)
+    if not path.exists():
+        return [], [], []
+    pages, index_pages, posts = [], [], []
+    for entry in load_entries(path):
+        loc = entry.get("loc", "")
+        if loc.startswith(NEWS_DIGEST_PREFIX):
+            continue
+        if not loc.startswith(BLOG_PREFIX):
+            pages.append(entry)
+        elif loc.startswith(BLOG_INDEX_PREFIXES):
+            index_pages.append(entry)
+        else:
+            posts.append(entry)
+    files = plan_sitemaps(pages, index_pages + list(digests), posts, max_urls)
+    return sync_sitemaps(files, path.parent, pipeline)
+
+
+def sync_sitemaps(files, root=PROJECT_ROOT, pipeline=None):
+    """
+    Write sitemap files whose bytes changed and remove stale children.
+
+    Writes go through `pipeline` (a build_pipeline.BuildPipeline; default:
+    a fresh one). Returns (written, unchanged, removed)
+    lists of paths.
+    """
+    root = Path(root)
+    pipeline = pipeline or build_pipeline.BuildPipeline()
+    written, unchanged = [], []
+    for name, data in files.items():
+        path = root / name
+        (written if pipeline.write(path, data) else unchanged).append(path)
+
+    removed = []
+    for path in sorted(root.glob(f"{CHILD_PREFIX}*.xml.gz")):
+        if path.name not in files:
+            removed.append(path)
+            pipeline.remove(path)
+    return written, unchanged, removed
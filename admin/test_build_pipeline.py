@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Unit tests for admin/build_pipeline.py."""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from admin import build_pipeline
+
+
+class BuildPipelineTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def pipeline(self, **kwargs):
+        return build_pipeline.BuildPipeline(**kwargs)
+
+    def test_write_atomic_replaces_file_and_leaves_no_temp(self):
+        target = self.root / "blog.html"
+        target.write_text("old", encoding="utf-8")
+        build_pipeline.write_atomic(target, "new")
+        self.assertEqual(target.read_text(encoding="utf-8"), "new")
+        self.assertEqual(sorted(os.listdir(self.root)), ["blog.html"])
+
+    def test_pipeline_write_replaces_file_atomically(self):
+        target = self.root / "blog.html"
+        target.write_text("old", encoding="utf-8")
+        pipeline = self.pipeline()
+        with mock.patch.object(build_pipeline.os, "replace", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                pipeline.write(target, "new")
+        self.assertEqual(target.read_text(encoding="utf-8"), "old")
+        self.assertEqual(sorted(os.listdir(self.root)), ["blog.html"])
+
+        self.assertTrue(pipeline.write(target, "new"))
+        self.assertEqual(target.read_text(encoding="utf-8"), "new")
+        self.assertEqual(sorted(os.listdir(self.root)), ["blog.html"])
+
+    def test_unchanged_content_is_not_rewritten(self):
+        target = self.root / "blog" / "page" / "1.html"
+        pipeline = self.pipeline()
+        self.assertTrue(pipeline.write(target, "<html>1</html>"))
+        os.utime(target, ns=(0, 0))
+
+        again = self.pipeline()
+        self.assertFalse(again.write(target, b"<html>1</html>"))
+        self.assertEqual(target.stat().st_mtime_ns, 0)
+        self.assertEqual(again.report(), "Wrote 0 files (1 unchanged, 0 removed).")
+
+    def test_dry_run_touches_nothing(self):
+        pipeline = self.pipeline(dry_run=True)
+        self.assertTrue(pipeline.write(self.root / "blog.html", "new"))
+        (self.root / "sitemap-blog-1.xml.gz").write_bytes(b"")
+        pipeline.remove(self.root / "sitemap-blog-1.xml.gz")
+        self.assertEqual(os.listdir(self.root), ["sitemap-blog-1.xml.gz"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Unit tests for admin/feed_registry.py."""
+
+import tempfile
+import unittest
+
+from admin import feed_registry
+
+URL = "https://example.com/feed"
+
+
+class FeedRegistryTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = f"{tmp.name}/health.json"
+        self.registry = feed_registry.FeedRegistry(self.path)
+
+    def test_timeout_follows_p95_latency_once_enough_samples(self):
+        for latency in [0.5, 0.6, 0.7, 0.8]:
+            self.registry.record(URL, latency, items=10)
+        self.assertEqual(self.registry.timeout(URL, default=20), 20)
+
+        for latency in [0.9, 2.5]:
+            self.registry.record(URL, latency, items=10)
+        self.assertAlmostEqual(self.registry.timeout(URL, default=20), 7.5)  # 3 x p95 (2.5)
+        self.registry.record(URL, 30.0, error="timed out")  # failures do not count as latency
+        self.assertEqual(self.registry.timeout(URL, default=20), 20)  # but the retry gets the default
+        self.registry.record(URL, 2.5, items=10)
+        self.assertAlmostEqual(self.registry.timeout(URL, default=20), 7.5)
+        self.assertEqual(self.registry.timeout(URL, default=6), 6)
+
+        for _ in range(feed_registry.HISTORY_LENGTH):  # the slow fetches age out
+            self.registry.record(URL, 0.1, items=10)
+        self.assertEqual(self.registry.timeout(URL, default=20), feed_registry.MIN_FEED_TIMEOUT)
+
+    def test_feed_that_slows_down_widens_its_timeout(self):
+        for _ in range(feed_registry.HISTORY_LENGTH):
+            self.registry.record(URL, 1.0, items=10)
+        self.assertEqual(self.registry.timeout(URL, default=20), feed_registry.MIN_FEED_TIMEOUT)
+
+        # The feed now takes 8s: fetches time out until enough 8s samples are in
+        outcomes = []
+        for _ in range(10):
+            succeeded = self.registry.timeout(URL, default=20) >= 8.0
+            if succeeded:
+                self.registry.record(URL, 8.0, items=10)
+            else:
+                self.registry.record(URL, None, error="timed out")
+            outcomes.append(succeeded)
+        self.assertTrue(all(outcomes[-5:]))
+        self.assertLess(outcomes.count(False), feed_registry.BREAKER_FAILURES)
+        self.assertTrue(self.registry.allow(URL))
+
+    def test_fetches_without_server_latency_do_not_shrink_the_timeout(self):
+        for _ in range(feed_registry.HISTORY_LENGTH):
+            self.registry.record(URL, 2.0, items=10)
+        for _ in range(feed_registry.HISTORY_LENGTH - feed_registry.MIN_LATENCY_SAMPLES):  # fresh cache hits
+            self.registry.record(URL, None, items=10)
+        self.assertAlmostEqual(self.registry.timeout(URL, default=20), 6.0)
+        self.assertEqual(self.registry.stats(URL, default_timeout=20)["p50"], 2.0)
+
+    def test_concurrent_saves_merge_instead_of_overwriting(self):
+        other_url = "https://example.com/other"
+        self.registry.record(URL, 1.0, items=5, now=100)
+        self.registry.save()
+
+        first, second = feed_registry.FeedRegistry(self.path), feed_registry.FeedRegistry(self.path)
+        first.record(URL, 2.0, error="timed out", now=200)
+        second.record(URL, 3.0, items=7, now=300)
+        second.record(other_url, 0.5, items=2, now=300)
+        first.save()
+        second.save()
+
+        merged = feed_registry.FeedRegistry(self.path).feeds
+        self.assertEqual([entry[0] for entry in merged[URL]["history"]], [100, 200, 300])
+        self.assertEqual(merged[URL]["consecutive_failures"], 0)  # the latest fetch succeeded
+        self.assertIn(other_url, merged)
+
+        first.reset(other_url)
+        first.save()
+        self.assertEqual(sorted(feed_registry.FeedRegistry(self.path).feeds), [URL])
+
+    def test_breaker_opens_after_consecutive_failures_and_backs_off(self):
+        now = 1_000_000
+        for _ in range(feed_registry.BREAKER_FAILURES):
+            self.assertTrue(self.registry.allow(URL, now))
+            self.registry.record(URL, 1.0, error="HTTP Error 503", now=now)
+        cooldown = feed_registry.BREAKER_COOLDOWN
+        self.assertFalse(self.registry.allow(URL, now + cooldown - 1))
+        self.assertTrue(self.registry.allow(URL, now + cooldown))
+
+        # The retry fails too: skipped twice as long
+        now += cooldown
+        self.registry.record(URL, 1.0, error="HTTP Error 503", now=now)
+        self.assertFalse(self.registry.allow(URL, now + 2 * cooldown - 1))
+        self.assertTrue(self.registry.allow(URL, now + 2 * cooldown))
+
+        self.registry.record(URL, 1.0, items=3, now=now + 2 * cooldown)
+        self.assertTrue(self.registry.allow(URL, now + 2 * cooldown))
+        self.assertEqual(self.registry.feeds[URL]["consecutive_failures"], 0)
+
+    def test_history_persists_and_feeds_the_report(self):
+        self.registry.record(URL, 1.0, items=12, name="Example Feed")
+        self.registry.record(URL, 3.0, items=8)
+        self.registry.record(URL, 5.0, error="timed out")
+        self.registry.save()
+
+        reloaded = feed_registry.FeedRegistry(self.path)
+        stats = reloaded.stats(URL, default_timeout=20)
+        self.assertEqual((stats["fetches"], stats["p50"], stats["p95"], stats["mean_items"]),
+                         (3, 1.0, 3.0, 10.0))
+        self.assertAlmostEqual(stats["failure_rate"], 1 / 3)
+        self.assertEqual(stats["last_error"], "timed out")
+        self.assertIn("Example Feed", reloaded.report())
+
+        for _ in range(feed_registry.HISTORY_LENGTH + 5):
+            reloaded.record(URL, 1.0, items=1)
+        self.assertEqual(len(reloaded.feeds[URL]["history"]), feed_registry.HISTORY_LENGTH)
+
+    def test_disabled_registry_allows_everything_and_records_nothing(self):
+        registry = feed_registry.FeedRegistry(self.path, enabled=False)
+        for _ in range(5):
+            registry.record(URL, 1.0, error="down")
+        registry.save()
+        self.assertTrue(registry.allow(URL))
+        self.assertEqual(registry.timeout(URL, default=20), 20)
+        self.assertEqual(feed_registry.FeedRegistry(self.path).feeds, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
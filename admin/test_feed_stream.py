@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Unit tests for admin/feed_stream.py and the feed parsers built on it."""
+
+import unittest
+
+from admin import daily_intel_briefing as intel
+from admin import feed_stream
+
+
+def rss_chunks(count, consumed, titles=True):
+    """A large RSS feed, one <item> per chunk, recording how many chunks were read."""
+    yield b'<?xml version="1.0"?><rss version="2.0"><channel><title>Big</title>'
+    for index in range(count):
+        consumed.append(index)
+        title = f"<title>Story {index} &amp; more</title>" if titles else ""
+        yield (f"<item>{title}<link>https://example.com/{index}</link>"
+               f"<description>&lt;p&gt;Body {index}&lt;/p&gt;</description></item>").encode("utf-8")
+    yield b"</channel></rss>"
+
+
+def atom_chunks(count, consumed):
+    """A large Atom feed, one top-level <entry> per chunk, recording how many chunks were read."""
+    yield b'<feed xmlns="http://www.w3.org/2005/Atom"><title>Big Atom</title>'
+    for index in range(count):
+        consumed.append(index)
+        yield f"<entry><title>Entry {index}</title><summary>Body {index}</summary></entry>".encode("utf-8")
+    yield b"</feed>"
+
+
+ATOM = """<feed xmlns="http://www.w3.org/2005/Atom"><title>Atom</title>
+<entry><title>First</title><link href="https://example.com/1"/><published>2026-03-01</published>
+<summary>One</summary></entry>
+<entry><title></title></entry>
+<entry><title>Third</title><summary>Three</summary></entry>
+</feed>"""
+
+
+class FeedStreamTests(unittest.TestCase):
+    def test_entries_are_yielded_as_they_arrive_and_released(self):
+        consumed = []
+        entries = feed_stream.iter_feed_entries(rss_chunks(1000, consumed))
+        kind, first, depth = next(entries)
+        self.assertEqual((kind, depth, first.findtext("title")), ("item", 2, "Story 0 & more"))
+        self.assertEqual(len(first), 3)
+
+        for _ in range(5):
+            next(entries)
+        entries.close()
+        self.assertEqual(len(first), 0)  # cleared once the consumer moved on
+        self.assertLess(len(consumed), 10)
+
+    def test_intel_parser_stops_reading_after_max_items(self):
+        consumed = []
+        items = intel.parse_feed_stream(rss_chunks(1000, consumed), max_items=3)
+        self.assertEqual([item["title"] for item in items],
+                         ["Story 0 & more", "Story 1 & more", "Story 2 & more"])
+        self.assertEqual(items[0]["description"], "Body 0")
+        self.assertLess(len(consumed), 5)
+
+        consumed = []
+        self.assertEqual(intel.parse_feed_stream(rss_chunks(50, consumed, titles=False)), [])
+        self.assertEqual(len(consumed), 50)  # untitled items: keep looking for Atom entries
+
+    def test_intel_parser_falls_back_to_top_level_atom_entries(self):
+        items = intel.parse_rss(ATOM, max_items=3)
+        self.assertEqual([(item["title"], item["link"], item["pubDate"]) for item in items],
+                         [("First", "https://example.com/1", "2026-03-01"), ("Third", "", "")])
+        self.assertEqual(intel.parse_rss(ATOM, max_items=2)[-1]["title"], "First")
+
+    def test_intel_parser_stops_atom_feeds_after_max_items(self):
+        consumed = []
+        items = intel.parse_feed_stream(atom_chunks(1000, consumed), max_items=3)
+        self.assertEqual([item["title"] for item in items], ["Entry 0", "Entry 1", "Entry 2"])
+        self.assertLess(len(consumed), 5)
+
+    def test_intel_parser_keeps_entries_before_a_parse_error(self):
+        consumed = []
+        chunks = list(rss_chunks(3, consumed))[:-1] + [b"<broken></channel>"]
+        self.assertEqual(len(intel.parse_feed_stream(chunks, max_items=5)), 3)
+        self.assertEqual(intel.parse_rss(""), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
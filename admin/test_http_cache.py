@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Unit tests for admin/http_cache.py."""
+
+import tempfile
+import threading
+import unittest
+import urllib.error
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from admin import http_cache
+
+
+class ConditionalHandler(BaseHTTPRequestHandler):
+    """Serves /<name> with a fixed ETag and honours If-None-Match; /missing is a 404."""
+
+    requests = []
+
+    def do_GET(self):
+        type(self).requests.append(
+            (self.path, self.headers.get("If-None-Match"), self.headers.get("If-Modified-Since"))
+        )
+        if self.path == "/missing":
+            self.send_error(404)
+            return
+        etag = f'"{self.path.strip("/")}-v1"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = (self.path * 600).encode("utf-8")
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", "Mon, 02 Mar 2026 10:00:00 GMT")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class HttpCacheTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), ConditionalHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        ConditionalHandler.requests = []
+
+    def cache(self, **kwargs):
+        return http_cache.HttpCache(self._tmp.name, **kwargs)
+
+    def test_fresh_entries_skip_the_network(self):
+        cache = self.cache()
+        body, outcome = cache.fetch(f"{self.base}/feed")
+        self.assertEqual(outcome, "fetched")
+        self.assertEqual(cache.fetch(f"{self.base}/feed"), (body, "fresh"))
+        self.assertEqual(len(ConditionalHandler.requests), 1)
+
+        result = {}
+        self.assertEqual(b"".join(cache.stream(f"{self.base}/feed", result=result)), body)
+        self.assertEqual(result, {"outcome": "fresh", "latency": None})
+
+    def test_streams_report_server_latency(self):
+        result = {}
+        b"".join(self.cache().stream(f"{self.base}/feed", result=result))
+        self.assertEqual(result["outcome"], "fetched")
+        self.assertGreater(result["latency"], 0)
+
+    def test_stale_entries_are_revalidated_with_etag(self):
+        cache = self.cache(ttl=0)
+        body, _ = cache.fetch(f"{self.base}/feed")
+        self.assertEqual(self.cache(ttl=0).fetch(f"{self.base}/feed"), (body, "revalidated"))
+        self.assertEqual(ConditionalHandler.requests[-1][:2], ("/feed", '"feed-v1"'))
+
+    def test_request_ttl_overrides_the_cache_ttl(self):
+        cache = self.cache()
+        body, _ = cache.fetch(f"{self.base}/alerts")
+        self.assertEqual(cache.fetch(f"{self.base}/alerts", ttl=0), (body, "revalidated"))
+        self.assertEqual(len(ConditionalHandler.requests), 2)
+
+    def test_request_headers_are_part_of_the_key(self):
+        cache = self.cache()
+        cache.fetch(f"{self.base}/feed", {"Accept": "application/json"})
+        _, outcome = cache.fetch(f"{self.base}/feed", {"Accept": "text/xml"})
+        self.assertEqual(outcome, "fetched")
+
+    def test_errors_propagate_and_are_not_cached(self):
+        cache = self.cache()
+        with self.assertRaises(urllib.error.HTTPError):
+            cache.fetch(f"{self.base}/missing")
+        self.assertEqual(list(Path(self._tmp.name).glob("*.json")), [])
+
+    def test_streams_closed_early_are_not_read_to_the_end_or_cached(self):
+        cache = self.cache()
+        chunks = cache.stream(f"{self.base}/feed", chunk_size=100)
+        first = next(chunks)
+        chunks.close()
+        self.assertEqual(len(first), 100)
+        self.assertEqual(list(Path(self._tmp.name).iterdir()), [])
+
+        # Nothing was cached, so the next fetch downloads the whole body
+        self.assertEqual(cache.fetch(f"{self.base}/feed"), (b"/feed" * 600, "fetched"))
+        self.assertEqual(ConditionalHandler.requests[-1], ("/feed", None, None))
+
+    def test_least_recently_checked_entries_are_evicted(self):
+        cache = self.cache(max_bytes=2500)  # each body is ~1.2 KB
+        for name in ("a", "b", "c"):
+            cache.fetch(f"{self.base}/{name}")
+        urls = sorted(meta["url"].rsplit("/", 1)[-1] for _, meta in cache.entries())
+        self.assertEqual(urls, ["b", "c"])
+        self.assertEqual(len(list(Path(self._tmp.name).glob("*.body"))), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Unit tests for admin/keyword_scoring.py."""
+
+import random
+import unittest
+
+from admin import daily_intel_briefing as intel
+from admin import keyword_scoring as scoring
+
+
+class KeywordScorerTests(unittest.TestCase):
+    def test_weighted_dimensions_count_each_keyword_once_and_cap(self):
+        scorer = scoring.KeywordScorer({
+            "relevance": scoring.Weighted({"warehouse": 3, "ware": 1, "freight": 2}, cap=5),
+            "mentions": scoring.Weighted(["port", "port", "air"]),
+        })
+        scores = scorer.score("Warehouse warehouse FREIGHT at the airport")
+        self.assertEqual(scores, {"relevance": 5, "mentions": 3})
+        self.assertEqual(scorer.score("nothing here"), {"relevance": 0, "mentions": 0})
+
+    def test_ranked_dimension_returns_first_level_present(self):
+        scorer = scoring.KeywordScorer({
+            "severity": scoring.Ranked({"critical": ["hurricane"], "high": ["strike", "storm"],
+                                        "low": ["report"]}, default="info"),
+        })
+        self.assertEqual(scorer.score("Storm report")["severity"], "high")
+        self.assertEqual(scorer.score("Tropical storm becomes HURRICANE")["severity"], "critical")
+        self.assertEqual(scorer.score("quiet day")["severity"], "info")
+
+    def test_score_split_scores_head_and_full_text_in_one_pass(self):
+        scorer = scoring.KeywordScorer({"hits": scoring.Weighted(["supply chain", "supply", "chain"])})
+        head, full = scorer.score_split("Global  supply", "chain issues")
+        self.assertEqual((head["hits"], full["hits"]), (1, 3))
+
+    def test_intel_scores_match_the_per_keyword_loops(self):
+        def legacy(text):
+            lowered = text.lower()
+            relevance = min(sum(w for kw, w in intel.RELEVANCE_KEYWORDS.items() if kw in lowered), 15)
+            severity = next((level for level in ["critical", "high", "medium", "low"]
+                             if any(kw in lowered for kw in intel.DISRUPTION_KEYWORDS[level])), "info")
+            return relevance, severity
+
+        rng = random.Random(7)
+        vocabulary = sorted(intel.INTEL_SCORER.matcher.vocabulary) + ["the", "and", "week", "ports"]
+        for _ in range(500):
+            separator = rng.choice([" ", "", "-"])  # run-together keywords overlap
+            text = separator.join(rng.choice(vocabulary) for _ in range(rng.randint(0, 12)))
+            text = text.upper() if rng.random() < 0.2 else text
+            with self.subTest(text=text):
+                self.assertEqual((intel.relevance_score(text), intel.disruption_severity(text)),
+                                 legacy(text))
+
+
+if __name__ == "__main__":
+    unittest.main()
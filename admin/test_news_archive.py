@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Unit tests for admin/news_archive.py."""
+
+import tempfile
+import unittest
+from datetime import date, datetime
+from unittest import mock
+
+from admin import news_archive
+
+
+def make_article(index, category="freight", source="FreightWaves"):
+    return {
+        "title": f"Story {index}",
+        "description": f"Summary {index}",
+        "date": datetime(2026, 10, 1, 8, 0),
+        "source": source,
+        "category": category,
+        "link": f"https://example.com/{index}",
+        "relevance_score": 4,
+        "us_score": 2,
+    }
+
+
+class NewsArchiveTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.directory = tmp.name
+        self.archive = news_archive.NewsArchive(self.directory)
+
+    def test_append_skips_links_already_archived_within_lookback(self):
+        self.assertEqual(self.archive.append(date(2026, 10, 5), [make_article(1), make_article(2)]), 2)
+        added = self.archive.append(date(2026, 10, 6), [make_article(2), make_article(3)], lookback_days=3)
+        self.assertEqual(added, 1)
+        self.assertEqual(self.archive.append(date(2026, 10, 6), [make_article(3)], lookback_days=3), 0)
+        self.archive.save()
+
+        reloaded = news_archive.NewsArchive(self.directory)
+        self.assertEqual(reloaded.days["2026-10-06"]["count"], 1)
+        first_day = reloaded.read("2026-10-05")
+        self.assertEqual([record["title"] for record in first_day], ["Story 1", "Story 2"])
+        self.assertEqual([record["featured"] for record in first_day], [True, False])
+        self.assertEqual(first_day[0]["date"], datetime(2026, 10, 1, 8, 0))
+
+    def test_query_only_reads_partitions_the_index_can_match(self):
+        self.archive.append(date(2026, 10, 5), [make_article(1), make_article(2, "ports", "Dive")])
+        self.archive.append(date(2026, 10, 6), [make_article(3)])
+        self.archive.append(date(2026, 10, 20), [make_article(4, "ports")])
+        self.assertEqual(self.archive.days["2026-10-05"]["categories"], {"freight": 1, "ports": 1})
+
+        with mock.patch.object(self.archive, "read", wraps=self.archive.read) as read:
+            records = self.archive.query(category="ports", end=date(2026, 10, 10))
+        self.assertEqual([record["title"] for record in records], ["Story 2"])
+        self.assertEqual([call.args[0] for call in read.call_args_list], ["2026-10-05"])
+
+        by_source = self.archive.query(start=date(2026, 10, 6), source="FreightWaves")
+        self.assertEqual([record["title"] for record in by_source], ["Story 4", "Story 3"])
+
+    def test_period_keys_change_only_with_their_partitions(self):
+        self.archive.append(date(2026, 9, 30), [make_article(1)])  # ISO week 40, September
+        self.archive.append(date(2026, 10, 1), [make_article(2)])  # ISO week 40, October
+        self.archive.append(date(2026, 10, 12), [make_article(3)])  # ISO week 42, October
+        before = self.archive.periods()
+        self.assertEqual(sorted(before), [("month", "2026-09"), ("month", "2026-10"),
+                                          ("week", "2026-W40"), ("week", "2026-W42")])
+        self.assertEqual(before[("week", "2026-W40")][0], ["2026-10-01", "2026-09-30"])
+
+        self.archive.append(date(2026, 10, 13), [make_article(4)])
+        after = self.archive.periods()
+        changed = {period for period in before if before[period][1] != after[period][1]}
+        self.assertEqual(changed, {("month", "2026-10"), ("week", "2026-W42")})
+
+
+if __name__ == "__main__":
+    unittest.main()
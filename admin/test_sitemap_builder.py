@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Unit tests for admin/sitemap_builder.py."""
+
+import gzip
+import tempfile
+import unittest
+from datetime import date, datetime
+from pathlib import Path
+
+from admin import news_archive
+from admin import sitemap_builder as sitemaps
+
+
+def entries(prefix, count, lastmod="2026-03-01"):
+    return [{"loc": f"https://miamialliance3pl.com/{prefix}{i}.html", "lastmod": lastmod,
+             "changefreq": "monthly", "priority": "0.6"} for i in range(count)]
+
+
+class SitemapBuilderTests(unittest.TestCase):
+    def test_small_sites_get_a_single_urlset(self):
+        files = sitemaps.plan_sitemaps(entries("page", 2), entries("blog/page/", 1), entries("blog/p", 3))
+        self.assertEqual(list(files), ["sitemap.xml"])
+
+        kind, parsed = sitemaps.parse_sitemap(files["sitemap.xml"])
+        self.assertEqual(kind, "urlset")
+        self.assertEqual(len(parsed), 6)
+        self.assertEqual(parsed[0]["priority"], "0.6")
+
+    def test_large_sites_get_an_index_with_deterministic_gzip_children(self):
+        posts = entries("blog/p", 25)
+        posts[-1]["lastmod"] = "2026-04-28"
+        files = sitemaps.plan_sitemaps(entries("page", 3), [], posts, max_urls=10)
+
+        self.assertEqual(sorted(files), [
+            "sitemap-blog-1.xml.gz", "sitemap-blog-2.xml.gz", "sitemap-blog-3.xml.gz",
+            "sitemap-pages.xml.gz", "sitemap.xml",
+        ])
+        kind, children = sitemaps.parse_sitemap(files["sitemap.xml"])
+        self.assertEqual(kind, "sitemapindex")
+        self.assertEqual(children[-1]["lastmod"], "2026-04-28")
+        _, last = sitemaps.parse_sitemap(gzip.decompress(files["sitemap-blog-3.xml.gz"]))
+        self.assertEqual(len(last), 5)
+
+        again = sitemaps.plan_sitemaps(entries("page", 3), [], posts, max_urls=10)
+        self.assertEqual(again, files)
+
+    def test_sync_rewrites_only_changed_children_and_reads_them_back(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            posts = entries("blog/p", 25)
+            sitemaps.sync_sitemaps(sitemaps.plan_sitemaps(entries("page", 3), [], posts, 10), root)
+            self.assertEqual(len(sitemaps.load_entries(root / "sitemap.xml")), 28)
+
+            posts.append(entries("blog/new", 1, lastmod="2026-05-01")[0])
+            written, unchanged, removed = sitemaps.sync_sitemaps(
+                sitemaps.plan_sitemaps(entries("page", 3), [], posts, 10), root
+            )
+            self.assertEqual(sorted(path.name for path in written),
+                             ["sitemap-blog-3.xml.gz", "sitemap.xml"])
+            self.assertEqual((len(unchanged), removed), (3, []))
+
+            _, _, removed = sitemaps.sync_sitemaps(
+                sitemaps.plan_sitemaps(entries("page", 3), [], posts), root
+            )
+            self.assertEqual(len(removed), 4)
+            self.assertEqual([path.name for path in root.iterdir()], ["sitemap.xml"])
+
+    def test_digest_entries_replace_only_the_news_digests(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / "blog" / "news").mkdir(parents=True)
+            (root / "blog" / "news" / "2026-W42.html").write_text("digest", encoding="utf-8")
+            archive = news_archive.NewsArchive(root / "archive")
+            archive.append(date(2026, 10, 13), [{"title": "Story", "date": datetime(2026, 10, 13, 8),
+                                                 "source": "Wire", "category": "ports",
+                                                 "link": "https://example.com/1"}])
+            digests = sitemaps.news_digest_entries(archive, root)
+            self.assertEqual([(entry["loc"].rsplit("/", 1)[-1], entry["lastmod"]) for entry in digests],
+                             [("2026-W42.html", "2026-10-13")])  # the month digest was never built
+
+            pages, listings, posts = entries("page", 2), entries("blog/page/", 1), entries("blog/p", 3)
+            sitemaps.sync_sitemaps(sitemaps.plan_sitemaps(pages, listings + entries("blog/news/old", 1), posts), root)
+            written, _, _ = sitemaps.replace_digest_entries(digests, root / "sitemap.xml")
+            self.assertEqual([path.name for path in written], ["sitemap.xml"])
+            expected = sitemaps.plan_sitemaps(pages, listings + digests, posts)["sitemap.xml"]
+            self.assertEqual((root / "sitemap.xml").read_bytes(), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""Unit tests for admin/update_blog_from_files.py."""
+
+import os
+import re
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import mock
+
+from admin import update_blog_from_files as blog
+
+
+def write_post(directory, name, title="Cold Chain Basics", date="2026-03-02", extra=""):
+    published = f'<meta property="article:published_time" content="{date}">' if date else ""
+    path = Path(directory) / name
+    path.write_text(
+        f"<html><head><title>{title} | Miami Alliance 3PL</title>\n"
+        f'<meta name="description" content="Keeping &amp; moving cold goods">\n'
+        f"{published}\n</head><body>{extra}</body></html>",
+        encoding="utf-8",
+    )
+    return path
+
+
+class HeadExtractionTests(unittest.TestCase):
+    def test_read_head_stops_at_head_end_across_chunks(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            post = write_post(tmp, "post.html", extra="<title>Body title</title>" * 500)
+            head = blog.read_head(post, chunk_size=7)
+
+        self.assertTrue(head.endswith(b"</head>"))
+        self.assertNotIn(b"Body title", head)
+
+    def test_category_and_author_are_extracted(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            post = write_post(tmp, "post.html", date="2026-02-01")
+            post.write_text(post.read_text(encoding="utf-8").replace(
+                "</head>",
+                '<meta name="author" content="Miami Alliance 3PL">\n'
+                '<meta property="article:section" content="Trade &amp; Tariffs">\n</head>',
+            ), encoding="utf-8")
+            meta = blog.extract_metadata(post)
+
+        self.assertEqual(meta["category"], "Trade & Tariffs")
+        self.assertEqual(meta["author"], "Miami Alliance 3PL")
+
+    def test_scan_head_takes_first_value_of_each_field(self):
+        fields = blog.scan_head(
+            '<title>First</title><title>Second</title>'
+            '<meta property="article:published_time" content="2026-01-05">'
+        )
+        self.assertEqual(fields, {"title": "First", "published": "2026-01-05"})
+
+
+class MetadataCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache_path = Path(self.tmp.name) / "cache.json"
+
+    def scan(self, *paths):
+        cache = blog.MetadataCache(self.cache_path)
+        metas = [cache.lookup(path) for path in paths]
+        cache.save()
+        return cache, metas
+
+    def test_unchanged_posts_are_served_from_cache(self):
+        post = write_post(self.tmp.name, "cold-chain.html")
+        cache, (first,) = self.scan(post)
+        self.assertEqual((cache.hits, cache.parsed), (0, 1))
+        self.assertEqual(first["title"], "Cold Chain Basics")
+        self.assertEqual(first["description"], "Keeping & moving cold goods")
+
+        cache, (second,) = self.scan(post)
+        self.assertEqual((cache.hits, cache.parsed), (1, 0))
+        self.assertEqual(second, first)
+
+    def test_touched_post_is_rehashed_and_edited_post_reparsed(self):
+        post = write_post(self.tmp.name, "cold-chain.html")
+        self.scan(post)
+
+        stat = post.stat()
+        os.utime(post, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+        cache, _ = self.scan(post)
+        self.assertEqual((cache.hits, cache.rehashed, cache.parsed), (0, 1, 0))
+
+        write_post(self.tmp.name, "cold-chain.html", extra="<p>Body-only edit</p>")
+        cache, _ = self.scan(post)
+        self.assertEqual((cache.rehashed, cache.parsed), (1, 0))
+
+        write_post(self.tmp.name, "cold-chain.html", title="Cold Chain Advanced")
+        cache, (meta,) = self.scan(post)
+        self.assertEqual(cache.parsed, 1)
+        self.assertEqual(meta["title"], "Cold Chain Advanced")
+
+    def test_mtime_dated_posts_follow_the_file(self):
+        post = write_post(self.tmp.name, "undated.html", date=None)
+        self.scan(post)
+        os.utime(post, (0, 1_700_000_000))
+
+        cache, (meta,) = self.scan(post)
+        self.assertEqual(cache.rehashed, 1)
+        self.assertEqual(meta["date"], datetime.fromtimestamp(1_700_000_000))
+
+    def test_skipped_posts_are_cached_too(self):
+        stub = write_post(self.tmp.name, "old.html", title="Redirecting...")
+        self.scan(stub)
+        cache, (meta,) = self.scan(stub)
+        self.assertIsNone(meta)
+        self.assertEqual(cache.hits, 1)
+
+
+class ParallelScanTests(unittest.TestCase):
+    def test_parallel_scan_keeps_order_and_reports_errors_per_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = [write_post(tmp, f"post-{i:02d}.html", title=f"Post {i}") for i in range(12)]
+            paths.insert(5, write_post(tmp, "broken.html", date="not-a-date"))
+
+            serial = blog.scan_posts(paths, blog.MetadataCache(enabled=False))
+            for pool in ("thread", "process"):
+                parallel = blog.scan_posts(paths, blog.MetadataCache(enabled=False), jobs=3, pool=pool)
+                self.assertEqual([(p, m) for p, m, _ in parallel], [(p, m) for p, m, _ in serial])
+
+        errors = [(path.name, type(error)) for path, _, error in serial if error]
+        self.assertEqual(errors, [("broken.html", ValueError)])
+
+
+class RegionTemplateTests(unittest.TestCase):
+    PAGE = (
+        '<head><!-- Structured Data - CollectionPage -->\n<script type="application/ld+json">\n'
+        '{"old": true}\n</script></head>\n'
+        '<span class="article-count" data-i18n="blog.count">3 Articles</span>\n'
+        '<!-- Main Content: Blog Article Grid -->\n<div>\n<div class="blog-grid">old cards'
+        '</div>\n</div>\n<!-- Sidebar -->\n<ul class="categories-list">'
+        '<li><span data-i18n="blog.cat.all">All</span>\n<span class="cat-count">3</span></li>'
+        '<li><span data-i18n="blog.cat.ecommerce">E-Commerce</span>\n<span class="cat-count">1</span></li>'
+        '<li><span data-i18n="blog.cat.smallbiz">Small Business</span> <span class="cat-count">2</span></li>'
+        '</ul>'
+    )
+
+    def test_all_regions_replaced_in_one_pass(self):
+        values = {
+            "collection_page": '{"new": true}',
+            "article_count": "5 Articles",
+            "blog_grid": "new cards",
+            "categories_list": lambda body: blog.update_category_counts(body, 5, {
+                "categories": {"ecommerce": {"name": "Ecommerce", "posts": [{}] * 4}},
+            }),
+        }
+        page, missing = blog.BLOG_TEMPLATE.render(self.PAGE, values)
+        self.assertEqual(missing, [])
+        self.assertIn('{"new": true}\n</script>', page)
+        self.assertIn('data-i18n="blog.count">5 Articles</span>', page)
+        self.assertIn('<div class="blog-grid">new cards</div>', page)
+        self.assertIn('<a href="blog.html"><span data-i18n="blog.cat.all">All</span></a>\n'
+                      '<span class="cat-count">5</span>', page)
+        self.assertIn('<a href="blog/category/ecommerce.html"><span data-i18n="blog.cat.ecommerce">'
+                      'E-Commerce</span></a>\n<span class="cat-count">4</span>', page)
+        self.assertIn('<li><span data-i18n="blog.cat.smallbiz">Small Business</span> '
+                      '<span class="cat-count">0</span>', page)
+        self.assertNotIn("old", page)
+        self.assertEqual(blog.BLOG_TEMPLATE.render(page, values)[0], page)
+
+    def test_missing_regions_are_reported(self):
+        page, missing = blog.BLOG_TEMPLATE.render("<html></html>", {"blog_grid": "cards"})
+        self.assertEqual((page, missing), ("<html></html>", ["blog_grid"]))
+
+
+def make_posts(count):
+    """Newest-first post metadata, one day apart."""
+    start = datetime(2026, 1, 1)
+    posts = [{"path": f"post-{i:03d}.html", "title": f"Post {i}", "description": "Summary",
+              "date": start + timedelta(days=i)} for i in range(count)]
+    return posts[::-1]
+
+
+SHELL = (
+    '<html><head><title>Blog</title>\n<link rel="canonical" href="https://miamialliance3pl.com/blog.html">\n'
+    '<link rel="stylesheet" href="css/style.css">\n</head><body><a href="#main-content">Skip</a>'
+    '<main id="main-content">news and sidebar</main><script src="js/main.js"></script></body></html>'
+)
+
+
+class ArchivePageTests(unittest.TestCase):
+    def test_pages_are_anchored_at_the_oldest_post(self):
+        pages = blog.paginate_posts(make_posts(25), page_size=10)
+        self.assertEqual([len(page) for page in pages], [10, 10, 5])
+        self.assertEqual(pages[0][-1]["title"], "Post 0")
+        self.assertEqual(pages[-1][0]["title"], "Post 24")
+
+    def test_archive_page_rewrites_urls_and_links_neighbours(self):
+        pages = blog.build_archive_pages(SHELL, make_posts(25), page_size=10)
+        middle = pages[blog.BLOG_PAGES_DIR / "2.html"]
+
+        self.assertIn('href="https://miamialliance3pl.com/blog/page/2.html"', middle)
+        self.assertIn('href="../../css/style.css"', middle)
+        self.assertIn('src="../../js/main.js"', middle)
+        self.assertIn('href="#main-content"', middle)
+        self.assertIn('href="../post-019.html"', middle)
+        self.assertIn('href="3.html" class="btn btn-outline" rel="prev"', middle)
+        self.assertIn('href="1.html" class="btn btn-outline" rel="next"', middle)
+        self.assertNotIn("news and sidebar", middle)
+        self.assertIn('href="../../blog.html" class="btn btn-outline" rel="prev"',
+                      pages[blog.BLOG_PAGES_DIR / "3.html"])
+
+    def test_each_generated_page_has_its_own_title_and_description(self):
+        shell = SHELL.replace("</head>", (
+            '<meta name="description" content="Blog description">\n'
+            '<meta property="og:title" content="Blog">\n'
+            '<meta property="og:description" content="Blog description">\n'
+            '<meta name="twitter:title" content="Blog">\n'
+            '<meta name="twitter:description" content="Blog description">\n</head>'))
+        posts = make_posts(25)
+        for post in posts:
+            post["category"] = "Trade & Tariffs"
+        pages = list(blog.build_archive_pages(shell, posts, page_size=10).values())
+        pages += blog.build_category_pages(shell, blog.build_blog_index(posts)).values()
+
+        heads = set()
+        for page in pages:
+            title = re.search(r"<title>(.*?)</title>", page).group(1)
+            description = re.search(r'<meta name="description" content="(.*?)">', page).group(1)
+            self.assertNotIn("Blog description", page)
+            self.assertIn(f'<meta property="og:title" content="{title}">', page)
+            self.assertIn(f'<meta name="twitter:description" content="{description}">', page)
+            heads.add((title, description))
+        self.assertEqual(len(heads), 4)
+        self.assertIn("Trade &amp; Tariffs", pages[-1].split("</head>")[0])
+
+    def test_front_page_links_to_an_archive_page_without_its_posts(self):
+        for count in (25, 30):
+            front, rest = blog.split_front_page(make_posts(count), page_size=10)
+            grid = blog.generate_front_grid(front, len(blog.paginate_posts(rest, 10)))
+            number = re.search(r'href="blog/page/(\d+)\.html"', grid).group(1)
+            linked = blog.build_archive_pages(SHELL, rest, 10)[blog.BLOG_PAGES_DIR / f"{number}.html"]
+
+            linked_paths = set(re.findall(r'href="\.\./(post-\d+\.html)"', linked))
+            self.assertTrue(linked_paths)
+            self.assertFalse(linked_paths & {post["path"] for post in front})
+            self.assertIn(rest[0]["path"], linked_paths)
+
+    def test_new_post_rewrites_only_the_newest_pages(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            pages_dir = Path(tmp) / "page"
+            with mock.patch.object(blog, "BLOG_PAGES_DIR", pages_dir):
+                posts = make_posts(30)
+                written, _, _ = blog.sync_archive_pages(blog.build_archive_pages(SHELL, posts[1:], 10))
+                self.assertEqual(len(written), 3)
+
+                written, unchanged, removed = blog.sync_archive_pages(
+                    blog.build_archive_pages(SHELL, posts, 10)
+                )
+                self.assertEqual([path.name for path in written], ["3.html"])
+                self.assertEqual((len(unchanged), removed), (2, []))
+
+                written, _, _ = blog.sync_archive_pages(
+                    blog.build_archive_pages(SHELL, make_posts(31), 10)
+                )
+                self.assertEqual(sorted(path.name for path in written), ["3.html", "4.html"])
+
+
+    def test_missing_blog_grid_stops_before_any_page_is_written(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / "posts").mkdir()
+            for day in range(1, 4):
+                write_post(root / "posts", f"post-{day}.html", date=f"2026-03-0{day}",
+                           extra='<meta property="article:section" content="Freight">')
+            (root / "blog.html").write_text(SHELL, encoding="utf-8")
+            with mock.patch.multiple(blog, BLOG_POSTS_DIR=root / "posts", BLOG_HTML_PATH=root / "blog.html",
+                                     BLOG_PAGES_DIR=root / "page", BLOG_CATEGORIES_DIR=root / "category"), \
+                    mock.patch("sys.argv", ["update_blog_from_files.py", "--apply", "--no-cache",
+                                            "--no-sitemap", "--page-size", "1"]), \
+                    mock.patch("builtins.print"):
+                blog.main()
+            self.assertEqual(sorted(os.listdir(root)), ["blog.html", "posts"])
+            self.assertEqual((root / "blog.html").read_text(encoding="utf-8"), SHELL)
+
+
+class CategoryIndexTests(unittest.TestCase):
+    def test_index_groups_spelling_variants_under_one_slug(self):
+        posts = make_posts(5)
+        for post, category in zip(posts, ["Trade & Tariffs", "Trade &amp; Tariffs", "Freight",
+                                          "trade and tariffs", None]):
+            if category:
+                post["category"] = category.replace("&amp;", "&")
+            post["author"] = "Miami Alliance 3PL"
+
+        index = blog.build_blog_index(posts)
+        self.assertEqual(sorted(index["categories"]), ["freight", "trade-and-tariffs"])
+        self.assertEqual(len(index["categories"]["trade-and-tariffs"]["posts"]), 3)
+        self.assertEqual(index["authors"], {"Miami Alliance 3PL": 5})
+
+        pages = blog.build_category_pages(SHELL, index)
+        self.assertEqual(index["categories"]["trade-and-tariffs"]["name"], "Trade & Tariffs")
+        freight = pages[blog.BLOG_CATEGORIES_DIR / "freight.html"]
+        self.assertIn("https://miamialliance3pl.com/blog/category/freight.html", freight)
+        self.assertEqual(freight.count('class="blog-card"'), 1)
+
+
+    def test_slugs_drop_accents_and_variants_merge_under_the_common_spelling(self):
+        self.assertEqual(blog.category_slug("Guía de Exportación"), "guia-de-exportacion")
+        posts = make_posts(4)
+        for post, category in zip(posts, ["Ecommerce", "E-Commerce", "E-Commerce", "e-commerce"]):
+            post["category"] = category
+
+        index = blog.build_blog_index(posts)
+        self.assertEqual(list(index["categories"]), ["e-commerce"])
+        self.assertEqual(index["categories"]["e-commerce"]["name"], "E-Commerce")
+        self.assertEqual(len(index["categories"]["e-commerce"]["posts"]), 4)
+
+
+class SitemapEntryTests(unittest.TestCase):
+    def test_entries_keep_site_pages_and_follow_post_dates(self):
+        posts = make_posts(3)
+        posts[0]["modified"] = "2026-02-01"
+        posts[0]["category"] = "Freight"
+        existing = [
+            {"loc": "https://miamialliance3pl.com/", "lastmod": "2026-01-01", "priority": "1.0"},
+            {"loc": "https://miamialliance3pl.com/blog.html", "lastmod": "2025-12-01"},
+            {"loc": "https://miamialliance3pl.com/blog/post-001.html", "priority": "0.85"},
+            {"loc": "https://miamialliance3pl.com/blog/deleted.html"},
+        ]
+        pages, listings, post_entries = blog.build_sitemap_entries(
+            posts, blog.paginate_posts(posts, 2), blog.build_blog_index(posts), existing
+        )
+
+        self.assertEqual(pages[0], existing[0])
+        self.assertEqual(pages[1]["lastmod"], "2026-02-01")
+        self.assertEqual([entry["loc"].rsplit("/", 1)[-1] for entry in post_entries],
+                         ["post-000.html", "post-001.html", "post-002.html"])
+        self.assertEqual(post_entries[1]["priority"], "0.85")
+        self.assertEqual(post_entries[2]["lastmod"], "2026-02-01")
+        self.assertEqual([entry["loc"].split("/blog/")[1] for entry in listings],
+                         ["page/1.html", "page/2.html", "category/freight.html"])
+
+    def test_mtime_dated_posts_keep_their_sitemap_lastmod(self):
+        posts = make_posts(3)
+        checkout = datetime(2026, 10, 19, 9, 30)
+        for post in posts[:2]:
+            post.update(date=checkout, date_from_mtime=True)
+        existing = [
+            {"loc": "https://miamialliance3pl.com/blog.html", "lastmod": "2026-03-01"},
+            {"loc": "https://miamialliance3pl.com/blog/post-002.html", "lastmod": "2026-04-26"},
+        ]
+        pages, listings, post_entries = blog.build_sitemap_entries(
+            posts, [posts], blog.build_blog_index(posts), existing
+        )
+
+        lastmods = {entry["loc"].rsplit("/", 1)[-1]: entry["lastmod"] for entry in post_entries}
+        self.assertEqual(lastmods["post-002.html"], "2026-04-26")
+        # A post the sitemap has never listed falls back to its mtime
+        self.assertEqual(lastmods["post-001.html"], "2026-10-19")
+        self.assertEqual(pages[0]["lastmod"], "2026-03-01")
+
+
+if __name__ == "__main__":
+    unittest.main()
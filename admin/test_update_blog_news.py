@@ -1,9 +1,16 @@
 #!/usr/bin/env python3
 """Unit tests for admin/update_blog_news.py."""
 
+import random
+import tempfile
+import threading
+import time
 import unittest
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
 
+from admin import build_pipeline, feed_registry, http_cache, news_archive
 from admin import update_blog_news as news
 
 
@@ -43,6 +50,49 @@ class UpdateBlogNewsTests(unittest.TestCase):
         )
         self.assertGreaterEqual(score, 2)
 
+    def test_compiled_matcher_matches_per_keyword_scans(self):
+        cases = [
+            ("U.S. ports", "Reuters", ""),  # "u.s." and "u.s" start at the same place
+            ("Portexas upsurge", "exporter", ""),  # keywords overlapping across matches
+            ("Global supply", "shortage hits supply", "chain Florida"),  # straddles the category boundary
+            ("  Warehouse\nAutomation ", "", "WMS  3PL"),
+            ("", "", "freight"),
+        ]
+        for title, description, categories_text in cases:
+            combined = news.normalize_text(f"{title} {description}")
+            full = f"{title} {description} {categories_text}"
+            expected_hits = {category: sum(1 for kw in keywords if kw in combined)
+                             for category, keywords in news.CATEGORY_KEYWORDS.items()}
+            expected_full = {
+                "logistics": news.keyword_hits(full, news.LOGISTICS_RELEVANCE_KEYWORDS),
+                "us": news.keyword_hits(full, news.US_RELEVANCE_KEYWORDS),
+            }
+            head_scores, full_scores = news.KEYWORD_SCORER.score_split(f"{title} {description}", categories_text)
+            with self.subTest(title=title):
+                self.assertEqual({c: head_scores[c] for c in news.CATEGORY_KEYWORDS}, expected_hits)
+                self.assertEqual({k: full_scores[k] for k in expected_full}, expected_full)
+                self.assertEqual(news.logistics_relevance_score(title, description, categories_text),
+                                 expected_full["logistics"])
+
+    def test_fetch_feed_stops_streaming_after_enough_recent_items(self):
+        consumed = []
+        today = datetime.now().strftime("%a, %d %b %Y %H:%M:%S +0000")
+
+        def chunks():
+            yield b"<rss><channel>"
+            for index in range(500):
+                consumed.append(index)
+                published = today if index % 2 == 0 else "Mon, 06 Jan 2020 10:00:00 +0000"
+                yield (f"<item><title>Freight story {index}</title><link>https://example.com/{index}</link>"
+                       f"<pubDate>{published}</pubDate></item>").encode("utf-8")
+            yield b"</channel></rss>"
+
+        with mock.patch.object(news.HTTP_CACHE, "stream", return_value=chunks()):
+            items = news.fetch_feed("https://example.com/feed", max_recent=4)
+        self.assertEqual(len(items), 7)  # four recent, three old ones in between
+        self.assertEqual(items[-1]["title"], "Freight story 6")
+        self.assertLess(len(consumed), 10)
+
     def test_select_articles_limits_source_share_and_dedupes(self):
         now = datetime.now()
         articles = []
@@ -84,6 +134,326 @@ class UpdateBlogNewsTests(unittest.TestCase):
         title_keys = [news.build_title_key(article["title"]) for article in selected]
         self.assertEqual(len(title_keys), len(set(title_keys)))
 
+    def test_select_articles_heap_matches_full_sort(self):
+        def sorted_selection(all_articles, limit):
+            """Full-sort version of select_articles: best-scored copy per cluster, newest first."""
+            all_articles = sorted(all_articles, key=lambda a: (a["date"], a["relevance_score"], a["us_score"]),
+                                  reverse=True)
+            cutoff = datetime.now() - timedelta(days=news.RECENT_DAYS)
+            pool = [a for a in all_articles if a["date"] >= cutoff] or all_articles
+            relevant = [a for a in pool if a["relevance_score"] >= news.MIN_RELEVANCE_SCORE]
+            pool = relevant if len(relevant) >= limit else pool
+            us_focused = [a for a in pool if a["us_score"] > 0]
+            pool = us_focused if len(us_focused) >= limit else pool
+            ranked = sorted(pool, key=lambda a: (a["date"], a["us_score"] > 0, a["relevance_score"], a["us_score"]),
+                            reverse=True)
+            duplicates = news.NearDuplicateIndex(ranked)
+            copies = {}
+            for index in range(len(ranked)):
+                copies.setdefault(duplicates.cluster_of(index), []).append(index)
+            for members in copies.values():
+                members.sort(key=lambda i: (-ranked[i]["relevance_score"], -ranked[i]["us_score"], i))
+            seen, sources, selected = set(), {}, []
+            while copies and len(selected) < limit:
+                cluster = min(copies, key=lambda c: copies[c][0])
+                article = ranked[copies[cluster][0]]
+                key = news.build_title_key(article["title"])
+                if key in seen or sources.get(article["source"], 0) >= news.MAX_SOURCE_SHARE:
+                    copies[cluster].pop(0)
+                    if not copies[cluster]:
+                        del copies[cluster]
+                    continue
+                seen.add(key)
+                sources[article["source"]] = sources.get(article["source"], 0) + 1
+                selected.append(copies.pop(cluster)[0])
+            return [ranked[index] for index in sorted(selected)]
+
+        rng = random.Random(11)
+        now = datetime.now().replace(minute=0, second=0, microsecond=0)
+        for trial in range(40):
+            articles = [{
+                "title": f"Story {rng.randint(0, 60)} {rng.choice(['port', 'rail', 'truck'])}",
+                "description": f"Summary {index}",
+                "date": now - timedelta(hours=rng.choice([1, 2, 30, 300, 400])),
+                "source": f"Source {rng.randint(0, 5)}",
+                "relevance_score": rng.randint(0, 4),
+                "us_score": rng.randint(0, 2),
+            } for index in range(rng.randint(1, 80))]
+            limit = rng.randint(1, 12)
+            with self.subTest(trial=trial):
+                self.assertEqual(news.select_articles(list(articles), limit), sorted_selection(articles, limit))
+
+    def test_select_articles_keeps_best_scored_of_syndicated_copies(self):
+        now = datetime.now()
+        description = ("Port of Miami container volumes rose sharply in September as "
+                       "importers front-loaded holiday freight ahead of new tariffs")
+
+        def article(title, source, hours, relevance):
+            return {"title": title, "description": description, "date": now - timedelta(hours=hours),
+                    "source": source, "category": "ports", "link": f"https://example.com/{source}",
+                    "relevance_score": relevance, "us_score": 2}
+
+        articles = [
+            article("Port of Miami container volumes surge in September", "Wire", 2, 6),
+            article("Port of Miami container volumes surge in September, data shows", "Copy", 1, 4),
+            article("Rail carload volumes slip as intermodal demand cools", "Other", 3, 5),
+        ]
+        articles[2]["description"] = "Weekly rail traffic fell for intermodal units across U.S. networks"
+
+        selected = news.select_articles(articles, limit=5)
+        self.assertEqual([item["source"] for item in selected], ["Wire", "Other"])
+
+        # The best copy's source is at its cap: the runner-up stands in, in date order
+        scoop = article("Miami warehouse vacancy hits record low", "Wire", 0.5, 5)
+        scoop["description"] = "Industrial vacancy across Miami-Dade dropped for a fifth straight quarter"
+        with mock.patch.object(news, "MAX_SOURCE_SHARE", 1):
+            selected = news.select_articles(articles + [scoop], limit=5)
+        self.assertEqual([item["source"] for item in selected], ["Wire", "Copy", "Other"])
+
+    def test_near_duplicate_index_clusters_thousands_of_articles(self):
+        rng = random.Random(3)
+        vocabulary = [f"term{index}" for index in range(4000)]
+        articles = []
+        for index in range(2000):
+            title, description = rng.sample(vocabulary, 8), rng.sample(vocabulary, 25)
+            articles.append({"title": " ".join(title), "description": " ".join(description)})
+            if index % 10 == 0:  # reworded copy: one title word and two summary words changed
+                title[0], description[0], description[1] = "breaking", "reported", "today"
+                articles.append({"title": " ".join(title), "description": " ".join(description)})
+
+        index = news.NearDuplicateIndex(articles)
+
+        clusters = {index.cluster_of(position) for position in range(len(articles))}
+        self.assertEqual(len(clusters), 2000)
+
+
+CANNED_RSS = """<?xml version="1.0"?>
+<rss version="2.0"><channel><title>{name}</title>
+<item><title>{name} warehouse news</title><link>https://example.com/{name}</link>
+<description>U.S. freight update</description><pubDate>Mon, 02 Mar 2026 10:00:00 GMT</pubDate></item>
+</channel></rss>"""
+
+
+class DelayedFeedHandler(BaseHTTPRequestHandler):
+    """Serves /<name>?delay=<seconds> as a one-item RSS feed after sleeping."""
+
+    def do_GET(self):
+        path, _, query = self.path.partition("?")
+        delay = float(query.split("=", 1)[1]) if query.startswith("delay=") else 0
+        time.sleep(delay)
+        body = CANNED_RSS.format(name=path.strip("/")).encode("utf-8")
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/rss+xml")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except OSError:
+            pass  # client gave up
+
+    def log_message(self, *args):
+        pass
+
+
+class StubFeedServerTestCase(unittest.TestCase):
+    """Runs DelayedFeedHandler on a local port with a throwaway HTTP cache."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), DelayedFeedHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        cls.cache_dir = tempfile.TemporaryDirectory()
+        cls.cache_patch = mock.patch.object(news, "HTTP_CACHE", http_cache.HttpCache(cls.cache_dir.name))
+        cls.cache_patch.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.cache_patch.stop()
+        cls.cache_dir.cleanup()
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def feed(self, name, delay=0):
+        return {"url": f"{self.base}/{name}?delay={delay}", "name": name, "category": "freight"}
+
+
+class FetchFeedsTests(StubFeedServerTestCase):
+    def test_feeds_are_fetched_concurrently_in_feed_order(self):
+        feeds = [self.feed(f"feed{i}", delay=0.3) for i in range(4)]
+        started = time.monotonic()
+        results, timed_out = news.fetch_feeds(feeds, timeout=5, deadline=5)
+        elapsed = time.monotonic() - started
+
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(timed_out, [])
+        self.assertEqual([feed["name"] for feed, _ in results], ["feed0", "feed1", "feed2", "feed3"])
+        self.assertEqual(results[2][1][0]["title"], "feed2 warehouse news")
+
+    def test_deadline_returns_partial_results(self):
+        feeds = [self.feed("fast"), self.feed("stalled", delay=3), self.feed("quick", delay=0.1)]
+        started = time.monotonic()
+        results, timed_out = news.fetch_feeds(feeds, timeout=10, deadline=0.6)
+        elapsed = time.monotonic() - started
+
+        self.assertLess(elapsed, 1.2)
+        self.assertEqual([feed["name"] for feed, _ in results], ["fast", "quick"])
+        self.assertEqual([feed["name"] for feed in timed_out], ["stalled"])
+
+    def test_per_feed_timeout_yields_empty_feed(self):
+        results, timed_out = news.fetch_feeds([self.feed("slow", delay=2)], timeout=0.3, deadline=5)
+        self.assertEqual((results[0][1], timed_out), ([], []))
+
+    def test_registry_sets_feed_timeouts_and_records_outcomes(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        registry = feed_registry.FeedRegistry(f"{tmp.name}/health.json")
+        fast, slow, stalled = self.feed("fast"), self.feed("slow", delay=1), self.feed("stalled", delay=3)
+        for _ in range(feed_registry.MIN_LATENCY_SAMPLES):
+            registry.record(slow["url"], 0.05, items=1)
+        with mock.patch.object(feed_registry, "MIN_FEED_TIMEOUT", 0.3):
+            results, timed_out = news.fetch_feeds([fast, slow, stalled], timeout=10, deadline=2,
+                                                  registry=registry)
+
+        self.assertEqual([(feed["name"], len(items)) for feed, items in results], [("fast", 1), ("slow", 0)])
+        self.assertEqual(timed_out, [stalled])
+        self.assertEqual(registry.stats(fast["url"], 10)["fetches"], 1)
+        self.assertEqual(registry.stats(slow["url"], 10)["failure_rate"], 1 / 6)  # timed out at 0.3s
+        self.assertIn("deadline", registry.stats(stalled["url"], 10)["last_error"])
+
+
+class ItemStoreTests(StubFeedServerTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = f"{tmp.name}/items.json"
+
+    def score_feed(self, store):
+        items = news.fetch_feed(self.feed("stored")["url"], timeout=5, store=store)
+        results = []
+        for item in items:
+            scores = store.scores(item, "freight")
+            if scores is None:
+                scores = news.score_item(item, "freight")
+                store.put(item, "freight", scores)
+            results.append((item["title"], scores))
+        return results
+
+    def test_known_items_skip_cleaning_and_scoring(self):
+        store = news.ItemStore(self.path)
+        first = self.score_feed(store)
+        store.save()
+        self.assertEqual(first, [("stored warehouse news", ("freight", 2, 2))])
+
+        again = news.ItemStore(self.path)
+        with mock.patch.object(news, "clean_html", side_effect=AssertionError("cleaned")), \
+                mock.patch.object(news, "score_item", side_effect=AssertionError("scored")):
+            self.assertEqual(self.score_feed(again), first)
+        self.assertEqual((again.reused, again.added), (1, 0))
+
+    def test_items_not_seen_for_recent_days_are_dropped(self):
+        store = news.ItemStore(self.path)
+        self.score_feed(store)
+        fingerprint = next(iter(store.entries))
+        store.entries[fingerprint]["seen_at"] -= (news.RECENT_DAYS + 1) * 86400
+        store.save()
+        self.assertEqual(news.ItemStore(self.path).entries, {})
+
+
+DIGEST_SHELL = (
+    '<html><head><title>Blog</title>\n<link rel="canonical" href="https://miamialliance3pl.com/blog.html">\n'
+    '<meta property="og:url" content="https://miamialliance3pl.com/blog.html">\n'
+    '<link rel="stylesheet" href="css/style.css">\n</head><body>'
+    '<main id="main-content">today\'s cards</main><script src="js/main.js"></script></body></html>'
+)
+
+
+class DigestPageTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = news.Path(tmp.name)
+        self.archive = news_archive.NewsArchive(f"{tmp.name}/archive")
+        digest_patch = mock.patch.object(news, "BLOG_DIGEST_DIR", news.Path(tmp.name) / "news")
+        digest_patch.start()
+        self.addCleanup(digest_patch.stop)
+        self.pipeline = build_pipeline.BuildPipeline()
+
+    def select(self, day, *names):
+        articles = [{"title": f"{name} freight story", "description": f"{name} summary",
+                     "date": datetime(day.year, day.month, day.day, 9), "source": "Wire",
+                     "category": "freight", "link": f"https://example.com/{name}",
+                     "relevance_score": 4, "us_score": 2} for name in names]
+        self.archive.append(day, articles, lookback_days=news.RECENT_DAYS)
+
+    def build(self):
+        return news.build_digest_pages(self.archive, self.pipeline, DIGEST_SHELL)
+
+    def test_digests_render_archived_articles_with_neighbour_links(self):
+        self.select(date(2026, 10, 5), "alpha", "bravo")
+        self.select(date(2026, 10, 13), "charlie", "alpha")
+        written, _, _ = self.build()
+
+        self.assertEqual(sorted(path.name for path in written),
+                         ["2026-10.html", "2026-W41.html", "2026-W42.html"])
+        week = (news.BLOG_DIGEST_DIR / "2026-W41.html").read_text(encoding="utf-8")
+        self.assertIn("Logistics News Digest - Week of October 5, 2026", week)
+        self.assertIn('href="https://example.com/bravo"', week)
+        self.assertIn('href="../../css/style.css"', week)
+        self.assertIn('href="2026-W42.html" class="btn btn-outline" rel="prev"', week)
+        self.assertNotIn("today's cards", week)
+        month = (news.BLOG_DIGEST_DIR / "2026-10.html").read_text(encoding="utf-8")
+        self.assertEqual(month.count('href="https://example.com/alpha" target'), 2)  # title + read link, once
+
+    def test_only_digests_of_changed_days_are_rebuilt(self):
+        self.select(date(2026, 9, 28), "alpha")
+        self.select(date(2026, 10, 14), "bravo")
+        self.select(date(2026, 10, 21), "charlie")
+        self.build()
+        self.assertEqual(self.build()[0], [])
+
+        self.select(date(2026, 10, 15), "delta")
+        with mock.patch.object(self.archive, "read", wraps=self.archive.read) as read:
+            written, _, skipped = self.build()
+        self.assertEqual(sorted(path.name for path in written), ["2026-10.html", "2026-W42.html"])
+        self.assertEqual(len(skipped), 3)
+        self.assertEqual(sorted({call.args[0] for call in read.call_args_list}),
+                         ["2026-10-14", "2026-10-15", "2026-10-21"])
+
+    def test_digests_ignore_shell_regions_they_replace(self):
+        self.select(date(2026, 10, 5), "alpha")
+        with_posts = DIGEST_SHELL.replace(
+            "</head>", '<!-- Structured Data - CollectionPage -->\n<script type="application/ld+json">\n'
+                       '{"numberOfItems": 12}\n</script>\n</head>')
+        self.assertEqual(len(news.build_digest_pages(self.archive, self.pipeline, with_posts)[0]), 2)
+
+        retitled = with_posts.replace("<title>Blog</title>", "<title>Blog (12 posts)</title>")
+        more_posts = retitled.replace('"numberOfItems": 12', '"numberOfItems": 13')
+        self.assertEqual(news.build_digest_pages(self.archive, self.pipeline, more_posts)[0], [])
+
+        restyled = more_posts.replace("css/style.css", "css/style.v2.css")
+        written, _, _ = news.build_digest_pages(self.archive, self.pipeline, restyled)
+        self.assertEqual(len(written), 2)
+
+    def test_blog_html_links_the_latest_weekly_digest(self):
+        self.assertIsNone(news.latest_digest_week(self.archive))
+        self.select(date(2026, 10, 5), "alpha")
+        self.select(date(2026, 10, 13), "bravo")
+        self.assertEqual(news.latest_digest_week(self.archive), "2026-W42")
+
+        blog_html = self.root / "blog.html"
+        blog_html.write_text(
+            '<section class="blog-featured"><div class="container"><article>old</article></div></section>'
+            '<div class="blog-grid"><article>old</article></div></div></section>\n<!-- Industry Insight -->',
+            encoding="utf-8")
+        articles = self.archive.read("2026-10-13") * 2
+        with mock.patch.object(news, "BLOG_HTML", blog_html):
+            news.update_blog_html(articles, self.pipeline, digest_week="2026-W42")
+        page = blog_html.read_text(encoding="utf-8")
+        self.assertIn('<a href="blog/news/2026-W42.html" class="btn btn-outline">'
+                      'More headlines: Week of October 12, 2026 digest &rarr;</a>', page)
+        self.assertLess(page.index("bravo summary"), page.index("news-digest-link"))
+
 
 if __name__ == "__main__":
     unittest.main()
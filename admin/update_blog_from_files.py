@@ -5,63 +5,360 @@ Miami Alliance 3PL - Blog Updater from Local Files
 Scans the /blog/ directory, parses metadata from each HTML file,
 and updates the main blog.html page with the latest posts.
 
+Post metadata is cached in admin/.blog_metadata_cache.json, keyed by file
+name with the mtime, size and hash of the <head> it was parsed from.
+Unchanged posts are only stat()ed; posts whose head is unchanged are
+re-hashed but not re-parsed. Only the <head> of a post is ever read.
+
+blog.html shows the newest BLOG_PAGE_SIZE posts; the older ones are listed
+on archive pages blog/page/N.html, numbered from the oldest post so that a
+new post only rewrites the newest one or two pages. Each article:section gets a
+category page blog/category/<slug>.html, and the sidebar category counts
+are refreshed from the same metadata. sitemap.xml is rebuilt from it too
+(see sitemap_builder.py).
+
+Every generated file is written through build_pipeline.BuildPipeline, so
+only files whose content changed are touched.
+
 Usage:
     python3 admin/update_blog_from_files.py          # Dry run, shows discovered posts
     python3 admin/update_blog_from_files.py --apply  # Updates blog.html
+    python3 admin/update_blog_from_files.py --no-cache  # Re-parse every post
+    python3 admin/update_blog_from_files.py --jobs 8    # Scan posts on 8 threads
 """
 
 import argparse
+import hashlib
 import html
 import json
+import os
 import re
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
+try:
+    from admin import build_pipeline, news_archive, sitemap_builder
+except ImportError:  # run as a script from admin/
+    import build_pipeline
+    import news_archive
+    import sitemap_builder
+
 # Project paths
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 BLOG_HTML_PATH = PROJECT_ROOT / "blog.html"
 BLOG_POSTS_DIR = PROJECT_ROOT / "blog"
+BLOG_PAGES_DIR = BLOG_POSTS_DIR / "page"
+BLOG_CATEGORIES_DIR = BLOG_POSTS_DIR / "category"
+METADATA_CACHE_PATH = PROJECT_ROOT / "admin" / ".blog_metadata_cache.json"
+SITE_URL = "https://miamialliance3pl.com"
+
+# Cards on blog.html and on each archive page (blog/page/N.html)
+BLOG_PAGE_SIZE = 12
+METADATA_CACHE_VERSION = 4
 
 # Regex to find the target div for blog posts
 # This looks for the start of the blog grid and the start of the sidebar.
 BLOG_GRID_PATTERN = r'(<!-- Main Content: Blog Article Grid -->\s*<div>\s*<div class="blog-grid">)(.*?)(</div>\s*</div>\s*<!-- Sidebar -->)'
 COLLECTION_PAGE_PATTERN = r'(<!-- Structured Data - CollectionPage -->\s*<script type="application/ld\+json">\s*)(\{.*?\})(\s*</script>)'
 ARTICLE_COUNT_PATTERN = r'(<span class="article-count" data-i18n="blog.count">)(.*?)(</span>)'
-ALL_CATEGORY_COUNT_PATTERN = r'(<span data-i18n="blog.cat.all">All</span>\s*<span class="cat-count">)(\d+)(</span>)'
+CATEGORIES_LIST_PATTERN = r'(<ul class="categories-list">)(.*?)(</ul>)'
+# A sidebar entry, with or without the link to its category page
+CATEGORY_COUNT_PATTERN = re.compile(
+    r'(?:<a href="[^"]*">)?(<span data-i18n="blog\.cat\.(?P<key>[\w-]+)">)(?P<label>[^<]*)</span>(?:</a>)?'
+    r'(\s*<span class="cat-count">)\d+(</span>)'
+)
+
+# Regions of blog.html regenerated on --apply, in the order they appear
+BLOG_REGIONS = {
+    "collection_page": COLLECTION_PAGE_PATTERN,
+    "article_count": ARTICLE_COUNT_PATTERN,
+    "blog_grid": BLOG_GRID_PATTERN,
+    "categories_list": CATEGORIES_LIST_PATTERN,
+}
+
+# Everything extract_metadata needs lives in <head>; one combined pattern
+# picks up all fields in a single scan of it.
+HEAD_END = b"</head>"
+HEAD_READ_CHUNK = 8192
+HEAD_META_PATTERN = re.compile(
+    r'<title>(?P<title>.*?)</title>'
+    r'|<meta name="description" content="(?P<description>.*?)"'
+    r'|<meta property="article:published_time" content="(?P<published>.*?)"'
+    r'|<meta property="article:modified_time" content="(?P<modified>.*?)"'
+    r'|<meta property="article:section" content="(?P<category>.*?)"'
+    r'|<meta name="author" content="(?P<author>.*?)"'
+)
+HEAD_META_FIELDS = HEAD_META_PATTERN.groups
+
+def read_head(file_path: Path, chunk_size=HEAD_READ_CHUNK):
+    """Read a post in chunks up to and including </head> (the whole file if there is none)."""
+    buffer = bytearray()
+    with open(file_path, "rb") as handle:
+        while True:
+            chunk = handle.read(chunk_size)
+            if not chunk:
+                return bytes(buffer)
+            # Resume the search a few bytes back in case the tag spans chunks
+            search_from = max(0, len(buffer) - len(HEAD_END) + 1)
+            buffer += chunk
+            end = buffer.lower().find(HEAD_END, search_from)
+            if end != -1:
+                return bytes(buffer[:end + len(HEAD_END)])
+
+def scan_head(head):
+    """First value of each metadata field in `head`, in one pass."""
+    found = {}
+    for match in HEAD_META_PATTERN.finditer(head):
+        field = match.lastgroup
+        if field not in found:
+            found[field] = match.group(field)
+            if len(found) == HEAD_META_FIELDS:
+                break
+    return found
+
+def extract_metadata(file_path: Path, head=None):
+    """Extracts metadata (title, description, date, etc.) from a blog post's <head>."""
+    if head is None:
+        head = read_head(file_path).decode("utf-8")
+    fields = scan_head(head)
 
-def extract_metadata(file_path: Path):
-    """Extracts metadata (title, description, date, etc.) from a blog post HTML file."""
-    content = file_path.read_text(encoding="utf-8")
-    
     meta = {"path": file_path.name}
-    
-    title_match = re.search(r"<title>(.*?)</title>", content)
-    if title_match:
-        full_title = html.unescape(title_match.group(1).strip())
+
+    if 'title' in fields:
+        full_title = html.unescape(fields['title'].strip())
         meta['title'] = full_title.split('|')[0].strip()
         if 'Redirecting...' in meta['title']:
             print(f"Found redirecting title in {file_path.name}")
             return None
 
+    if 'description' in fields:
+        meta['description'] = html.unescape(fields['description'])
 
-    description_match = re.search(r'<meta name="description" content="(.*?)"', content)
-    if description_match:
-        meta['description'] = html.unescape(description_match.group(1))
-
-    date_match = re.search(r'<meta property="article:published_time" content="(.*?)"', content)
-    if date_match:
-        meta['date'] = datetime.fromisoformat(date_match.group(1).replace('Z', '+00:00'))
+    if 'published' in fields:
+        meta['date'] = datetime.fromisoformat(fields['published'].replace('Z', '+00:00'))
     else:
         # Fallback to file modification time if no date is in metadata
         stat = file_path.stat()
         meta['date'] = datetime.fromtimestamp(stat.st_mtime)
+        meta['date_from_mtime'] = True
 
-    # Add more metadata extraction as needed (e.g., category, author)
-    # For now, we'll just use what we have.
+    if fields.get('modified'):
+        # Kept as the YYYY-MM-DD string; only the sitemap's lastmod uses it
+        meta['modified'] = fields['modified'][:10]
+    if fields.get('category'):
+        meta['category'] = html.unescape(fields['category']).strip()
+    if fields.get('author'):
+        meta['author'] = html.unescape(fields['author']).strip()
 
     return meta
 
-def generate_blog_card(meta):
+class MetadataCache:
+    """
+    Per-post metadata cache keyed by file name.
+
+    Each entry records the mtime, size and SHA-256 of the <head> the
+    metadata was parsed from. A post whose mtime and size still match is a
+    hit and is never opened; a post whose stat changed but whose head hash
+    matches (e.g. a body-only edit) is re-hashed and its entry refreshed;
+    anything else is parsed again.
+    """
+
+    def __init__(self, path=METADATA_CACHE_PATH, enabled=True):
+        self.path = Path(path)
+        self.enabled = enabled
+        self.entries = {}
+        self.hits = self.rehashed = self.parsed = 0
+        if enabled and self.path.exists():
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+                if data.get("version") == METADATA_CACHE_VERSION:
+                    self.entries = data.get("entries", {})
+            except (OSError, ValueError) as e:
+                print(f"Ignoring unreadable metadata cache {self.path}: {e}")
+
+    def lookup(self, file_path: Path):
+        """Return metadata for a post (None for skipped posts), parsing only on a miss."""
+        return self.record(file_path, scan_post(file_path, self.entries.get(file_path.name)))
+
+    def record(self, file_path: Path, result):
+        """Store a scan_post() result and return its metadata."""
+        outcome, meta, entry = result
+        if outcome == "hit":
+            self.hits += 1
+        elif outcome == "rehashed":
+            self.rehashed += 1
+        else:
+            self.parsed += 1
+        self.entries[file_path.name] = entry
+        return meta
+
+    @staticmethod
+    def _dump(meta, stat, digest):
+        entry = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": digest, "meta": None}
+        if meta is not None:
+            stored = dict(meta, date=meta["date"].isoformat())
+            entry["meta"] = stored
+            # Posts without article:published_time are dated by mtime, which
+            # changes without the content changing
+            entry["date_from_mtime"] = bool(meta.get("date_from_mtime"))
+        return entry
+
+    @staticmethod
+    def _load(entry, stat):
+        if entry["meta"] is None:
+            return None
+        meta = dict(entry["meta"])
+        if entry.get("date_from_mtime"):
+            meta["date"] = datetime.fromtimestamp(stat.st_mtime)
+            meta["date_from_mtime"] = True
+        else:
+            meta["date"] = datetime.fromisoformat(meta["date"])
+        return meta
+
+    def prune(self, names):
+        """Drop entries for posts that no longer exist."""
+        for name in set(self.entries) - set(names):
+            del self.entries[name]
+
+    def save(self):
+        if not self.enabled:
+            return
+        payload = json.dumps({"version": METADATA_CACHE_VERSION, "entries": self.entries},
+                             indent=1, sort_keys=True, ensure_ascii=False)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_text(payload, encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+    def report(self):
+        total = self.hits + self.rehashed + self.parsed
+        rate = 100.0 * (self.hits + self.rehashed) / total if total else 0.0
+        return (f"Metadata cache: {total} posts, {self.hits} unchanged (stat only), "
+                f"{self.rehashed} re-hashed, {self.parsed} parsed - {rate:.1f}% hit rate")
+
+def scan_post(file_path: Path, entry=None):
+    """
+    Resolve one post against its cache entry without touching shared state.
+
+    Returns (outcome, meta, entry) where outcome is "hit", "rehashed" or
+    "parsed". Safe to run in worker threads or processes.
+    """
+    stat = file_path.stat()
+    if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+        return "hit", MetadataCache._load(entry, stat), entry
+
+    raw = read_head(file_path)
+    digest = hashlib.sha256(raw).hexdigest()
+    if entry and entry["sha256"] == digest:
+        entry = dict(entry, mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+        return "rehashed", MetadataCache._load(entry, stat), entry
+
+    meta = extract_metadata(file_path, raw.decode("utf-8"))
+    return "parsed", meta, MetadataCache._dump(meta, stat, digest)
+
+def scan_posts(post_files, cache, jobs=1, pool="thread"):
+    """
+    Look up every post through the cache, optionally in parallel.
+
+    With jobs > 1 the posts are resolved on a thread pool (stat and head
+    reads release the GIL) or, with pool="process", on a process pool for
+    parse-heavy cold scans. Results are recorded in input order either way.
+    Returns a list of (file_path, meta, error) in the order of post_files.
+    """
+    if jobs <= 1:
+        futures = None
+    else:
+        executor_class = ProcessPoolExecutor if pool == "process" else ThreadPoolExecutor
+        executor = executor_class(max_workers=jobs)
+        futures = [executor.submit(scan_post, post_file, cache.entries.get(post_file.name))
+                   for post_file in post_files]
+
+    results = []
+    try:
+        for index, post_file in enumerate(post_files):
+            try:
+                if futures is None:
+                    meta = cache.lookup(post_file)
+                else:
+                    meta = cache.record(post_file, futures[index].result())
+                results.append((post_file, meta, None))
+            except Exception as e:
+                results.append((post_file, None, e))
+    finally:
+        if futures is not None:
+            executor.shutdown()
+    return results
+
+class RegionTemplate:
+    """
+    A page with named regions that are regenerated in place.
+
+    Each region is a (prefix)(body)(suffix) pattern; only the body is
+    replaced. All region patterns are compiled into one alternation, so
+    the page is scanned once and the output is assembled with a single
+    join instead of being re-sliced and copied per region. Only the first
+    occurrence of each region is replaced.
+    """
+
+    def __init__(self, regions):
+        alternatives = []
+        for name, pattern in regions.items():
+            compiled = re.compile(pattern, re.DOTALL)
+            if compiled.groups != 3:
+                raise ValueError(f"Region {name} needs exactly (prefix)(body)(suffix) groups")
+            prefix, body, suffix = self._split_groups(pattern)
+            alternatives.append(f"(?:{prefix})(?P<{name}>{body})(?:{suffix})")
+        self.names = list(regions)
+        self.pattern = re.compile("|".join(alternatives), re.DOTALL)
+
+    @staticmethod
+    def _split_groups(pattern):
+        """Split '(a)(b)(c)' into its three top-level group bodies."""
+        parts, depth, start, index = [], 0, None, 0
+        while index < len(pattern):
+            char = pattern[index]
+            if char == "\\":
+                index += 2
+                continue
+            if char == "(":
+                if depth == 0:
+                    start = index + 1
+                depth += 1
+            elif char == ")":
+                depth -= 1
+                if depth == 0:
+                    parts.append(pattern[start:index])
+            index += 1
+        return parts
+
+    def render(self, page, values):
+        """
+        Replace the body of each region named in `values`.
+
+        A value may be a callable, which receives the current body and
+        returns the new one. Returns (new_page, missing) where missing lists the regions in
+        `values` that were not found.
+        """
+        pieces = []
+        position = 0
+        done = set()
+        for match in self.pattern.finditer(page):
+            name = match.lastgroup
+            if name in done or name not in values:
+                continue
+            pieces.append(page[position:match.start(name)])
+            value = values[name]
+            pieces.append(value(match.group(name)) if callable(value) else value)
+            position = match.end(name)
+            done.add(name)
+        pieces.append(page[position:])
+        missing = [name for name in self.names if name in values and name not in done]
+        return "".join(pieces), missing
+
+BLOG_TEMPLATE = RegionTemplate(BLOG_REGIONS)
+
+def generate_blog_card(meta, href_prefix="blog/"):
     """Generates the HTML for a single blog card."""
     
     # This is a very basic card structure. It should be improved to match the existing style.
@@ -71,7 +368,7 @@ def generate_blog_card(meta):
 
     return f"""
                         <!-- Card: {meta.get('title', 'Untitled')} -->
-                        <a href="blog/{meta['path']}" class="blog-card">
+                        <a href="{href_prefix}{meta['path']}" class="blog-card">
                             <div class="blog-card-image" style="background: linear-gradient(135deg, #0ea5e9 0%, #0369a1 100%);">
                                 <span class="card-icon">📄</span>
                             </div>
@@ -87,24 +384,24 @@ def generate_blog_card(meta):
                             </div>
                         </a>"""
 
-def generate_collection_page_json(posts):
-    """Generates CollectionPage structured data for all valid blog posts."""
+def generate_collection_page_json(posts, url=f"{SITE_URL}/blog.html", name="3PL & Logistics Blog"):
+    """Generates CollectionPage structured data for the given blog posts."""
 
     item_list = []
     for idx, post in enumerate(posts, start=1):
         item_list.append({
             "@type": "ListItem",
             "position": idx,
-            "url": f"https://miamialliance3pl.com/blog/{post['path']}",
+            "url": f"{SITE_URL}/blog/{post['path']}",
             "name": post.get("title", "Untitled Post"),
         })
 
     collection_page = {
         "@context": "https://schema.org",
         "@type": "CollectionPage",
-        "name": "3PL & Logistics Blog",
+        "name": name,
         "description": "Expert 3PL blog covering warehouse logistics, fulfillment tips, Miami warehousing news, and supply chain guides.",
-        "url": "https://miamialliance3pl.com/blog.html",
+        "url": url,
         "publisher": {
             "@type": "Organization",
             "name": "Miami Alliance 3PL",
@@ -118,21 +415,350 @@ def generate_collection_page_json(posts):
 
     return json.dumps(collection_page, indent=4, ensure_ascii=False)
 
+# ─── Archive pages ───────────────────────────────────────────
+
+# Head regions of blog.html that differ on each archive page
+ARCHIVE_HEAD_TEMPLATE = RegionTemplate({
+    "title": r'(<title>)(.*?)(</title>)',
+    "description": r'(<meta name="description" content=")(.*?)(">)',
+    "canonical": r'(<link rel="canonical" href=")(.*?)(">)',
+    "og_url": r'(<meta property="og:url" content=")(.*?)(">)',
+    "og_title": r'(<meta property="og:title" content=")(.*?)(">)',
+    "og_description": r'(<meta property="og:description" content=")(.*?)(">)',
+    "twitter_title": r'(<meta name="twitter:title" content=")(.*?)(">)',
+    "twitter_description": r'(<meta name="twitter:description" content=")(.*?)(">)',
+    "collection_page": COLLECTION_PAGE_PATTERN,
+})
+MAIN_START_PATTERN = re.compile(r'<main id="main-content">')
+MAIN_END_PATTERN = re.compile(r'</main>')
+# Relative href/src values, which need ../../ from blog/page/
+RELATIVE_URL_PATTERN = re.compile(r'(\s(?:href|src)=")(?![a-zA-Z][a-zA-Z0-9+.-]*:|/|#)')
+
+def paginate_posts(posts, page_size=BLOG_PAGE_SIZE):
+    """
+    Split newest-first posts into archive pages anchored at the oldest post.
+
+    Page 1 holds the oldest `page_size` posts and the last page holds the
+    newest remainder, so a new post only changes the last page (or starts
+    a new one) instead of shifting every card down through every page.
+    Returns a list of pages, each newest-first.
+    """
+    oldest_first = posts[::-1]
+    pages = [oldest_first[start:start + page_size] for start in range(0, len(oldest_first), page_size)]
+    return [page[::-1] for page in pages]
+
+def split_front_page(posts, page_size=BLOG_PAGE_SIZE):
+    """
+    (front_posts, archive_posts): the newest `page_size` posts shown on
+    blog.html and the older ones paginated into blog/page/. A page_size of
+    0 puts every post on blog.html.
+    """
+    if not page_size:
+        return posts, []
+    return posts[:page_size], posts[page_size:]
+
+def generate_front_grid(front_posts, archive_page_count):
+    """Cards of blog.html, closed by a link to the newest archive page if there is one."""
+    grid = "\n".join(generate_blog_card(post) for post in front_posts)
+    if archive_page_count:
+        grid += generate_pagination_nav(older_href=f"blog/page/{archive_page_count}.html")
+    return grid
+
+def archive_page_url(number):
+    return f"{SITE_URL}/blog/page/{number}.html"
+
+def generate_pagination_nav(newer_href=None, older_href=None):
+    """Prev/next links closing a card grid."""
+    links = []
+    if newer_href:
+        links.append(f'<a href="{newer_href}" class="btn btn-outline" rel="prev">&larr; Newer Articles</a>')
+    if older_href:
+        links.append(f'<a href="{older_href}" class="btn btn-outline" rel="next">Older Articles &rarr;</a>')
+    return f"""
+                        <nav class="blog-pagination" aria-label="Blog pages" style="grid-column: 1 / -1; display: flex; justify-content: space-between; gap: var(--spacing-md);">
+                            {"".join(links)}
+                        </nav>"""
+
+def split_page_shell(blog_html):
+    """
+    Head/navigation and footer of blog.html, with relative URLs fixed for blog/page/.
+
+    Everything inside <main> (news feed, featured post, sidebar counts) is
+    dropped, so archive pages only change when their own cards do.
+    """
+    start = MAIN_START_PATTERN.search(blog_html)
+    end = MAIN_END_PATTERN.search(blog_html, start.end() if start else 0)
+    if not start or not end:
+        return None
+    before = RELATIVE_URL_PATTERN.sub(r"\1../../", blog_html[:start.start()])
+    after = RELATIVE_URL_PATTERN.sub(r"\1../../", blog_html[end.end():])
+    return before, after
+
+def render_page_head(before, url, name, description, collection_page):
+    """blog.html's head with the title, description, URLs and CollectionPage of one generated page."""
+    title = f"{html.escape(name)} | Miami Alliance 3PL"
+    description = html.escape(description)
+    head, _ = ARCHIVE_HEAD_TEMPLATE.render(before, {
+        "title": title,
+        "description": description,
+        "canonical": url,
+        "og_url": url,
+        "og_title": title,
+        "og_description": description,
+        "twitter_title": title,
+        "twitter_description": description,
+        "collection_page": collection_page,
+    })
+    return head
+
+def generate_index_page(shell, url, name, description, crumb, subtitle, page_posts, nav=""):
+    """Full HTML of a generated listing page under blog/<dir>/ (archive or category)."""
+    before, after = shell
+    head = render_page_head(before, url, name, description,
+                            generate_collection_page_json(page_posts, url, name))
+    cards = "\n".join(generate_blog_card(post, href_prefix="../") for post in page_posts)
+
+    return f"""{head}<main id="main-content">
+        <section class="page-header blog-header">
+            <div class="container">
+                <nav class="breadcrumb" aria-label="Breadcrumb">
+                    <a href="../../index.html" data-i18n="blog.breadcrumb.home">Home</a> &rsaquo; <a href="../../blog.html" data-i18n="blog.breadcrumb.blog">Blog</a> &rsaquo; <span>{html.escape(crumb)}</span>
+                </nav>
+                <h1 data-i18n="blog.title">3PL Insights &amp; Logistics Blog</h1>
+                <p class="blog-hero-subtitle">{subtitle}</p>
+            </div>
+        </section>
+
+        <div class="container" style="padding: var(--spacing-xl) 0;">
+            <div class="blog-grid">{cards}
+{nav}
+            </div>
+        </div>
+    </main>{after}"""
+
+def generate_archive_page(shell, number, page_posts, newer_href, older_href):
+    """Full HTML of archive page `number`."""
+    newest = page_posts[0]['date'].strftime("%B %d, %Y")
+    oldest = page_posts[-1]['date'].strftime("%B %d, %Y")
+    return generate_index_page(
+        shell, archive_page_url(number),
+        f"3PL & Logistics Blog - Archive Page {number}",
+        f"Page {number} of the Miami Alliance 3PL blog archive: articles published {oldest} - {newest}.",
+        f"Archive Page {number}", f"Articles published {oldest} &ndash; {newest}.",
+        page_posts, generate_pagination_nav(newer_href, older_href),
+    )
+
+def build_archive_pages(blog_html, posts, page_size=BLOG_PAGE_SIZE):
+    """
+    Map of archive page path -> HTML for every page of `posts`, the posts
+    that are not on blog.html (see split_front_page()).
+    """
+    shell = split_page_shell(blog_html)
+    if shell is None:
+        raise ValueError("Could not find <main id=\"main-content\"> in blog.html")
+    pages = paginate_posts(posts, page_size)
+    rendered = {}
+    for number, page_posts in enumerate(pages, start=1):
+        newer_href = "../../blog.html" if number == len(pages) else f"{number + 1}.html"
+        older_href = f"{number - 1}.html" if number > 1 else None
+        rendered[BLOG_PAGES_DIR / f"{number}.html"] = generate_archive_page(
+            shell, number, page_posts, newer_href, older_href
+        )
+    return rendered
+
+def category_slug(name):
+    """
+    File-name slug for a category: 'Trade & Tariffs' -> 'trade-and-tariffs',
+    'Guía de Exportación' -> 'guia-de-exportacion'.
+    """
+    ascii_name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii")
+    slug = re.sub(r"[^a-z0-9]+", "-", ascii_name.lower().replace("&", " and "))
+    return slug.strip("-")
+
+def category_key(name):
+    """Spelling-insensitive identity of a category: 'E-Commerce' and 'Ecommerce' share one."""
+    return category_slug(name).replace("-", "")
+
+def build_blog_index(posts):
+    """
+    Group newest-first posts by category and count authors in one pass.
+
+    Returns {"categories": {slug: {"name": ..., "posts": [...]}}, "authors": {name: count}}.
+    Spelling variants of one name (see category_key()) share a page, named
+    after the variant most posts use and slugged from that name.
+    """
+    grouped = {}
+    authors = {}
+    for post in posts:
+        category = post.get('category')
+        if category:
+            entry = grouped.setdefault(category_key(category), {"labels": {}, "posts": []})
+            entry["labels"][category] = entry["labels"].get(category, 0) + 1
+            entry["posts"].append(post)
+        author = post.get('author')
+        if author:
+            authors[author] = authors.get(author, 0) + 1
+    categories = {}
+    for entry in grouped.values():
+        name = max(entry["labels"], key=entry["labels"].get)
+        categories[category_slug(name)] = {"name": name, "posts": entry["posts"]}
+    return {"categories": categories, "authors": authors}
+
+def category_page_url(slug):
+    return f"{SITE_URL}/blog/category/{slug}.html"
+
+def build_category_pages(blog_html, index):
+    """Map of category page path -> HTML, one page per category."""
+    shell = split_page_shell(blog_html)
+    if shell is None:
+        raise ValueError("Could not find <main id=\"main-content\"> in blog.html")
+    rendered = {}
+    for slug, category in sorted(index["categories"].items()):
+        count = len(category["posts"])
+        rendered[BLOG_CATEGORIES_DIR / f"{slug}.html"] = generate_index_page(
+            shell, category_page_url(slug),
+            f"{category['name']} - 3PL & Logistics Blog",
+            f"{count} article{'s' if count != 1 else ''} about {category['name']} "
+            f"from the Miami Alliance 3PL logistics blog.",
+            category["name"],
+            f"{count} article{'s' if count != 1 else ''} in {html.escape(category['name'])}.",
+            category["posts"],
+        )
+    return rendered
+
+def update_category_counts(list_html, total, index):
+    """
+    Refresh the sidebar categories: All gets the total and links to blog.html,
+    others match by label and link to their category page (if they have posts).
+    """
+    slugs = {category_key(category["name"]): slug for slug, category in index["categories"].items()}
+
+    def replace(match):
+        label = f"{match.group(1)}{match.group('label')}</span>"
+        if match.group("key") == "all":
+            count, href = total, "blog.html"
+        else:
+            slug = slugs.get(category_key(html.unescape(match.group("label"))))
+            count = len(index["categories"][slug]["posts"]) if slug else 0
+            href = f"blog/category/{slug}.html" if slug else None
+        if href:
+            label = f'<a href="{href}">{label}</a>'
+        return f"{label}{match.group(4)}{count}{match.group(5)}"
+
+    return CATEGORY_COUNT_PATTERN.sub(replace, list_html)
+
+def post_lastmod(post):
+    """
+    Sitemap lastmod for a post: its modified date, else its publish date.
+    None for a post dated only by its file mtime, which a checkout resets.
+    """
+    if post.get('date_from_mtime'):
+        return post.get('modified')
+    published = post['date'].strftime("%Y-%m-%d")
+    return max(published, post.get('modified') or published)
+
+def build_sitemap_entries(posts, archive_pages, index, existing, digests=()):
+    """
+    Sitemap entries (pages, blog index pages, posts) from the blog metadata.
+
+    `existing` are the entries of the current sitemap: everything outside
+    /blog/ is kept as-is (blog.html's lastmod follows the newest post), and
+    hand-tuned changefreq/priority of posts are preserved, as is the lastmod
+    of posts dated only by mtime (see post_lastmod()). `digests` are
+    the news digest entries (sitemap_builder.news_digest_entries()), listed
+    after the archive and category pages.
+    """
+    blog_prefix = f"{SITE_URL}/blog/"
+    existing_by_loc = {entry["loc"]: entry for entry in existing}
+    newest = max(filter(None, (post_lastmod(post) for post in posts)), default="")
+
+    def lastmod_of(post):
+        # A new mtime-dated post has no better date than its mtime
+        previous = existing_by_loc.get(f"{blog_prefix}{post['path']}", {})
+        return post_lastmod(post) or previous.get("lastmod") or post['date'].strftime("%Y-%m-%d")
+
+    pages = []
+    for entry in existing:
+        if entry["loc"].startswith(blog_prefix):
+            continue
+        if entry["loc"] == f"{SITE_URL}/blog.html" and newest > entry.get("lastmod", ""):
+            entry = dict(entry, lastmod=newest)
+        pages.append(entry)
+
+    post_entries = []
+    for post in sorted(posts, key=lambda p: (p['date'], p['path'])):
+        loc = f"{blog_prefix}{post['path']}"
+        previous = existing_by_loc.get(loc, {})
+        post_entries.append({
+            "loc": loc,
+            "lastmod": lastmod_of(post),
+            "changefreq": previous.get("changefreq", "monthly"),
+            "priority": previous.get("priority", "0.6"),
+        })
+
+    listings = [(archive_page_url(number), page) for number, page in enumerate(archive_pages, start=1)]
+    listings += [(category_page_url(slug), category["posts"])
+                 for slug, category in sorted(index["categories"].items())]
+    index_entries = [{
+        "loc": url,
+        "lastmod": max(lastmod_of(post) for post in listed),
+        "changefreq": "weekly",
+        "priority": "0.5",
+    } for url, listed in listings] + list(digests)
+
+    return pages, index_entries, post_entries
+
+def sync_archive_pages(rendered, pages_dir=None, pipeline=None):
+    """
+    Write generated pages whose HTML changed and delete stale pages in `pages_dir`.
+
+    Writes go through `pipeline` (build_pipeline.BuildPipeline); in a dry-run
+    pipeline nothing is touched and the lists describe what would happen.
+    Returns (written, unchanged, removed) lists of paths.
+    """
+    pipeline = pipeline or build_pipeline.BuildPipeline()
+    written, unchanged = [], []
+    for path, page_html in rendered.items():
+        (written if pipeline.write(path, page_html) else unchanged).append(path)
+
+    removed = []
+    pages_dir = pages_dir or BLOG_PAGES_DIR
+    if pages_dir.exists():
+        for path in sorted(pages_dir.glob("*.html")):
+            if path not in rendered:
+                removed.append(path)
+                pipeline.remove(path)
+    return written, unchanged, removed
+
 def main():
     parser = argparse.ArgumentParser(description="Update blog.html from local blog files.")
     parser.add_argument("--apply", action="store_true", help="Apply changes to blog.html")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and don't update the metadata cache")
+    parser.add_argument("--cache-file", default=str(METADATA_CACHE_PATH), help="Metadata cache location")
+    parser.add_argument("--jobs", type=int, default=1, help="Scan posts with N parallel workers")
+    parser.add_argument("--pool", choices=("thread", "process"), default="thread",
+                        help="Worker type for --jobs (threads for I/O-bound, processes for parse-bound scans)")
+    parser.add_argument("--no-sitemap", action="store_true", help="Leave sitemap.xml alone")
+    parser.add_argument("--sitemap-max-urls", type=int, default=sitemap_builder.SITEMAP_MAX_URLS,
+                        help="Split sitemap.xml into an index with gzip children past this many URLs")
+    parser.add_argument("--page-size", type=int, default=BLOG_PAGE_SIZE,
+                        help=f"Cards on blog.html and per archive page (default: {BLOG_PAGE_SIZE}; 0 = all on blog.html)")
     args = parser.parse_args()
 
     print("Scanning for blog posts...")
     
+    pipeline = build_pipeline.BuildPipeline(dry_run=not args.apply)
+    cache = MetadataCache(args.cache_file, enabled=not args.no_cache)
+    post_files = sorted(BLOG_POSTS_DIR.glob("*.html"))
     posts = []
-    for post_file in BLOG_POSTS_DIR.glob("*.html"):
-        try:
-            metadata = extract_metadata(post_file)
-            if metadata and 'title' in metadata: # Only include posts where we could parse a title
-                posts.append(metadata)
-        except Exception as e:
-            print(f"Could not process {post_file.name}: {e}")
+    for post_file, metadata, error in scan_posts(post_files, cache, args.jobs, args.pool):
+        if error:
+            print(f"Could not process {post_file.name}: {error}")
+        elif metadata and 'title' in metadata: # Only include posts where we could parse a title
+            posts.append(metadata)
+    cache.prune(post_file.name for post_file in post_files)
+    cache.save()
+    print(cache.report())
 
     # Sort posts by date, newest first
     posts.sort(key=lambda p: p['date'], reverse=True)
@@ -143,55 +769,60 @@ def main():
         print("No posts found, exiting.")
         return
 
-    # Generate HTML for all blog cards
-    new_grid_content = "\n".join([generate_blog_card(p) for p in posts])
+    # blog.html shows the newest page of cards; older ones live in blog/page/N.html
+    front_posts, archive_posts = split_front_page(posts, args.page_size)
+    archive = paginate_posts(archive_posts, args.page_size) if archive_posts else []
+    new_grid_content = generate_front_grid(front_posts, len(archive))
+
+    main_blog_html = BLOG_HTML_PATH.read_text(encoding="utf-8")
+    index = build_blog_index(posts)
+    # Render blog.html first: if its grid is missing, nothing else is written either
+    updated_html, missing = BLOG_TEMPLATE.render(main_blog_html, {
+        "collection_page": generate_collection_page_json(front_posts),
+        "article_count": f"{len(posts)} Articles",
+        "blog_grid": new_grid_content,
+        "categories_list": lambda list_html: update_category_counts(list_html, len(posts), index),
+    })
+    if "blog_grid" in missing:
+        print("Error: Could not find the blog grid section in blog.html.")
+        print("Please check the BLOG_GRID_PATTERN regex in the script.")
+        print("Attempted pattern:")
+        print(BLOG_GRID_PATTERN)
+        return
+    if "collection_page" in missing:
+        print("Warning: Could not find CollectionPage structured data block in blog.html.")
+
+    archive_pages = build_archive_pages(main_blog_html, archive_posts, args.page_size) if archive else {}
+    written, unchanged, removed = sync_archive_pages(archive_pages, BLOG_PAGES_DIR, pipeline)
+    verb = "Updated" if args.apply else "Would update"
+    print(f"{verb} {len(written)} archive pages ({len(unchanged)} unchanged, {len(removed)} removed).")
+
+    category_pages = build_category_pages(main_blog_html, index)
+    written, unchanged, removed = sync_archive_pages(category_pages, BLOG_CATEGORIES_DIR, pipeline)
+    print(f"{verb} {len(written)} category pages ({len(unchanged)} unchanged, {len(removed)} removed).")
+    for category in sorted(index["categories"].values(), key=lambda c: (-len(c["posts"]), c["name"])):
+        print(f"  {len(category['posts']):3d}  {category['name']}")
+    authors = ", ".join(f"{name} ({count})" for name, count in sorted(index["authors"].items()))
+    print(f"Authors: {authors or 'none'}")
+
+    if not args.no_sitemap:
+        sitemap_files = sitemap_builder.plan_sitemaps(
+            *build_sitemap_entries(posts, archive, index, sitemap_builder.load_entries(),
+                                   sitemap_builder.news_digest_entries(news_archive.NewsArchive())),
+            max_urls=args.sitemap_max_urls,
+        )
+        written, unchanged, removed = sitemap_builder.sync_sitemaps(
+            sitemap_files, PROJECT_ROOT, pipeline
+        )
+        print(f"{verb} {len(written)} sitemap files ({len(unchanged)} unchanged, {len(removed)} removed).")
 
     if args.apply:
         print("Applying changes to blog.html...")
-        
-        main_blog_html = BLOG_HTML_PATH.read_text(encoding="utf-8")
-        
-        # Replace the content of the blog grid
-        match = re.search(BLOG_GRID_PATTERN, main_blog_html, re.DOTALL)
-
-        if match:
-            # Reconstruct the html with the new grid content
-            updated_html = main_blog_html[:match.start(2)] + new_grid_content + main_blog_html[match.end(2):]
-
-            collection_match = re.search(COLLECTION_PAGE_PATTERN, updated_html, re.DOTALL)
-            if collection_match:
-                collection_json = generate_collection_page_json(posts)
-                updated_html = (
-                    updated_html[:collection_match.start(2)]
-                    + collection_json
-                    + updated_html[collection_match.end(2):]
-                )
-            else:
-                print("Warning: Could not find CollectionPage structured data block in blog.html.")
-
-            updated_html = re.sub(
-                ARTICLE_COUNT_PATTERN,
-                rf"\g<1>{len(posts)} Articles\g<3>",
-                updated_html,
-                count=1,
-                flags=re.DOTALL,
-            )
-
-            updated_html = re.sub(
-                ALL_CATEGORY_COUNT_PATTERN,
-                rf"\g<1>{len(posts)}\g<3>",
-                updated_html,
-                count=1,
-                flags=re.DOTALL,
-            )
-
-            BLOG_HTML_PATH.write_text(updated_html, encoding="utf-8")
+        if pipeline.write(BLOG_HTML_PATH, updated_html):
             print("Successfully updated blog.html.")
         else:
-            print("Error: Could not find the blog grid section in blog.html.")
-            print("Please check the BLOG_GRID_PATTERN regex in the script.")
-            print("Attempted pattern:")
-            print(BLOG_GRID_PATTERN)
+            print("blog.html is already up to date.")
+        print(pipeline.report("generated files"))
 
     else:
         print("\n--- DRY RUN ---")
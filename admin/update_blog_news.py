@@ -3,6 +3,14 @@
 Miami Alliance 3PL - Daily Blog News Updater
 ============================================
 Fetches current logistics/supply-chain news and updates blog.html.
+Feeds are fetched concurrently; feeds that miss --fetch-deadline are
+skipped and the page is built from the rest.
+
+With --apply each day's selection is also added to the news archive
+(admin/news_archive/, see news_archive.py), and weekly and monthly digest
+pages under blog/news/ are rebuilt from it when their days change. The
+news grid on blog.html links to the latest weekly digest, and rebuilt
+digests are listed in sitemap.xml.
 
 Usage:
     python3 update_blog_news.py               # Dry run
@@ -12,40 +20,43 @@ Usage:
 """
 
 import argparse
+import hashlib
+import heapq
 import html
+import json
+import os
+import queue
+import random
 import re
 import subprocess
 import sys
-import urllib.request
-import xml.etree.ElementTree as ET
-from datetime import datetime, timedelta
+import threading
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta
 from pathlib import Path
 
+try:
+    from admin import (build_pipeline, feed_registry, feed_stream, http_cache, keyword_scoring,
+                       news_archive, sitemap_builder, update_blog_from_files)
+except ImportError:  # run as a script from admin/
+    import build_pipeline
+    import feed_registry
+    import feed_stream
+    import http_cache
+    import keyword_scoring
+    import news_archive
+    import sitemap_builder
+    import update_blog_from_files
+
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 BLOG_HTML = PROJECT_ROOT / "blog.html"
+BLOG_DIGEST_DIR = PROJECT_ROOT / "blog" / "news"
+ITEM_STORE_PATH = PROJECT_ROOT / "admin" / ".news_item_store.json"
+ITEM_STORE_VERSION = 1
 
-RSS_FEEDS = [
-    {
-        "url": "https://www.freightwaves.com/feed",
-        "name": "FreightWaves",
-        "category": "freight",
-    },
-    {
-        "url": "https://www.supplychaindive.com/feeds/news/",
-        "name": "Supply Chain Dive",
-        "category": "supply-chain",
-    },
-    {
-        "url": "https://www.dcvelocity.com/rss/",
-        "name": "DC Velocity",
-        "category": "warehousing",
-    },
-    {
-        "url": "https://www.ttnews.com/rss.xml",
-        "name": "Transport Topics",
-        "category": "freight",
-    },
-]
+# Sources are defined in feed_registry.py (shared with daily_intel_briefing.py)
+RSS_FEEDS = feed_registry.sources(["freightwaves", "supply_chain_dive", "dc_velocity", "transport_topics"])
 
 CATEGORY_TAGS = {
     "freight": ("tag-freight", "Freight"),
@@ -158,6 +169,22 @@ MAX_SOURCE_SHARE = 3
 RECENT_DAYS = 10
 MIN_RELEVANCE_SCORE = 2
 
+# Near-duplicate detection in select_articles (see NearDuplicateIndex)
+NEAR_DUP_THRESHOLD = 0.7  # Jaccard of title + summary words
+NEAR_DUP_TITLE_THRESHOLD = 0.6  # Jaccard of title words
+NEAR_DUP_PERMUTATIONS = 64
+NEAR_DUP_BAND_ROWS = 4  # 16 bands of 4 rows: pairs at 0.7 are candidates ~99% of the time
+NEAR_DUP_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in into is it its of on or says "
+    "than that the their this to was were will with".split()
+)
+FEED_TIMEOUT = 20  # Seconds per feed (socket timeout); less for feeds known to be fast
+FETCH_DEADLINE = 45  # Seconds for all feeds together; late feeds are dropped
+FEED_RECENT_LIMIT = 40  # Stop reading a feed after this many items from the last RECENT_DAYS
+
+# Shared with daily_intel_briefing.py; conditional GETs make reruns nearly free
+HTTP_CACHE = http_cache.HttpCache()
+
 
 def clean_html(text):
     """Strip HTML tags and normalize whitespace."""
@@ -186,22 +213,24 @@ def keyword_hits(text, keywords):
     return sum(1 for kw in keywords if kw in normalized)
 
 
+KEYWORD_SCORER = keyword_scoring.KeywordScorer(
+    {
+        **{category: keyword_scoring.Weighted(keywords) for category, keywords in CATEGORY_KEYWORDS.items()},
+        "logistics": keyword_scoring.Weighted(LOGISTICS_RELEVANCE_KEYWORDS),
+        "us": keyword_scoring.Weighted(US_RELEVANCE_KEYWORDS),
+    },
+    normalize=normalize_text,
+)
+
+
 def logistics_relevance_score(title, description, categories_text=""):
     """Score how logistics-relevant an article is."""
-    score = keyword_hits(
-        f"{title} {description} {categories_text}",
-        LOGISTICS_RELEVANCE_KEYWORDS,
-    )
-    return score
+    return KEYWORD_SCORER.score(f"{title} {description} {categories_text}")["logistics"]
 
 
 def us_relevance_score(title, description, categories_text=""):
     """Score U.S. relevance so feed favors domestic logistics coverage."""
-    score = keyword_hits(
-        f"{title} {description} {categories_text}",
-        US_RELEVANCE_KEYWORDS,
-    )
-    return score
+    return KEYWORD_SCORER.score(f"{title} {description} {categories_text}")["us"]
 
 
 def parse_date(date_str):
@@ -226,14 +255,12 @@ def format_date(dt):
     return dt.strftime("%b %d, %Y")
 
 
-def auto_categorize(title, description, default="supply-chain"):
+def auto_categorize(title, description, default="supply-chain", category_hits=None):
     """Select the best category based on keyword matches."""
-    combined = normalize_text(f"{title} {description}")
-    scores = {}
-    for category, keywords in CATEGORY_KEYWORDS.items():
-        hits = sum(1 for kw in keywords if kw in combined)
-        if hits:
-            scores[category] = hits
+    if category_hits is None:
+        scores = KEYWORD_SCORER.score(f"{title} {description}")
+        category_hits = {category: scores[category] for category in CATEGORY_KEYWORDS}
+    scores = {category: hits for category, hits in category_hits.items() if hits}
     return max(scores, key=scores.get) if scores else default
 
 
@@ -250,141 +277,433 @@ def build_title_key(title):
     return re.sub(r"[^a-z0-9]", "", normalize_text(title))[:64]
 
 
-def fetch_feed(url, timeout=20):
-    """Fetch and parse an RSS/Atom feed."""
-    try:
-        req = urllib.request.Request(url, headers={"User-Agent": "Miami3PL-BlogBot/1.2"})
-        with urllib.request.urlopen(req, timeout=timeout) as resp:
-            data = resp.read()
-        root = ET.fromstring(data)
-
-        items = []
-        for item in root.findall(".//item"):
-            categories = [
-                clean_html(category.text or "")
-                for category in item.findall("category")
-                if (category.text or "").strip()
-            ]
-            items.append(
-                {
-                    "title": clean_html(item.findtext("title", "")),
-                    "description": clean_html(item.findtext("description", "")),
-                    "pub_date": (item.findtext("pubDate", "") or "").strip(),
-                    "link": normalize_link(item.findtext("link", "")),
-                    "categories_text": " ".join(categories),
-                }
-            )
+# One 64-bit mask per MinHash function (h_i(word) = hash(word) XOR mask_i); the
+# fixed seed keeps signatures, and so clusters, the same on every run
+MINHASH_MASKS = [random.Random(20260301 + i).getrandbits(64) for i in range(NEAR_DUP_PERMUTATIONS)]
 
-        if items:
-            return [item for item in items if item["title"]]
 
-        ns = {"atom": "http://www.w3.org/2005/Atom"}
-        for entry in root.findall(".//atom:entry", ns):
-            title = clean_html(entry.findtext("atom:title", "", ns))
-            summary = clean_html(
-                entry.findtext("atom:summary", "", ns)
-                or entry.findtext("atom:content", "", ns)
-            )
-            updated = (
-                entry.findtext("atom:updated", "", ns)
-                or entry.findtext("atom:published", "", ns)
-                or ""
-            ).strip()
-            link = ""
-            for link_el in entry.findall("atom:link", ns):
-                href = normalize_link(link_el.attrib.get("href", ""))
-                rel = (link_el.attrib.get("rel", "") or "").lower()
-                if href and (not rel or rel == "alternate"):
-                    link = href
-                    break
-            category_tokens = []
-            for category in entry.findall("atom:category", ns):
-                token = clean_html(category.attrib.get("term", "") or category.attrib.get("label", ""))
-                if token:
-                    category_tokens.append(token)
-
-            if title:
-                items.append(
-                    {
-                        "title": title,
-                        "description": summary,
-                        "pub_date": updated,
-                        "link": link,
-                        "categories_text": " ".join(category_tokens),
-                    }
-                )
-        return items
+class NearDuplicateIndex:
+    """
+    MinHash/LSH clustering of near-duplicate stories (syndicated copies
+    with reworded headlines).
+
+    Each article is reduced to word shingles of its title and summary and a
+    MinHash signature of NEAR_DUP_PERMUTATIONS values, split into bands.
+    Articles sharing any band are candidates, so clustering is near-linear
+    rather than all-pairs. Candidates are confirmed on the exact shingle
+    sets: combined Jaccard >= NEAR_DUP_THRESHOLD and title Jaccard >=
+    NEAR_DUP_TITLE_THRESHOLD (so same-template headlines about different
+    things, e.g. "Freight update 1" / "Freight update 2", stay apart).
+    """
+
+    def __init__(self, articles):
+        self.articles = list(articles)
+        self._parent = list(range(len(self.articles)))
+        self._word_hashes = {}
+        shingles = [self.shingles(article) for article in self.articles]
+        buckets = {}
+        for index, (title_words, words) in enumerate(shingles):
+            if not words:
+                continue
+            signature = self.signature(words)
+            for band in range(0, NEAR_DUP_PERMUTATIONS, NEAR_DUP_BAND_ROWS):
+                buckets.setdefault((band, tuple(signature[band:band + NEAR_DUP_BAND_ROWS])), []).append(index)
+
+        checked = set()
+        for members in buckets.values():
+            for position, first in enumerate(members):
+                for second in members[position + 1:]:
+                    if (first, second) in checked or self._find(first) == self._find(second):
+                        continue
+                    checked.add((first, second))
+                    if self._similar(shingles[first], shingles[second]):
+                        self._parent[self._find(second)] = self._find(first)
+
+    @staticmethod
+    def shingles(article):
+        """(title words, title + summary words), stop words removed."""
+        def words(text):
+            return {word for word in re.findall(r"[a-z0-9]+", normalize_text(text))
+                    if word not in NEAR_DUP_STOPWORDS}
+
+        title_words = words(article.get("title", ""))
+        return title_words, title_words | words(article.get("description", "")[:400])
+
+    def signature(self, words):
+        cache = self._word_hashes
+        hashes = []
+        for word in words:
+            value = cache.get(word)
+            if value is None:
+                digest = hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest()
+                value = cache[word] = int.from_bytes(digest, "big")
+            hashes.append(value)
+        return [min([value ^ mask for value in hashes]) for mask in MINHASH_MASKS]
+
+    @staticmethod
+    def _jaccard(left, right):
+        return len(left & right) / len(left | right) if left or right else 0.0
+
+    def _similar(self, left, right):
+        return (self._jaccard(left[1], right[1]) >= NEAR_DUP_THRESHOLD
+                and self._jaccard(left[0], right[0]) >= NEAR_DUP_TITLE_THRESHOLD)
+
+    def _find(self, index):
+        while self._parent[index] != index:
+            self._parent[index] = self._parent[self._parent[index]]
+            index = self._parent[index]
+        return index
+
+    def cluster_of(self, index):
+        """Cluster id of the article at `index` (equal for near-duplicates)."""
+        return self._find(index)
+
+
+class ItemStore:
+    """
+    Persistent store of cleaned and scored feed items (admin/.news_item_store.json).
+
+    Items are keyed by a fingerprint of their raw link and title, so an
+    item already seen skips clean_html() in fetch_feed() and the keyword
+    scans in score_item(). Entries not seen in a feed for RECENT_DAYS are
+    dropped on save.
+    """
+
+    def __init__(self, path=ITEM_STORE_PATH, enabled=True):
+        self.path = Path(path)
+        self.enabled = enabled
+        self.entries = {}
+        self.reused = self.added = 0
+        if enabled and self.path.exists():
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+                if data.get("version") == ITEM_STORE_VERSION:
+                    self.entries = data.get("entries", {})
+            except (OSError, ValueError) as exc:
+                print(f"  [WARN] Ignoring unreadable item store {self.path}: {exc}", file=sys.stderr)
+
+    @staticmethod
+    def fingerprint(link, title):
+        raw = f"{(link or '').strip()}\n{(title or '').strip()}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:24]
+
+    def get(self, fingerprint):
+        """Cleaned item fields for a fingerprint seen before, or None."""
+        entry = self.entries.get(fingerprint) if self.enabled else None
+        if entry is None:
+            return None
+        entry["seen_at"] = time.time()
+        return dict(entry["item"], fingerprint=fingerprint)
+
+    def scores(self, item, default_category):
+        """(category, relevance, us_score) stored for this item, or None."""
+        entry = self.entries.get(item.get("fingerprint")) if self.enabled else None
+        if entry is None or entry.get("default_category") != default_category:
+            return None
+        self.reused += 1
+        return entry["category"], entry["relevance_score"], entry["us_score"]
+
+    def put(self, item, default_category, scores):
+        if not self.enabled or not item.get("fingerprint"):
+            return
+        self.added += 1
+        category, relevance, us_score = scores
+        self.entries[item["fingerprint"]] = {
+            "item": {key: value for key, value in item.items() if key != "fingerprint"},
+            "default_category": default_category,
+            "category": category,
+            "relevance_score": relevance,
+            "us_score": us_score,
+            "seen_at": time.time(),
+        }
+
+    def prune(self, max_age_days=RECENT_DAYS):
+        cutoff = time.time() - max_age_days * 86400
+        for fingerprint in [fp for fp, entry in self.entries.items() if entry["seen_at"] < cutoff]:
+            del self.entries[fingerprint]
+
+    def save(self):
+        if not self.enabled:
+            return
+        self.prune()
+        payload = json.dumps({"version": ITEM_STORE_VERSION, "entries": self.entries},
+                             sort_keys=True, ensure_ascii=False)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_text(payload, encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+    def report(self):
+        return (f"Item store: {self.reused} items reused, {self.added} new, "
+                f"{len(self.entries)} stored")
+
+
+def score_item(item, default_category):
+    """(category, relevance, us_score) for a cleaned feed item, in one keyword pass."""
+    head_scores, full_scores = KEYWORD_SCORER.score_split(
+        f"{item['title']} {item['description']}", item.get("categories_text", "")
+    )
+    category_hits = {category: head_scores[category] for category in CATEGORY_KEYWORDS}
+    category = auto_categorize(item["title"], item["description"], default_category, category_hits)
+    return category, full_scores["logistics"], full_scores["us"]
+
+
+def parse_rss_item(item, store=None):
+    """Item dict for an RSS <item> element, from the store if its link and title are known."""
+    raw_link = item.findtext("link", "")
+    raw_title = item.findtext("title", "")
+    fingerprint = ItemStore.fingerprint(raw_link, raw_title)
+    known = store.get(fingerprint) if store else None
+    if known:
+        return known
+    categories = [
+        clean_html(category.text or "")
+        for category in item.findall("category")
+        if (category.text or "").strip()
+    ]
+    return {
+        "title": clean_html(raw_title),
+        "description": clean_html(item.findtext("description", "")),
+        "pub_date": (item.findtext("pubDate", "") or "").strip(),
+        "link": normalize_link(raw_link),
+        "categories_text": " ".join(categories),
+        "fingerprint": fingerprint,
+    }
+
+
+def parse_atom_entry(entry, store=None):
+    """Item dict for an Atom <entry> element, or None if it has no title."""
+    ns = {"atom": feed_stream.ATOM_NS}
+    link = ""
+    for link_el in entry.findall("atom:link", ns):
+        href = normalize_link(link_el.attrib.get("href", ""))
+        rel = (link_el.attrib.get("rel", "") or "").lower()
+        if href and (not rel or rel == "alternate"):
+            link = href
+            break
+    raw_title = entry.findtext("atom:title", "", ns)
+    fingerprint = ItemStore.fingerprint(link, raw_title)
+    known = store.get(fingerprint) if store else None
+    if known:
+        return known
+
+    title = clean_html(raw_title)
+    if not title:
+        return None
+    summary = clean_html(
+        entry.findtext("atom:summary", "", ns)
+        or entry.findtext("atom:content", "", ns)
+    )
+    updated = (
+        entry.findtext("atom:updated", "", ns)
+        or entry.findtext("atom:published", "", ns)
+        or ""
+    ).strip()
+    category_tokens = []
+    for category in entry.findall("atom:category", ns):
+        token = clean_html(category.attrib.get("term", "") or category.attrib.get("label", ""))
+        if token:
+            category_tokens.append(token)
+    return {
+        "title": title,
+        "description": summary,
+        "pub_date": updated,
+        "link": link,
+        "categories_text": " ".join(category_tokens),
+        "fingerprint": fingerprint,
+    }
+
+
+def is_recent(pub_date, cutoff):
+    published = parse_date(pub_date)
+    return published.replace(tzinfo=None) >= cutoff
+
+
+def fetch_feed(url, timeout=FEED_TIMEOUT, store=None, max_recent=FEED_RECENT_LIMIT):
+    """Fetch and parse an RSS/Atom feed (see read_feed); [] if it fails."""
+    try:
+        return read_feed(url, timeout, store, max_recent)
     except Exception as exc:
         print(f"  [WARN] Failed to fetch {url}: {exc}", file=sys.stderr)
         return []
 
 
-def select_articles(all_articles, limit):
+def read_feed(url, timeout=FEED_TIMEOUT, store=None, max_recent=FEED_RECENT_LIMIT, response=None):
     """
-    Select top articles using relevance + U.S. preference + source diversity.
+    Fetch and parse an RSS/Atom feed, raising if it cannot be fetched or parsed.
+
+    The response is parsed as it downloads (feed_stream.iter_feed_entries)
+    and parsing stops once `max_recent` items of one kind (RSS items or
+    Atom entries) from the last RECENT_DAYS have been collected. RSS items
+    win over Atom entries when a document has both. With an ItemStore, items whose link and title were seen
+    before are taken from the store instead of being cleaned again. Every
+    item carries its store fingerprint. `response` (a dict) receives the
+    cache outcome and server latency (see HttpCache.stream()).
+    """
+    rss_items, atom_items = [], []
+    cutoff = datetime.now() - timedelta(days=RECENT_DAYS)
+    recent = {"item": 0, "entry": 0}
+    chunks = HTTP_CACHE.stream(url, {"User-Agent": "Miami3PL-BlogBot/1.2"}, timeout=timeout,
+                               result=response)
+    try:
+        for kind, element, _ in feed_stream.iter_feed_entries(chunks):
+            if kind == "item":
+                item = parse_rss_item(element, store)
+                rss_items.append(item)
+            elif rss_items:
+                continue
+            else:
+                item = parse_atom_entry(element, store)
+                if item is None:
+                    continue
+                atom_items.append(item)
+            if item["title"] and is_recent(item["pub_date"], cutoff):
+                recent[kind] += 1
+                if recent[kind] >= max_recent:
+                    break
+    finally:
+        chunks.close()
 
-    Returns at most `limit` articles with the first one intended as featured.
+    if rss_items:
+        return [item for item in rss_items if item["title"]]
+    return atom_items
+
+
+def fetch_feeds(feeds, timeout=FEED_TIMEOUT, deadline=FETCH_DEADLINE, store=None, registry=None):
     """
-    for article in all_articles:
-        if article["date"].tzinfo is not None:
-            article["date"] = article["date"].replace(tzinfo=None)
+    Fetch all feeds concurrently, one daemon thread per feed.
+
+    Each feed gets its own `timeout` seconds; whatever has not arrived
+    `deadline` seconds after the start is abandoned, so runtime is bounded
+    by the slowest feed or the deadline rather than their sum.
+    Returns (results, timed_out): results is a list of (feed, items) in
+    `feeds` order for the feeds that finished, timed_out the feeds that
+    did not. `store` (an ItemStore) is passed on to fetch_feed().
+
+    With a FeedRegistry, each feed's timeout comes from its latency history
+    (never above `timeout`), and every outcome, including missing the
+    deadline, is recorded. The latency of a success is how long the server
+    took to respond (none for a fresh cache hit), not the time spent
+    reading and parsing.
+    """
+    done = queue.Queue()
 
-    all_articles.sort(
-        key=lambda article: (
-            article["date"],
-            article.get("relevance_score", 0),
-            article.get("us_score", 0),
-        ),
-        reverse=True,
-    )
+    def worker(index, feed, feed_timeout):
+        started = time.monotonic()
+        response = {}
+        try:
+            items = read_feed(feed["url"], timeout=feed_timeout, store=store, response=response)
+            latency, error = response.get("latency"), None
+        except Exception as exc:
+            print(f"  [WARN] Failed to fetch {feed['url']}: {exc}", file=sys.stderr)
+            items, latency, error = [], time.monotonic() - started, exc
+        done.put((index, items, latency, error))
+
+    for index, feed in enumerate(feeds):
+        feed_timeout = registry.timeout(feed["url"], timeout) if registry else timeout
+        threading.Thread(target=worker, args=(index, feed, feed_timeout), daemon=True,
+                         name=f"fetch-{feed['name']}").start()
+
+    finished = {}
+    stop_at = time.monotonic() + deadline
+    while len(finished) < len(feeds):
+        remaining = stop_at - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            index, items, latency, error = done.get(timeout=remaining)
+        except queue.Empty:
+            break
+        finished[index] = items
+        if registry:
+            registry.record(feeds[index]["url"], latency, len(items), error, name=feeds[index]["name"])
 
-    cutoff = datetime.now() - timedelta(days=RECENT_DAYS)
-    recent = [article for article in all_articles if article["date"] >= cutoff]
-    recent_pool = recent if recent else all_articles
+    results = [(feed, finished[index]) for index, feed in enumerate(feeds) if index in finished]
+    timed_out = [feed for index, feed in enumerate(feeds) if index not in finished]
+    if registry:
+        for feed in timed_out:
+            registry.record(feed["url"], deadline, error=f"no response within {deadline}s deadline",
+                            name=feed["name"])
+    return results, timed_out
 
-    highly_relevant = [
-        article
-        for article in recent_pool
-        if article.get("relevance_score", 0) >= MIN_RELEVANCE_SCORE
-    ]
-    if len(highly_relevant) < limit:
-        highly_relevant = recent_pool
 
-    us_focused = [article for article in highly_relevant if article.get("us_score", 0) > 0]
-    ranking_pool = us_focused if len(us_focused) >= limit else highly_relevant
+def select_articles(all_articles, limit):
+    """
+    Select top articles using relevance + U.S. preference + source diversity.
+
+    Returns at most `limit` articles with the first one intended as featured.
+
+    Each near-duplicate cluster is represented by its best-scored copy
+    (relevance, then U.S. score); a runner-up only stands in when that copy
+    fails the title or MAX_SOURCE_SHARE checks. Representatives are ranked
+    newest first, then U.S.-focused, then by relevance and U.S. score (ties
+    keep input order). Rather than sorting everything, each representative
+    gets one composite key, the keys are heapified and popped best first
+    until `limit` articles pass the checks.
+    """
+    cutoff = datetime.now() - timedelta(days=RECENT_DAYS)
 
-    ranked = sorted(
-        ranking_pool,
-        key=lambda article: (
-            article["date"],
+    def pool_flags(article):
+        return (
+            article["date"] >= cutoff,
+            article.get("relevance_score", 0) >= MIN_RELEVANCE_SCORE,
             article.get("us_score", 0) > 0,
-            article.get("relevance_score", 0),
-            article.get("us_score", 0),
-        ),
-        reverse=True,
-    )
+        )
+
+    for article in all_articles:
+        if article["date"].tzinfo is not None:
+            article["date"] = article["date"].replace(tzinfo=None)
+    flag_counts = Counter(pool_flags(article) for article in all_articles)
+
+    def pool_size(required):
+        return sum(count for flags, count in flag_counts.items() if all(flags[i] for i in required))
+
+    # Narrow the pool to recent, then highly relevant, then U.S.-focused
+    # articles, skipping any step that would leave fewer than `limit`
+    required = (0,) if pool_size((0,)) else ()
+    for flag in (1, 2):
+        if pool_size(required + (flag,)) >= limit:
+            required += (flag,)
+    ranking_pool = [article for article in all_articles
+                    if all(pool_flags(article)[i] for i in required)]
+
+    rank_keys = []
+    for index, article in enumerate(ranking_pool):
+        us_score = article.get("us_score", 0)
+        newest_first = -((article["date"] - datetime.min) // timedelta(microseconds=1))
+        rank_keys.append((newest_first, us_score <= 0, -article.get("relevance_score", 0), -us_score, index))
+
+    # Copies of one story, best-scored last so pop() hands out the next candidate
+    duplicates = NearDuplicateIndex(ranking_pool)
+    copies = {}
+    for index in range(len(ranking_pool)):
+        copies.setdefault(duplicates.cluster_of(index), []).append(index)
+    for members in copies.values():
+        if len(members) > 1:
+            members.sort(key=lambda i: (rank_keys[i][2], rank_keys[i][3], rank_keys[i]), reverse=True)
+    heap = [rank_keys[members.pop()] for members in copies.values()]
+    heapq.heapify(heap)
 
     seen_titles = set()
     source_counts = {}
     selected = []
 
-    for article in ranked:
+    while heap and len(selected) < limit:
+        index = heapq.heappop(heap)[-1]
+        article = ranking_pool[index]
         title_key = build_title_key(article["title"])
-        if not title_key or title_key in seen_titles:
-            continue
-
         source = article.get("source", "Unknown")
-        if source_counts.get(source, 0) >= MAX_SOURCE_SHARE:
+        if not title_key or title_key in seen_titles or source_counts.get(source, 0) >= MAX_SOURCE_SHARE:
+            runners_up = copies[duplicates.cluster_of(index)]
+            if runners_up:
+                heapq.heappush(heap, rank_keys[runners_up.pop()])
             continue
 
         seen_titles.add(title_key)
         source_counts[source] = source_counts.get(source, 0) + 1
-        selected.append(article)
+        selected.append(index)
 
-        if len(selected) == limit:
-            break
-
-    return selected
+    # A runner-up can be newer than articles picked before it
+    return [ranking_pool[index] for index in sorted(selected, key=rank_keys.__getitem__)]
 
 
 def generate_card_html(article, is_featured=False):
@@ -442,8 +761,28 @@ def generate_card_html(article, is_featured=False):
                     </article>"""
 
 
-def update_blog_html(selected_articles):
-    """Update blog.html featured card, grid cards, and visible date label."""
+def generate_digest_link(week):
+    """Link closing the news grid on blog.html to the weekly digest `week`."""
+    return f"""
+                    <nav class="news-digest-link" aria-label="News digests" style="grid-column: 1 / -1; text-align: center;">
+                        <a href="blog/news/{week}.html" class="btn btn-outline">More headlines: {digest_title("week", week)} digest &rarr;</a>
+                    </nav>"""
+
+
+def latest_digest_week(archive):
+    """Week id of the newest weekly digest in `archive`, or None if it is empty."""
+    return news_archive.week_id(date.fromisoformat(max(archive.days))) if archive.days else None
+
+
+def update_blog_html(selected_articles, pipeline=None, digest_week=None):
+    """
+    Update blog.html featured card, grid cards, and visible date label.
+
+    With `digest_week`, the news grid ends with a link to that weekly
+    digest. The page is written through `pipeline`
+    (build_pipeline.BuildPipeline), so it is only touched when the
+    rendered HTML differs. Returns True if blog.html changed.
+    """
     if not BLOG_HTML.exists():
         raise FileNotFoundError(f"blog.html not found at {BLOG_HTML}")
     if not selected_articles:
@@ -451,6 +790,8 @@ def update_blog_html(selected_articles):
 
     featured_html = generate_card_html(selected_articles[0], is_featured=True)
     grid_cards = "\n\n".join(generate_card_html(article) for article in selected_articles[1:])
+    if digest_week:
+        grid_cards += generate_digest_link(digest_week)
 
     content = BLOG_HTML.read_text(encoding="utf-8")
 
@@ -479,18 +820,150 @@ def update_blog_html(selected_articles):
         flags=re.DOTALL,
     )
 
-    BLOG_HTML.write_text(content, encoding="utf-8")
+    pipeline = pipeline or build_pipeline.BuildPipeline()
+    return pipeline.write(BLOG_HTML, content)
+
+
+def digest_title(kind, period):
+    """'Week of October 12, 2026' / 'October 2026' for a week or month id."""
+    if kind == "week":
+        year, week = period.split("-W")
+        monday = date.fromisocalendar(int(year), int(week), 1)
+        return f"Week of {monday.strftime('%B %d, %Y').replace(' 0', ' ')}"
+    return datetime.strptime(period, "%Y-%m").strftime("%B %Y")
+
+
+def generate_digest_collection_json(url, name, records):
+    """CollectionPage structured data listing a digest's articles."""
+    return json.dumps({
+        "@context": "https://schema.org",
+        "@type": "CollectionPage",
+        "name": name,
+        "description": "Logistics and supply chain news selected for the Miami Alliance 3PL blog.",
+        "url": url,
+        "publisher": {
+            "@type": "Organization",
+            "name": "Miami Alliance 3PL",
+            "url": update_blog_from_files.SITE_URL,
+        },
+        "mainEntity": {
+            "@type": "ItemList",
+            "itemListElement": [
+                {"@type": "ListItem", "position": position, "url": record["link"], "name": record["title"]}
+                for position, record in enumerate(records, start=1)
+            ],
+        },
+    }, indent=4, ensure_ascii=False)
+
+
+def generate_digest_page(shell, kind, period, records, newer_href=None, older_href=None):
+    """Full HTML of the weekly or monthly news digest blog/news/<period>.html."""
+    before, after = shell
+    url = f"{update_blog_from_files.SITE_URL}/blog/news/{period}.html"
+    title = f"Logistics News Digest - {digest_title(kind, period)}"
+    days = sorted({record["archived_on"] for record in records})
+    first, last = (format_date(datetime.fromisoformat(day)) for day in (days[0], days[-1]))
+    span = f"{first} &ndash; {last}"
+    head = update_blog_from_files.render_page_head(
+        before, url, title,
+        f"{len(records)} logistics industry stories featured on the Miami Alliance 3PL blog, {first} - {last}.",
+        generate_digest_collection_json(url, title, records),
+    )
+    cards = "\n\n".join(generate_card_html(record) for record in records)
+    nav = update_blog_from_files.generate_pagination_nav(newer_href, older_href)
+
+    return f"""{head}<main id="main-content">
+        <section class="page-header blog-header">
+            <div class="container">
+                <nav class="breadcrumb" aria-label="Breadcrumb">
+                    <a href="../../index.html" data-i18n="blog.breadcrumb.home">Home</a> &rsaquo; <a href="../../blog.html" data-i18n="blog.breadcrumb.blog">Blog</a> &rsaquo; <span>{html.escape(digest_title(kind, period))}</span>
+                </nav>
+                <h1>{html.escape(title)}</h1>
+                <p class="blog-hero-subtitle">{len(records)} industry stories featured on our blog, {span}.</p>
+            </div>
+        </section>
+
+        <div class="container" style="padding: var(--spacing-xl) 0;">
+            <div class="blog-grid">
+{cards}
+{nav}
+            </div>
+        </div>
+    </main>{after}"""
+
+
+def digest_shell_hash(shell):
+    """
+    Hash of the blog.html shell as a digest page uses it: the head regions
+    each digest fills in itself (title, description, URLs, CollectionPage data)
+    are blanked first, so new blog posts do not invalidate every digest.
+    """
+    before, after = shell
+    regions = update_blog_from_files.ARCHIVE_HEAD_TEMPLATE.names
+    kept, _ = update_blog_from_files.ARCHIVE_HEAD_TEMPLATE.render(before, dict.fromkeys(regions, ""))
+    return build_pipeline.sha256_bytes((kept + after).encode("utf-8"))
+
+
+def build_digest_pages(archive, pipeline=None, blog_html=None):
+    """
+    Write weekly and monthly digests of the news archive to blog/news/.
+
+    Pages are built from archive partitions only (no network). A digest is
+    skipped without reading its partitions when its archive key, its
+    newer/older neighbours and the blog.html shell are unchanged since it
+    was last written. Returns (written, unchanged, skipped) lists of paths.
+    """
+    pipeline = pipeline or build_pipeline.BuildPipeline()
+    shell = update_blog_from_files.split_page_shell(
+        blog_html if blog_html is not None else BLOG_HTML.read_text(encoding="utf-8"))
+    if shell is None:
+        raise ValueError("Could not find <main id=\"main-content\"> in blog.html")
+    shell_hash = digest_shell_hash(shell)
+
+    periods = archive.periods()
+    written, unchanged, skipped = [], [], []
+    for kind in ("week", "month"):
+        ids = sorted((period for period_kind, period in periods if period_kind == kind), reverse=True)
+        for position, period in enumerate(ids):
+            newer_href = f"{ids[position - 1]}.html" if position else "../../blog.html"
+            older_href = f"{ids[position + 1]}.html" if position + 1 < len(ids) else None
+            days, key = periods[(kind, period)]
+            page_key = build_pipeline.sha256_bytes(
+                f"{key}|{newer_href}|{older_href}|{shell_hash}".encode("utf-8"))
+            path = BLOG_DIGEST_DIR / f"{period}.html"
+            name = f"blog/news/{period}.html"
+            if archive.digest_is_current(name, page_key) and path.exists():
+                skipped.append(path)
+                continue
+
+            records, links = [], set()
+            for day in days:
+                for record in archive.read(day):
+                    if record["link"] not in links:
+                        links.add(record["link"])
+                        records.append(record)
+            records.sort(key=lambda record: record["date"], reverse=True)
+            page_html = generate_digest_page(shell, kind, period, records, newer_href, older_href)
+            (written if pipeline.write(path, page_html) else unchanged).append(path)
+            if not pipeline.dry_run:
+                archive.mark_digest(name, page_key)
+    return written, unchanged, skipped
 
 
 def commit_and_push_if_changed(selected_count, cron_mode=False):
-    """Commit/push blog changes only when there is an actual diff."""
-    diff_check = subprocess.run(
-        ["git", "diff", "--quiet", "--", "blog.html"],
+    """Commit/push blog.html, news digests, the sitemap and the archive only when there is an actual diff."""
+    # Digest pages and archive partitions may be new files, so ask git status rather than git diff
+    paths = ["blog.html", "blog/news", "admin/news_archive", "sitemap.xml"]
+    paths += sorted(path.name for path in PROJECT_ROOT.glob(f"{sitemap_builder.CHILD_PREFIX}*.xml.gz"))
+    tracked = [path for path in paths if (PROJECT_ROOT / path).exists()]
+    status = subprocess.run(
+        ["git", "status", "--porcelain", "--", *tracked],
         cwd=str(PROJECT_ROOT),
         capture_output=True,
+        text=True,
         check=False,
     )
-    if diff_check.returncode == 0:
+    if status.returncode == 0 and not status.stdout.strip():
         if not cron_mode:
             print("  No blog.html changes to commit.")
         return
@@ -498,7 +971,7 @@ def commit_and_push_if_changed(selected_count, cron_mode=False):
     today = datetime.now().strftime("%Y-%m-%d")
     commit_message = f"Daily blog update: {today} ({selected_count} articles)"
 
-    subprocess.run(["git", "add", "blog.html"], cwd=str(PROJECT_ROOT), check=True)
+    subprocess.run(["git", "add", "--", *tracked], cwd=str(PROJECT_ROOT), check=True)
     subprocess.run(
         ["git", "commit", "-m", commit_message],
         cwd=str(PROJECT_ROOT),
@@ -530,6 +1003,38 @@ def parse_args():
         default=MAX_ARTICLES,
         help="Number of grid cards (excluding featured)",
     )
+    parser.add_argument(
+        "--feed-timeout",
+        type=float,
+        default=FEED_TIMEOUT,
+        help=f"Seconds to wait on each feed (default: {FEED_TIMEOUT})",
+    )
+    parser.add_argument(
+        "--fetch-deadline",
+        type=float,
+        default=FETCH_DEADLINE,
+        help=f"Seconds to wait for all feeds before using partial results (default: {FETCH_DEADLINE})",
+    )
+    parser.add_argument(
+        "--no-http-cache",
+        action="store_true",
+        help="Always download feeds in full instead of using the conditional-GET cache",
+    )
+    parser.add_argument(
+        "--no-feed-registry",
+        action="store_true",
+        help="Fetch every feed with --feed-timeout and record no health stats in admin/.feed_health.json",
+    )
+    parser.add_argument(
+        "--no-item-store",
+        action="store_true",
+        help="Re-clean and re-score every item instead of reusing admin/.news_item_store.json",
+    )
+    parser.add_argument(
+        "--no-archive",
+        action="store_true",
+        help="Do not add today's selection to admin/news_archive/ or rebuild blog/news/ digests",
+    )
     return parser.parse_args()
 
 
@@ -545,21 +1050,42 @@ def main():
         print("  Miami Alliance 3PL - Daily Blog News Updater")
         print("=" * 60)
 
-    all_articles = []
+    HTTP_CACHE.enabled = not args.no_http_cache
+    store = ItemStore(enabled=not args.no_item_store)
+    registry = feed_registry.FeedRegistry(enabled=not args.no_feed_registry)
+    feeds = [feed for feed in RSS_FEEDS if registry.allow(feed["url"])]
     for feed in RSS_FEEDS:
-        if not cron_mode:
-            print(f"\n  Fetching: {feed['name']}...")
+        if feed not in feeds:
+            print(f"  [WARN] {feed['name']} keeps failing; skipped until its retry window "
+                  "(python3 admin/feed_registry.py)", file=sys.stderr)
+    if not cron_mode:
+        print(f"\n  Fetching {len(feeds)} feeds...")
+    started = time.monotonic()
+    feed_results, timed_out = fetch_feeds(feeds, args.feed_timeout, args.fetch_deadline, store, registry)
+    registry.save()
+    for feed in timed_out:
+        print(f"  [WARN] {feed['name']} did not respond within {args.fetch_deadline}s; skipped",
+              file=sys.stderr)
+    if not cron_mode:
+        for feed, feed_items in feed_results:
+            print(f"  {feed['name']}: {len(feed_items)} items")
+        print(f"  Fetched in {time.monotonic() - started:.1f}s")
+        if HTTP_CACHE.enabled:
+            print(f"  {HTTP_CACHE.report()}")
+        if registry.enabled:
+            print()
+            for line in registry.report(args.feed_timeout).splitlines():
+                print(f"  {line}")
 
-        feed_items = fetch_feed(feed["url"])
+    all_articles = []
+    for feed, feed_items in feed_results:
         for item in feed_items:
-            category = auto_categorize(item["title"], item["description"], feed["category"])
+            scores = store.scores(item, feed["category"])
+            if scores is None:
+                scores = score_item(item, feed["category"])
+                store.put(item, feed["category"], scores)
+            category, relevance, us_score = scores
             published_at = parse_date(item["pub_date"])
-            relevance = logistics_relevance_score(
-                item["title"], item["description"], item.get("categories_text", "")
-            )
-            us_score = us_relevance_score(
-                item["title"], item["description"], item.get("categories_text", "")
-            )
 
             all_articles.append(
                 {
@@ -574,6 +1100,10 @@ def main():
                 }
             )
 
+    store.save()
+    if not cron_mode and store.enabled:
+        print(f"  {store.report()}")
+
     if not all_articles:
         print("  [ERROR] No articles fetched from any feed.", file=sys.stderr)
         sys.exit(1)
@@ -602,8 +1132,23 @@ def main():
         return
 
     try:
-        update_blog_html(selected)
-        if not cron_mode:
+        pipeline = build_pipeline.BuildPipeline()
+        archive = news_archive.NewsArchive()
+        archived = 0 if args.no_archive else archive.append(date.today(), selected, lookback_days=RECENT_DAYS)
+        changed = update_blog_html(selected, pipeline, digest_week=latest_digest_week(archive))
+        if not args.no_archive:
+            written, _, skipped = build_digest_pages(archive, pipeline)
+            archive.save()
+            if written:
+                sitemap_builder.replace_digest_entries(sitemap_builder.news_digest_entries(archive),
+                                                       pipeline=pipeline)
+            if not cron_mode:
+                print(f"\n  {archive.report()} ({archived} added today)")
+                print(f"  Digest pages: {len(written)} rebuilt, {len(skipped)} unchanged")
+        if not changed:
+            if not cron_mode:
+                print("\n  blog.html already up to date")
+        elif not cron_mode:
             print(f"\n  blog.html updated with {len(selected)} articles")
             print(f"  File: {BLOG_HTML}")
         else:
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Invoice rendering benchmark and regression check.
+
+Renders synthetic invoices with 1, 50 and 500 line items, once in a single
+process and once through render_batch()'s worker pool, and records per
+scenario: wall time, invoices/s, pages/s, peak RSS and mean PDF size.
+Nothing touches Firestore or the network.
+
+Absolute pages/s depends on the machine and on whatever else it is doing,
+so right before each scenario the same process renders a fixed plain
+ReportLab table document. Throughput is gated on the ratio of the
+scenario's pages/s to that baseline, which cancels most machine noise.
+
+Results are compared with benchmarks/invoice_thresholds.json; any scenario
+that is relatively slower, larger or hungrier than its threshold is
+reported and the script exits 1. After an intentional change, refresh the
+thresholds with --update-thresholds.
+
+Usage:
+    python3 benchmarks/bench_invoice_render.py
+    python3 benchmarks/bench_invoice_render.py --invoices 50 --jobs 4
+    python3 benchmarks/bench_invoice_render.py --json results.json
+    python3 benchmarks/bench_invoice_render.py --update-thresholds
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from io import BytesIO
+from multiprocessing import Pool
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import generate_storage_invoice as invoices  # noqa: E402
+from reportlab.lib.pagesizes import letter  # noqa: E402
+from reportlab.platypus import SimpleDocTemplate, Table  # noqa: E402
+
+THRESHOLDS_PATH = Path(__file__).resolve().parent / "invoice_thresholds.json"
+LINE_COUNTS = (1, 50, 500)
+MODES = ("single", "pooled")
+
+BASELINE_ROWS = 40
+BASELINE_REPEATS = 3
+
+# Headroom applied by --update-thresholds so normal run-to-run noise passes
+THROUGHPUT_FLOOR = 0.6
+RSS_CEILING = 1.5
+SIZE_CEILING = 1.1
+
+SERVICES = (
+    ("Pallet Storage", "pallet/day", 0.75, "Monthly"),
+    ("Pick & Pack", "order", 2.50, "One-time"),
+    ("Receiving", "pallet", 15.00, "One-time"),
+    ("Labeling", "unit", 0.35, "One-time"),
+    ("Kitting", "kit", 4.25, "One-time"),
+)
+
+
+def synthetic_invoice(index, line_count):
+    """A deterministic invoice record with `line_count` line items."""
+    line_items = []
+    for line in range(line_count):
+        description, unit, rate, frequency = SERVICES[line % len(SERVICES)]
+        line_items.append({
+            "description": f"{description} — order {index:05d}-{line:04d}",
+            "quantity": 1 + (index + line) % 12,
+            "rate": rate,
+            "unit": unit,
+            "frequency": frequency,
+        })
+    return {
+        "invoice_number": f"INV-BENCH-{line_count:03d}-{index:05d}",
+        "invoice_type": "invoice",
+        "issue_date": "2026-03-01",
+        "due_date": "2026-03-31",
+        "customer_name": f"Benchmark Customer {index % 40}",
+        "customer_email": f"billing{index % 40}@example.com",
+        "billing_cycle": "monthly",
+        "tax_rate": 7,
+        "line_items": line_items,
+    }
+
+
+def baseline_pages_per_second(count):
+    """
+    Pages/s of a fixed one-page ReportLab table document, the yardstick for
+    this machine right now (best of BASELINE_REPEATS runs of `count` pages).
+    """
+    rows = [[f"Row {row}", "pallet/day", f"{row * 0.75:.2f}"] for row in range(BASELINE_ROWS)]
+    best = None
+    for _ in range(BASELINE_REPEATS):
+        started = time.perf_counter()
+        for _ in range(count):
+            SimpleDocTemplate(BytesIO(), pagesize=letter).build([Table(rows)])
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return count / best
+
+
+def _single_scenario(line_count, count):
+    """Render `count` invoices sequentially in this (fresh) process."""
+    records = [synthetic_invoice(index, line_count) for index in range(count)]
+    invoices.get_template()
+    baseline = baseline_pages_per_second(count)
+    pages = size = 0
+    started = time.perf_counter()
+    for record in records:
+        data, _, rendered_pages = invoices.render_invoice_bytes(record)
+        pages += rendered_pages
+        size += len(data)
+    wall = time.perf_counter() - started
+    return {"wall_seconds": wall, "pages": pages, "bytes": size,
+            "peak_rss_mb": invoices.peak_rss_mb(), "baseline_pages_per_second": baseline}
+
+
+def run_single(line_count, count):
+    # A one-off child process keeps peak RSS per scenario instead of cumulative
+    with Pool(1) as pool:
+        return pool.apply(_single_scenario, (line_count, count))
+
+
+def run_pooled(line_count, count, jobs):
+    records = [synthetic_invoice(index, line_count) for index in range(count)]
+    baseline = baseline_pages_per_second(count)
+    with tempfile.TemporaryDirectory() as tmp:
+        results, wall = invoices.render_batch(records, tmp, jobs=jobs)
+    summary = invoices.summarize_batch(results, wall)
+    if summary["failed"]:
+        raise RuntimeError(f"{summary['failed']} synthetic invoices failed to render")
+    return {"wall_seconds": wall, "pages": summary["pages"], "bytes": summary["bytes"],
+            "peak_rss_mb": summary["peak_worker_rss_mb"], "baseline_pages_per_second": baseline}
+
+
+def run_scenarios(count, jobs):
+    scenarios = {}
+    for line_count in LINE_COUNTS:
+        for mode in MODES:
+            if mode == "single":
+                raw = run_single(line_count, count)
+            else:
+                raw = run_pooled(line_count, count, jobs)
+            wall = raw["wall_seconds"]
+            pages_per_second = raw["pages"] / wall
+            scenarios[f"{mode}-{line_count}"] = {
+                "mode": mode,
+                "line_items": line_count,
+                "invoices": count,
+                "wall_seconds": round(wall, 3),
+                "invoices_per_second": round(count / wall, 2),
+                "pages_per_second": round(pages_per_second, 2),
+                "baseline_pages_per_second": round(raw["baseline_pages_per_second"], 2),
+                "relative_throughput": round(pages_per_second / raw["baseline_pages_per_second"], 3),
+                "pages_per_invoice": raw["pages"] / count,
+                "bytes_per_invoice": raw["bytes"] // count,
+                "peak_rss_mb": round(raw["peak_rss_mb"] or 0, 1),
+            }
+    return scenarios
+
+
+def check_thresholds(scenarios, thresholds):
+    """Return a list of human-readable regressions."""
+    failures = []
+    for name, result in scenarios.items():
+        limits = thresholds.get(name)
+        if not limits:
+            continue
+        if result["relative_throughput"] < limits["min_relative_throughput"]:
+            failures.append(f"{name}: {result['relative_throughput']}x baseline pages/s "
+                            f"< {limits['min_relative_throughput']}x")
+        if result["peak_rss_mb"] > limits["max_peak_rss_mb"]:
+            failures.append(f"{name}: peak RSS {result['peak_rss_mb']} MB "
+                            f"> {limits['max_peak_rss_mb']}")
+        if result["bytes_per_invoice"] > limits["max_bytes_per_invoice"]:
+            failures.append(f"{name}: {result['bytes_per_invoice']} bytes/invoice "
+                            f"> {limits['max_bytes_per_invoice']}")
+    return failures
+
+
+def thresholds_from(scenarios):
+    return {
+        name: {
+            "min_relative_throughput": round(result["relative_throughput"] * THROUGHPUT_FLOOR, 3),
+            "max_peak_rss_mb": round(result["peak_rss_mb"] * RSS_CEILING, 1),
+            "max_bytes_per_invoice": int(result["bytes_per_invoice"] * SIZE_CEILING),
+        }
+        for name, result in scenarios.items()
+    }
+
+
+def print_report(scenarios):
+    print(f"{'scenario':12s} {'wall s':>8s} {'inv/s':>8s} {'pages/s':>9s} {'x base':>7s} "
+          f"{'pages/inv':>9s} {'KB/inv':>8s} {'RSS MB':>8s}")
+    for name, result in scenarios.items():
+        print(f"{name:12s} {result['wall_seconds']:8.2f} {result['invoices_per_second']:8.1f} "
+              f"{result['pages_per_second']:9.1f} {result['relative_throughput']:7.2f} "
+              f"{result['pages_per_invoice']:9.1f} "
+              f"{result['bytes_per_invoice'] / 1024:8.1f} {result['peak_rss_mb']:8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Invoice rendering benchmark")
+    parser.add_argument("--invoices", type=int, default=20,
+                        help="Invoices per scenario (default: 20)")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="Workers for pooled scenarios (default: CPU count)")
+    parser.add_argument("--thresholds", default=str(THRESHOLDS_PATH),
+                        help="Threshold file to check against")
+    parser.add_argument("--update-thresholds", action="store_true",
+                        help="Write thresholds derived from this run instead of checking")
+    parser.add_argument("--json", metavar="PATH", help="Also write raw results as JSON")
+    args = parser.parse_args()
+
+    scenarios = run_scenarios(args.invoices, args.jobs)
+    print_report(scenarios)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(scenarios, indent=2) + "\n", encoding="utf-8")
+
+    thresholds_path = Path(args.thresholds)
+    if args.update_thresholds:
+        thresholds_path.write_text(json.dumps(thresholds_from(scenarios), indent=2) + "\n",
+                                   encoding="utf-8")
+        print(f"\nThresholds written to {thresholds_path}")
+        return 0
+
+    if not thresholds_path.exists():
+        print(f"\nNo thresholds at {thresholds_path}; run with --update-thresholds first")
+        return 0
+    failures = check_thresholds(scenarios, json.loads(thresholds_path.read_text(encoding="utf-8")))
+    if failures:
+        print("\nREGRESSIONS:")
+        for failure in failures:
+            print(f"  ✗ {failure}")
+        return 1
+    print("\nAll scenarios within thresholds")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
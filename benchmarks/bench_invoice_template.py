@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: per-invoice render time with and without the shared InvoiceTemplate.
+
+"rebuild" compiles a fresh template for every invoice (what create_invoice()
+used to do: stylesheet, ParagraphStyles, header, badge, terms and footer
+tables on every call). "shared" compiles one template and reuses it.
+
+Usage:
+    python3 benchmarks/bench_invoice_template.py
+    python3 benchmarks/bench_invoice_template.py --invoices 200
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import generate_storage_invoice as invoices  # noqa: E402
+
+SAMPLE_PATH = PROJECT_ROOT / "admin" / "invoice_samples" / "global_cellutions_proforma.json"
+
+
+def time_renders(count, output_dir, shared):
+    """Render the sample invoice `count` times; returns per-invoice seconds."""
+    records, pricing = invoices.load_invoices_json(SAMPLE_PATH)
+    invoice = invoices.build_invoice_model(records[0], pricing)
+    template = invoices.InvoiceTemplate() if shared else None
+
+    timings = []
+    for index in range(count):
+        started = time.perf_counter()
+        (template or invoices.InvoiceTemplate()).render(invoice, output_dir / f"bench-{index}.pdf")
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="InvoiceTemplate micro-benchmark")
+    parser.add_argument("--invoices", type=int, default=100, help="Invoices per mode (default: 100)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir = Path(tmp)
+        time_renders(5, output_dir, shared=True)  # warm imports and font caches
+        results = {
+            "rebuild": time_renders(args.invoices, output_dir, shared=False),
+            "shared": time_renders(args.invoices, output_dir, shared=True),
+        }
+
+    print(f"Per-invoice render time over {args.invoices} invoices")
+    for mode, timings in results.items():
+        print(f"  {mode:8s} mean {statistics.mean(timings) * 1000:7.2f} ms | "
+              f"median {statistics.median(timings) * 1000:7.2f} ms | "
+              f"min {min(timings) * 1000:7.2f} ms")
+    speedup = statistics.median(results["rebuild"]) / statistics.median(results["shared"])
+    print(f"  speedup  {speedup:.2f}x (median)")
+
+
+if __name__ == "__main__":
+    main()
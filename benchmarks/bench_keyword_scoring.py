@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Keyword scoring benchmark for admin/update_blog_news.py.
+
+Scores synthetic articles twice: with the original per-keyword substring
+scans (one `kw in text` per keyword, three passes per article) and with
+score_item(), which runs the shared KeywordScorer (admin/keyword_scoring.py) once per article.
+Every article must get identical (category, relevance, us_score) from
+both; the script exits 1 on any mismatch.
+
+Usage:
+    python3 benchmarks/bench_keyword_scoring.py
+    python3 benchmarks/bench_keyword_scoring.py --articles 50000 --seed 7
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from admin import update_blog_news as news  # noqa: E402
+
+FILLER = (
+    "the a of and to in for on with as by from at quarter report volume rates demand "
+    "week growth market announced company said new year data higher lower expected"
+).split()
+
+
+def legacy_score(item, default_category):
+    """The pre-matcher scoring: one substring scan per keyword per list."""
+    def hits(text, keywords):
+        normalized = news.normalize_text(text)
+        return sum(1 for kw in keywords if kw in normalized)
+
+    title, description = item["title"], item["description"]
+    full = f"{title} {description} {item.get('categories_text', '')}"
+    combined = news.normalize_text(f"{title} {description}")
+    scores = {}
+    for category, keywords in news.CATEGORY_KEYWORDS.items():
+        count = sum(1 for kw in keywords if kw in combined)
+        if count:
+            scores[category] = count
+    category = max(scores, key=scores.get) if scores else default_category
+    return (category, hits(full, news.LOGISTICS_RELEVANCE_KEYWORDS),
+            hits(full, news.US_RELEVANCE_KEYWORDS))
+
+
+def synthetic_articles(count, seed):
+    rng = random.Random(seed)
+    vocabulary = sorted(news.KEYWORD_SCORER.matcher.vocabulary)
+
+    def sentence(words, keyword_rate):
+        tokens = []
+        for _ in range(words):
+            if rng.random() < keyword_rate:
+                keyword = rng.choice(vocabulary)
+                tokens.append(keyword.upper() if rng.random() < 0.2 else keyword)
+            else:
+                tokens.append(rng.choice(FILLER))
+        return " ".join(tokens)
+
+    return [{
+        "title": sentence(rng.randint(6, 14), 0.12),
+        "description": sentence(rng.randint(25, 60), 0.05),
+        "categories_text": sentence(rng.randint(0, 4), 0.5),
+    } for _ in range(count)]
+
+
+def timed(fn, articles):
+    started = time.perf_counter()
+    results = [fn(article, "supply-chain") for article in articles]
+    return results, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keyword scoring benchmark")
+    parser.add_argument("--articles", type=int, default=10_000, help="Synthetic articles (default: 10000)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the synthetic corpus")
+    args = parser.parse_args()
+
+    articles = synthetic_articles(args.articles, args.seed)
+    legacy, legacy_wall = timed(legacy_score, articles)
+    matched, matched_wall = timed(news.score_item, articles)
+
+    mismatches = [index for index, (old, new) in enumerate(zip(legacy, matched)) if old != new]
+    print(f"{'scorer':18s} {'wall s':>8s} {'articles/s':>12s}")
+    print(f"{'per-keyword scans':18s} {legacy_wall:8.3f} {args.articles / legacy_wall:12.0f}")
+    print(f"{'compiled matcher':18s} {matched_wall:8.3f} {args.articles / matched_wall:12.0f}")
+    print(f"\nSpeed-up: {legacy_wall / matched_wall:.2f}x over {args.articles} articles")
+
+    if mismatches:
+        first = mismatches[0]
+        print(f"\n{len(mismatches)} MISMATCHES; first at #{first}: "
+              f"{legacy[first]} != {matched[first]}")
+        return 1
+    print("All scores identical")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
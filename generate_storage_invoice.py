@@ -1,18 +1,80 @@
 #!/usr/bin/env python3
 """
-Miami Alliance 3PL - Pro Forma Invoice Generator (Storage Services Only)
-Generates a professional PDF invoice for storage and receiving services.
+Miami Alliance 3PL - Invoice Generator
+Renders professional PDF invoices (pro forma or final) from structured
+invoice records. Records come from a JSON file or from Firestore `invoices`
+documents; rates can be pulled from `settings/pricing`.
+
+Usage:
+    python3 generate_storage_invoice.py render invoice.json                # Object or list of invoices
+    python3 generate_storage_invoice.py render invoices.json --output-dir ./out
+    python3 generate_storage_invoice.py render invoice.json --pricing pricing.json
+    python3 generate_storage_invoice.py render --firestore --invoice-id ID  # One Firestore invoice
+    python3 generate_storage_invoice.py render --firestore --status draft  # Every draft invoice
+    python3 generate_storage_invoice.py render-batch --firestore --status draft --jobs 8
+    python3 generate_storage_invoice.py render-batch invoices.json --max-memory-mb 768
+    python3 generate_storage_invoice.py render-batch invoices.json --assign-numbers
+    python3 generate_storage_invoice.py render-batch invoices.json --archive month-end.zip
+
+Invoice numbers are never random. With --assign-numbers, records without an
+invoice_number get the next numbers of their series (MA3PL-PF-YYYYMMDD-NNNN
+for pro formas, INV-YYYY-MM-NNNN for invoices), reserved as one block per
+series from Firestore `counters/{series}` (or admin/.invoice_sequences.json
+for JSON input). The numbers are saved on the invoices (the Firestore
+documents, or written back into the input JSON file), so rerunning never
+renumbers an invoice.
+
+Invoice record (same field names as the Firestore `invoices` collection):
+    {
+        "invoice_number": "MA3PL-PF-20260212-0001",
+        "invoice_type": "proforma",              # or "invoice" (default)
+        "issue_date": "2026-02-12",
+        "valid_through": "2026-03-14",           # pro forma; invoices use "due_date"
+        "customer_name": "Global Cellutions",
+        "customer_details": ["Pallets: 60 | Container Unload"],
+        "line_items": [
+            {"description": "Pallet Storage", "quantity": 60, "days": 30,
+             "unit": "pallet/day", "rate_key": "storage.palletDaily", "frequency": "Monthly"},
+            {"description": "Container Receiving & Unload", "quantity": 1,
+             "rate": 350, "frequency": "One-time"}
+        ],
+        "tax_rate": 0,                           # percent
+        "terms": ["..."], "notes": ["..."]
+    }
 """
 
+import argparse
+import copy
+import html
+import json
+import os
+import re
+import sys
+import tarfile
+import time
+import zipfile
+from datetime import date, datetime
+from io import BytesIO
+from multiprocessing import Pool
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: local sequence file is used without locking
+    fcntl = None
+
+from reportlab import rl_config
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.units import inch
 from reportlab.lib.colors import HexColor, white, black
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
+from reportlab.platypus import (SimpleDocTemplate, Table, LongTable, TableStyle, Paragraph, Spacer,
+                                Image, PageBreak)
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_LEFT, TA_RIGHT, TA_CENTER
-from reportlab.pdfgen import canvas
-from datetime import datetime, timedelta
-import random
+
+# Write PDF streams as binary rather than ASCII85 text. Without the C
+# accelerator the logo JPEG was re-encoded in pure Python for every invoice.
+rl_config.useA85 = 0
 
 # Colors
 NAVY_BLUE = HexColor('#1e3a5f')
@@ -21,357 +83,1330 @@ ORANGE_ACCENT = HexColor('#f59e0b')
 LIGHT_GRAY = HexColor('#f3f4f6')
 YELLOW_BG = HexColor('#fef3c7')
 
-# Generate random 4-digit invoice number
-INVOICE_NUM = f"MA3PL-PF-20260212-{random.randint(1000, 9999)}"
-
-# Invoice details
-ISSUE_DATE = "February 12, 2026"
-VALID_THROUGH = "March 14, 2026"
-
-def create_invoice():
-    """Generate the pro forma invoice PDF."""
-    
-    output_path = "/Users/yuri/Downloads/MiamiAlliance3PL_ProForma_GlobalCellutions_StorageOnly.pdf"
-    
-    # Create PDF
-    pdf = SimpleDocTemplate(
-        output_path,
-        pagesize=letter,
-        rightMargin=0.5*inch,
-        leftMargin=0.5*inch,
-        topMargin=0.5*inch,
-        bottomMargin=0.5*inch
-    )
-    
-    # Container for the 'Flowable' objects
-    elements = []
-    
-    # Styles
+DEFAULT_OUTPUT_DIR = Path.home() / "Downloads"
+LOGO_PATH = Path(__file__).resolve().parent / "assets" / "logo_pdf.jpg"
+LOGO_HEIGHT = 0.95*inch
+
+# Page geometry (letter, 0.5" margins, platypus' 6pt frame padding)
+PAGE_MARGIN = 0.5*inch
+FRAME_WIDTH = letter[0] - 2 * PAGE_MARGIN - 12
+FRAME_HEIGHT = letter[1] - 2 * PAGE_MARGIN - 12
+
+# Services tables longer than this are laid out as one page-sized chunk per
+# page, each with its own header row and page subtotal. Row heights are
+# fixed so chunks are sized arithmetically instead of by measuring cells.
+PAGINATE_ABOVE_LINES = 25
+SERVICES_COL_WIDTHS = [2.5*inch, 0.6*inch, 1.2*inch, 1*inch, 1*inch]
+SERVICES_HEADER_HEIGHT = 26
+SERVICES_ROW_PADDING = 12
+SERVICES_LINE_HEIGHT = 11
+PAGE_SAFETY_MARGIN = 6
+
+# Invoice numbering
+SEQUENCE_COLLECTION = 'counters'
+DEFAULT_SEQUENCE_FILE = Path(__file__).resolve().parent / "admin" / ".invoice_sequences.json"
+INVOICE_SEQUENCE_WIDTH = 4
+FIRESTORE_BATCH_LIMIT = 500
+
+# render-batch worker defaults
+DEFAULT_MAX_MEMORY_MB = 512
+DEFAULT_TASKS_PER_WORKER = 100
+
+BADGE_LABELS = {
+    'proforma': 'PRO FORMA INVOICE',
+    'invoice': 'INVOICE',
+}
+
+TOTAL_LABELS = {
+    'proforma': 'ESTIMATED TOTAL:',
+    'invoice': 'TOTAL DUE:',
+}
+
+DEFAULT_NOTES = {
+    'proforma': [
+        'This pro forma invoice is an estimate. Final billing is based on actual services rendered.',
+        'All prices are in USD. Payment terms: Net 15. This quote is valid for 30 days from issue date.',
+    ],
+    'invoice': [
+        'All prices are in USD. Payment terms: Net 15.',
+    ],
+}
+
+RECURRING_FREQUENCIES = {'monthly'}
+
+
+def format_money(value):
+    """Format a dollar amount as $1,234.56."""
+    return f"${value:,.2f}"
+
+
+def format_display_date(value):
+    """Format an ISO date string, date or datetime as 'February 12, 2026'."""
+    if not value:
+        return ''
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return value
+    if isinstance(value, (date, datetime)):
+        return value.strftime('%B %d, %Y').replace(' 0', ' ')
+    return str(value)
+
+
+def resolve_rate(item, pricing):
+    """Return the unit rate for a line item, looking up `rate_key` in pricing."""
+    if item.get('rate') is not None:
+        return float(item['rate'])
+
+    rate_key = item.get('rate_key')
+    if not rate_key:
+        raise ValueError(f"Line item '{item.get('description', '?')}' has no rate or rate_key")
+    if not pricing:
+        raise ValueError(f"Line item '{item.get('description', '?')}' uses rate_key "
+                         f"'{rate_key}' but no pricing is loaded")
+
+    value = pricing
+    for part in rate_key.split('.'):
+        if not isinstance(value, dict) or part not in value:
+            raise ValueError(f"Pricing key '{rate_key}' not found in settings/pricing")
+        value = value[part]
+    return float(value)
+
+
+def build_invoice_model(record, pricing=None):
+    """
+    Normalize an invoice record and compute line amounts and totals.
+
+    Amounts stored on the record are ignored; every amount is recomputed
+    from quantity x rate (x days, for per-day rates).
+    """
+    invoice_number = record.get('invoice_number')
+    if not invoice_number:
+        raise ValueError(f"Invoice record {record.get('id', '?')} has no invoice_number")
+
+    invoice_type = record.get('invoice_type', 'invoice')
+    if invoice_type not in BADGE_LABELS:
+        raise ValueError(f"Unknown invoice_type '{invoice_type}' on {invoice_number}")
+
+    line_items = []
+    for item in record.get('line_items') or []:
+        quantity = float(item.get('quantity', 1) or 0)
+        days = item.get('days')
+        multiplier = float(days) if days is not None else 1
+        rate = resolve_rate(item, pricing)
+        line_items.append({
+            'description': item.get('description') or item.get('category') or 'Service',
+            'quantity': quantity,
+            'days': days,
+            'unit': item.get('unit', ''),
+            'rate': rate,
+            'frequency': item.get('frequency') or (record.get('billing_cycle') or '').title() or 'One-time',
+            'amount': round(quantity * multiplier * rate, 2),
+        })
+
+    if not line_items:
+        raise ValueError(f"Invoice {invoice_number} has no line items")
+
+    subtotal = round(sum(item['amount'] for item in line_items), 2)
+    tax_rate = float(record.get('tax_rate', 0) or 0)
+    tax_amount = round(subtotal * tax_rate / 100, 2)
+    recurring_total = round(sum(
+        item['amount'] for item in line_items
+        if item['frequency'].lower() in RECURRING_FREQUENCIES
+    ), 2)
+
+    notes = record.get('notes')
+    if isinstance(notes, str):
+        notes = [notes] if notes.strip() else []
+
+    return {
+        'invoice_number': invoice_number,
+        'invoice_type': invoice_type,
+        'issue_date': format_display_date(record.get('issue_date') or record.get('created_at')
+                                          or date.today()),
+        'valid_through': format_display_date(record.get('valid_through')),
+        'due_date': format_display_date(record.get('due_date')),
+        'billing_period_start': format_display_date(record.get('billing_period_start')),
+        'billing_period_end': format_display_date(record.get('billing_period_end')),
+        'customer_name': record.get('customer_name') or 'Customer',
+        'customer_email': record.get('customer_email', ''),
+        'customer_details': list(record.get('customer_details') or []),
+        'section_title': record.get('section_title', 'SERVICES'),
+        'line_items': line_items,
+        'subtotal': subtotal,
+        'tax_rate': tax_rate,
+        'tax_amount': tax_amount,
+        'total': round(subtotal + tax_amount, 2),
+        'recurring_total': recurring_total,
+        'terms': list(record.get('terms') or []),
+        'notes': notes or DEFAULT_NOTES[invoice_type],
+    }
+
+
+def invoice_filename(invoice_number):
+    """Filesystem-safe PDF name for an invoice number."""
+    safe = re.sub(r'[^A-Za-z0-9._-]+', '_', invoice_number).strip('_')
+    return f"MiamiAlliance3PL_{safe}.pdf"
+
+
+def _bullets(lines):
+    return '<br/>'.join(f"• {html.escape(str(line))}" for line in lines)
+
+
+def _rate_label(item):
+    rate = format_money(item['rate'])
+    return f"{rate}/{item['unit']}" if item['unit'] else rate
+
+
+def _service_label(item):
+    description = item['description']
+    if item['days']:
+        return f"{description}\n({item['quantity']:g} x {float(item['days']):g} days)"
+    return description
+
+
+def _row_height(item):
+    lines = _service_label(item).count('\n') + 1
+    return SERVICES_ROW_PADDING + lines * SERVICES_LINE_HEIGHT
+
+
+def paginate_line_items(line_items, first_page_height, page_height=FRAME_HEIGHT):
+    """
+    Split line items into page-sized chunks in one linear pass.
+
+    Each chunk is sized to fill the space left on its page after the
+    repeated header row and the page subtotal row: `first_page_height` on
+    the first page (below the invoice header), `page_height` afterwards.
+    Returns a list of (start, end) index pairs.
+    """
+    fixed = SERVICES_HEADER_HEIGHT + SERVICES_ROW_PADDING + SERVICES_LINE_HEIGHT + PAGE_SAFETY_MARGIN
+    chunks = []
+    start = 0
+    available = first_page_height - fixed
+    used = 0
+    for index, item in enumerate(line_items):
+        height = _row_height(item)
+        if used + height > available and index > start:
+            chunks.append((start, index))
+            start = index
+            available = page_height - fixed
+            used = 0
+        used += height
+    if start < len(line_items):
+        chunks.append((start, len(line_items)))
+    return chunks
+
+
+def build_styles():
+    """Paragraph styles used by the invoice layout."""
     styles = getSampleStyleSheet()
-    
-    # Custom styles
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        textColor=white,
-        alignment=TA_LEFT,
-        spaceAfter=0
-    )
-    
-    tagline_style = ParagraphStyle(
-        'Tagline',
-        parent=styles['Normal'],
-        fontSize=10,
-        textColor=white,
-        alignment=TA_LEFT
-    )
-    
-    badge_style = ParagraphStyle(
-        'Badge',
-        parent=styles['Normal'],
-        fontSize=12,
-        textColor=white,
-        alignment=TA_CENTER,
-        spaceAfter=10
-    )
-    
+
     normal_style = ParagraphStyle(
         'CustomNormal',
         parent=styles['Normal'],
         fontSize=10,
         textColor=black
     )
-    
+
     small_style = ParagraphStyle(
         'Small',
         parent=styles['Normal'],
         fontSize=8,
         textColor=black
     )
-    
-    # Header with navy background
-    header_data = [
-        [
-            Paragraph('<b>MIAMI ALLIANCE 3PL</b>', title_style),
-            ''
-        ],
-        [
-            Paragraph('WAREHOUSING | FULFILLMENT | LOGISTICS', tagline_style),
-            ''
+
+    return {
+        'title': ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=24,
+            textColor=white,
+            alignment=TA_LEFT,
+            spaceAfter=0
+        ),
+        'tagline': ParagraphStyle(
+            'Tagline',
+            parent=styles['Normal'],
+            fontSize=10,
+            textColor=white,
+            alignment=TA_LEFT
+        ),
+        'badge': ParagraphStyle(
+            'Badge',
+            parent=styles['Normal'],
+            fontSize=12,
+            textColor=white,
+            alignment=TA_CENTER,
+            spaceAfter=10
+        ),
+        'normal': normal_style,
+        'right': ParagraphStyle('RightAlign', parent=normal_style, alignment=TA_RIGHT),
+        'small': small_style,
+        'section': ParagraphStyle(
+            'SectionHeader',
+            parent=styles['Heading2'],
+            fontSize=12,
+            textColor=NAVY_BLUE,
+            borderColor=TEAL_ACCENT,
+            borderWidth=2,
+            borderPadding=5,
+            spaceAfter=10
+        ),
+        'box_title': ParagraphStyle(
+            'BoxTitle',
+            parent=styles['Heading3'],
+            fontSize=11,
+            textColor=NAVY_BLUE,
+            spaceAfter=5
+        ),
+        'footer': ParagraphStyle(
+            'Footer',
+            parent=small_style,
+            alignment=TA_CENTER,
+            textColor=HexColor('#6b7280')
+        ),
+    }
+
+
+INFO_TABLE_STYLE = TableStyle([
+    ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+    ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('LEFTPADDING', (0, 0), (-1, -1), 5),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 5),
+    ('TOPPADDING', (0, 0), (-1, -1), 3),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 3),
+])
+
+SERVICES_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), NAVY_BLUE),
+    ('TEXTCOLOR', (0, 0), (-1, 0), white),
+    ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+    ('TOPPADDING', (0, 0), (-1, 0), 8),
+    ('BACKGROUND', (0, 1), (-1, -1), white),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [white, LIGHT_GRAY]),
+    ('TEXTCOLOR', (0, 1), (-1, -1), black),
+    ('ALIGN', (0, 1), (0, -1), 'LEFT'),
+    ('ALIGN', (1, 1), (-1, -1), 'CENTER'),
+    ('ALIGN', (-1, 1), (-1, -1), 'RIGHT'),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 9),
+    ('TOPPADDING', (0, 1), (-1, -1), 6),
+    ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
+    ('GRID', (0, 0), (-1, -1), 0.5, HexColor('#e5e7eb')),
+])
+
+SUMMARY_BASE_STYLE = [
+    ('BACKGROUND', (0, 0), (-1, 0), NAVY_BLUE),
+    ('TEXTCOLOR', (0, 0), (-1, 0), white),
+    ('ALIGN', (0, 0), (0, 0), 'LEFT'),
+    ('ALIGN', (1, 0), (1, 0), 'RIGHT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('TOPPADDING', (0, 0), (-1, 0), 8),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+    ('BACKGROUND', (0, 1), (-1, -1), LIGHT_GRAY),
+    ('ALIGN', (0, 1), (0, -1), 'LEFT'),
+    ('ALIGN', (1, 1), (1, -1), 'RIGHT'),
+    ('LEFTPADDING', (0, 0), (-1, -1), 10),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 10),
+    ('TOPPADDING', (0, 1), (-1, -1), 5),
+    ('BOTTOMPADDING', (0, 1), (-1, -1), 5),
+]
+
+PAGE_SUBTOTAL_STYLE = TableStyle([
+    ('SPAN', (0, -1), (3, -1)),
+    ('BACKGROUND', (0, -1), (-1, -1), YELLOW_BG),
+    ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+    ('LINEABOVE', (0, -1), (-1, -1), 1, NAVY_BLUE),
+])
+
+POSITIONING_TABLE_STYLE = TableStyle([
+    ('ALIGN', (1, 0), (1, 0), 'RIGHT'),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+])
+
+BOX_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, -1), YELLOW_BG),
+    ('BOX', (0, 0), (-1, -1), 1, HexColor('#d97706')),
+    ('LEFTPADDING', (0, 0), (-1, -1), 15),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 15),
+    ('TOPPADDING', (0, 0), (-1, -1), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+])
+
+
+class InvoiceTemplate:
+    """
+    Compiled invoice layout.
+
+    Styles and the flowables that never change between invoices (header,
+    badges, footer, and terms/notes boxes keyed by their text) are built
+    once and shared by every invoice rendered with this template. Only the
+    customer-specific tables are built per invoice.
+    """
+
+    def __init__(self, logo_path=LOGO_PATH):
+        self.styles = build_styles()
+        self.logo = logo_path.read_bytes() if logo_path and Path(logo_path).exists() else None
+        self.header = self._build_header()
+        self.badges = {
+            invoice_type: self._build_badge(label) for invoice_type, label in BADGE_LABELS.items()
+        }
+        self.footer = self._build_footer()
+        self._boxes = {}
+
+    def _build_header(self):
+        # Header with navy background
+        logo = ''
+        if self.logo:
+            logo = Image(BytesIO(self.logo), width=LOGO_HEIGHT * 0.67, height=LOGO_HEIGHT)
+            logo.hAlign = 'RIGHT'
+
+        header_data = [
+            [
+                Paragraph('<b>MIAMI ALLIANCE 3PL</b>', self.styles['title']),
+                logo
+            ],
+            [
+                Paragraph('WAREHOUSING | FULFILLMENT | LOGISTICS', self.styles['tagline']),
+                ''
+            ]
         ]
-    ]
-    
-    header_table = Table(header_data, colWidths=[5*inch, 2.5*inch])
-    header_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), NAVY_BLUE),
-        ('TEXTCOLOR', (0, 0), (-1, -1), white),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('LEFTPADDING', (0, 0), (-1, -1), 15),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 15),
-        ('TOPPADDING', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-    ]))
-    
-    elements.append(header_table)
-    elements.append(Spacer(1, 0.1*inch))
-    
-    # PRO FORMA INVOICE badge
-    badge_data = [[Paragraph('<b>PRO FORMA INVOICE</b>', badge_style)]]
-    badge_table = Table(badge_data, colWidths=[7.5*inch])
-    badge_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), TEAL_ACCENT),
-        ('TEXTCOLOR', (0, 0), (-1, -1), white),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('TOPPADDING', (0, 0), (-1, -1), 8),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-    ]))
-    
-    elements.append(badge_table)
-    elements.append(Spacer(1, 0.2*inch))
-    
-    # Invoice info and addresses
-    info_data = [
-        [
-            Paragraph(f'<b>Invoice #:</b> {INVOICE_NUM}', normal_style),
-            Paragraph('<b>Bill To:</b>', normal_style)
-        ],
-        [
-            Paragraph(f'<b>Date:</b> {ISSUE_DATE}', normal_style),
-            Paragraph('<b>Global Cellutions</b>', normal_style)
-        ],
-        [
-            Paragraph(f'<b>Valid Through:</b> {VALID_THROUGH}', normal_style),
-            Paragraph('Product: Arcade 1 Up - Mortal Kombat II', normal_style)
-        ],
-        [
-            '',
-            Paragraph('Pallets: 60 | Container Unload', normal_style)
-        ],
-        [
-            Paragraph('<br/><b>From:</b>', normal_style),
-            ''
-        ],
-        [
-            Paragraph('<b>Miami Alliance 3PL</b>', normal_style),
-            ''
-        ],
-        [
-            Paragraph('8780 NW 100th ST', normal_style),
-            ''
-        ],
-        [
-            Paragraph('Medley, FL 33178', normal_style),
-            ''
+
+        header_table = Table(header_data, colWidths=[5*inch, 2.5*inch])
+        header_table.setStyle(TableStyle([
+            ('SPAN', (1, 0), (1, 1)),
+            ('ALIGN', (1, 0), (1, 1), 'RIGHT'),
+            ('BACKGROUND', (0, 0), (-1, -1), NAVY_BLUE),
+            ('TEXTCOLOR', (0, 0), (-1, -1), white),
+            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('LEFTPADDING', (0, 0), (-1, -1), 15),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 15),
+            ('TOPPADDING', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+        ]))
+        return header_table
+
+    def _build_badge(self, label):
+        # Invoice type badge
+        badge_data = [[Paragraph(f'<b>{label}</b>', self.styles['badge'])]]
+        badge_table = Table(badge_data, colWidths=[7.5*inch])
+        badge_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, -1), TEAL_ACCENT),
+            ('TEXTCOLOR', (0, 0), (-1, -1), white),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('TOPPADDING', (0, 0), (-1, -1), 8),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+        ]))
+        return badge_table
+
+    def _build_footer(self):
+        footer_text = """
+        <b>Miami Alliance 3PL</b> | 8780 NW 100th ST, Medley, FL 33178<br/>
+        contact@miamialliance3pl.com | www.miamialliance3pl.com
+        """
+
+        footer_data = [[Paragraph(footer_text, self.styles['footer'])]]
+        footer_table = Table(footer_data, colWidths=[7.5*inch])
+        footer_table.setStyle(TableStyle([
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('TOPPADDING', (0, 0), (-1, -1), 10),
+            ('LINEABOVE', (0, 0), (-1, 0), 1, HexColor('#e5e7eb')),
+        ]))
+        return footer_table
+
+    def box(self, title, lines):
+        """Yellow KEY TERMS / IMPORTANT NOTES box, cached by its text."""
+        key = (title, tuple(str(line) for line in lines))
+        if key not in self._boxes:
+            box_data = [
+                [Paragraph(f'<b>{title}</b>', self.styles['box_title'])],
+                [Paragraph(_bullets(lines), self.styles['small'])],
+            ]
+            box_table = Table(box_data, colWidths=[7.5*inch])
+            box_table.setStyle(BOX_TABLE_STYLE)
+            self._boxes[key] = box_table
+        return self._boxes[key]
+
+    def info_table(self, invoice):
+        """Invoice number/dates and Bill To / From addresses."""
+        normal_style = self.styles['normal']
+        left_lines = [
+            f"<b>Invoice #:</b> {html.escape(invoice['invoice_number'])}",
+            f"<b>Date:</b> {invoice['issue_date']}",
+        ]
+        if invoice['valid_through']:
+            left_lines.append(f"<b>Valid Through:</b> {invoice['valid_through']}")
+        if invoice['due_date']:
+            left_lines.append(f"<b>Due Date:</b> {invoice['due_date']}")
+        if invoice['billing_period_start'] and invoice['billing_period_end']:
+            left_lines.append(f"<b>Billing Period:</b> {invoice['billing_period_start']} – "
+                              f"{invoice['billing_period_end']}")
+
+        right_lines = ['<b>Bill To:</b>', f"<b>{html.escape(invoice['customer_name'])}</b>"]
+        if invoice['customer_email']:
+            right_lines.append(html.escape(invoice['customer_email']))
+        right_lines.extend(html.escape(str(line)) for line in invoice['customer_details'])
+
+        left_lines.extend([
+            '<br/><b>From:</b>',
+            '<b>Miami Alliance 3PL</b>',
+            '8780 NW 100th ST',
+            'Medley, FL 33178',
+        ])
+
+        info_data = []
+        for row in range(max(len(left_lines), len(right_lines))):
+            info_data.append([
+                Paragraph(left_lines[row], normal_style) if row < len(left_lines) else '',
+                Paragraph(right_lines[row], normal_style) if row < len(right_lines) else '',
+            ])
+
+        info_table = Table(info_data, colWidths=[3.75*inch, 3.75*inch])
+        info_table.setStyle(INFO_TABLE_STYLE)
+        return info_table
+
+    @staticmethod
+    def _service_rows(line_items):
+        return [[
+            _service_label(item),
+            f"{item['quantity']:g}",
+            _rate_label(item),
+            item['frequency'],
+            format_money(item['amount']),
+        ] for item in line_items]
+
+    def services_table(self, invoice):
+        services_data = [['Service', 'Qty', 'Rate', 'Frequency', 'Amount']]
+        services_data.extend(self._service_rows(invoice['line_items']))
+
+        services_table = Table(services_data, colWidths=SERVICES_COL_WIDTHS)
+        services_table.setStyle(SERVICES_TABLE_STYLE)
+        return services_table
+
+    def paginated_services(self, invoice, first_page_height):
+        """
+        Services as one LongTable per page, for invoices with many line items.
+
+        Every chunk repeats the header row and closes with a page subtotal
+        and running total, then breaks the page. Row heights are fixed, so
+        layout cost grows linearly with the number of line items.
+        """
+        line_items = invoice['line_items']
+        chunks = paginate_line_items(line_items, first_page_height)
+        elements = []
+        running_total = 0.0
+        for page, (start, end) in enumerate(chunks, 1):
+            chunk = line_items[start:end]
+            page_subtotal = round(sum(item['amount'] for item in chunk), 2)
+            running_total = round(running_total + page_subtotal, 2)
+
+            rows = [['Service', 'Qty', 'Rate', 'Frequency', 'Amount']]
+            rows.extend(self._service_rows(chunk))
+            rows.append([
+                f"Page {page} subtotal (lines {start + 1}–{end} of {len(line_items)}) · "
+                f"running total {format_money(running_total)}",
+                '', '', '', format_money(page_subtotal),
+            ])
+            heights = ([SERVICES_HEADER_HEIGHT] + [_row_height(item) for item in chunk]
+                       + [SERVICES_ROW_PADDING + SERVICES_LINE_HEIGHT])
+
+            table = LongTable(rows, colWidths=SERVICES_COL_WIDTHS, rowHeights=heights, repeatRows=1)
+            table.setStyle(SERVICES_TABLE_STYLE)
+            table.setStyle(PAGE_SUBTOTAL_STYLE)
+            elements.append(table)
+            if page < len(chunks):
+                elements.append(PageBreak())
+        return elements
+
+    def summary_table(self, invoice):
+        """Summary box, right aligned."""
+        summary_data = [
+            ['<b>SUMMARY</b>', ''],
+            ['Subtotal:', format_money(invoice['subtotal'])],
+        ]
+        if invoice['tax_rate']:
+            summary_data.append([f"Tax ({invoice['tax_rate']:g}%):", format_money(invoice['tax_amount'])])
+        total_row = len(summary_data)
+        summary_data.append([f"<b>{TOTAL_LABELS[invoice['invoice_type']]}</b>",
+                             f"<b>{format_money(invoice['total'])}</b>"])
+        ongoing_row = None
+        if invoice['recurring_total'] and invoice['recurring_total'] != invoice['subtotal']:
+            summary_data.append(['', ''])
+            ongoing_row = len(summary_data)
+            summary_data.append(['<b>Ongoing Monthly:</b>', f"{format_money(invoice['recurring_total'])}/mo"])
+
+        # Convert to Paragraphs for better formatting
+        summary_table_data = []
+        for row in summary_data:
+            summary_table_data.append([
+                Paragraph(row[0], self.styles['normal']),
+                Paragraph(row[1], self.styles['right'])
+            ])
+
+        summary_style = SUMMARY_BASE_STYLE + [
+            ('LINEABOVE', (0, total_row), (-1, total_row), 1.5, NAVY_BLUE),
+            ('LINEBELOW', (0, total_row), (-1, total_row), 1.5, NAVY_BLUE),
         ]
-    ]
-    
-    info_table = Table(info_data, colWidths=[3.75*inch, 3.75*inch])
-    info_table.setStyle(TableStyle([
-        ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-        ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ('LEFTPADDING', (0, 0), (-1, -1), 5),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 5),
-        ('TOPPADDING', (0, 0), (-1, -1), 3),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 3),
-    ]))
-    
-    elements.append(info_table)
-    elements.append(Spacer(1, 0.3*inch))
-    
-    # Services section header
-    section_header = Paragraph('<b>STORAGE &amp; RECEIVING SERVICES</b>', 
-                               ParagraphStyle('SectionHeader', 
-                                            parent=styles['Heading2'],
-                                            fontSize=12,
-                                            textColor=NAVY_BLUE,
-                                            borderColor=TEAL_ACCENT,
-                                            borderWidth=2,
-                                            borderPadding=5,
-                                            spaceAfter=10))
-    elements.append(section_header)
-    elements.append(Spacer(1, 0.1*inch))
-    
-    # Services table
-    services_data = [
-        ['Service', 'Qty', 'Rate', 'Frequency', 'Amount'],
-        ['Pallet Storage\n(60 pallets x 30 days)', '60', '$0.75/pallet/day', 'Monthly', '$1,350.00'],
-        ['Container Receiving &amp; Unload', '1', '$350.00', 'One-time', '$350.00']
-    ]
-    
-    services_table = Table(services_data, colWidths=[2.5*inch, 0.6*inch, 1.2*inch, 1*inch, 1*inch])
-    services_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), NAVY_BLUE),
-        ('TEXTCOLOR', (0, 0), (-1, 0), white),
-        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-        ('TOPPADDING', (0, 0), (-1, 0), 8),
-        ('BACKGROUND', (0, 1), (-1, -1), white),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [white, LIGHT_GRAY]),
-        ('TEXTCOLOR', (0, 1), (-1, -1), black),
-        ('ALIGN', (0, 1), (0, -1), 'LEFT'),
-        ('ALIGN', (1, 1), (-1, -1), 'CENTER'),
-        ('ALIGN', (-1, 1), (-1, -1), 'RIGHT'),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 9),
-        ('TOPPADDING', (0, 1), (-1, -1), 6),
-        ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
-        ('GRID', (0, 0), (-1, -1), 0.5, HexColor('#e5e7eb')),
-    ]))
-    
-    elements.append(services_table)
-    elements.append(Spacer(1, 0.2*inch))
-    
-    # Summary box (right aligned)
-    summary_data = [
-        ['<b>SUMMARY</b>', ''],
-        ['Monthly Storage (60 pallets):', '$1,350.00'],
-        ['One-time Receiving:', '$350.00'],
-        ['<b>FIRST MONTH TOTAL:</b>', '<b>$1,700.00</b>'],
-        ['', ''],
-        ['<b>Ongoing Monthly:</b>', ''],
-        ['Storage (60 pallets/day):', '$1,350.00/mo'],
-        ['Daily rate:', '$45.00/day']
-    ]
-    
-    # Convert to Paragraphs for better formatting
-    summary_table_data = []
-    for row in summary_data:
-        summary_table_data.append([
-            Paragraph(row[0], normal_style),
-            Paragraph(row[1], ParagraphStyle('RightAlign', parent=normal_style, alignment=TA_RIGHT))
+        if ongoing_row is not None:
+            summary_style.append(('LINEABOVE', (0, ongoing_row), (-1, ongoing_row), 1, HexColor('#9ca3af')))
+
+        summary_table = Table(summary_table_data, colWidths=[2.5*inch, 1.2*inch])
+        summary_table.setStyle(TableStyle(summary_style))
+
+        # Create a table to position summary on right
+        positioning_table = Table([['', summary_table]], colWidths=[4*inch, 3.7*inch])
+        positioning_table.setStyle(POSITIONING_TABLE_STYLE)
+        return positioning_table
+
+    def flowables(self, invoice):
+        """
+        Flowables for one normalized invoice.
+
+        Shared flowables are handed out as shallow copies: platypus records
+        per-document layout state (e.g. `_postponed`) on the flowable itself,
+        while the parsed paragraphs inside can be reused safely.
+        """
+        elements = [
+            copy.copy(self.header),
+            Spacer(1, 0.1*inch),
+            copy.copy(self.badges[invoice['invoice_type']]),
+            Spacer(1, 0.2*inch),
+            self.info_table(invoice),
+            Spacer(1, 0.3*inch),
+            Paragraph(f"<b>{html.escape(invoice['section_title'])}</b>", self.styles['section']),
+            Spacer(1, 0.1*inch),
+        ]
+
+        if len(invoice['line_items']) > PAGINATE_ABOVE_LINES:
+            elements.extend(self.paginated_services(invoice, FRAME_HEIGHT - _stack_height(elements)))
+        else:
+            elements.append(self.services_table(invoice))
+
+        elements.extend([
+            Spacer(1, 0.2*inch),
+            self.summary_table(invoice),
+            Spacer(1, 0.3*inch),
         ])
-    
-    summary_table = Table(summary_table_data, colWidths=[2.5*inch, 1.2*inch])
-    summary_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), NAVY_BLUE),
-        ('TEXTCOLOR', (0, 0), (-1, 0), white),
-        ('ALIGN', (0, 0), (0, 0), 'LEFT'),
-        ('ALIGN', (1, 0), (1, 0), 'RIGHT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 10),
-        ('TOPPADDING', (0, 0), (-1, 0), 8),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-        ('BACKGROUND', (0, 1), (-1, -1), LIGHT_GRAY),
-        ('ALIGN', (0, 1), (0, -1), 'LEFT'),
-        ('ALIGN', (1, 1), (1, -1), 'RIGHT'),
-        ('LEFTPADDING', (0, 0), (-1, -1), 10),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 10),
-        ('TOPPADDING', (0, 1), (-1, -1), 5),
-        ('BOTTOMPADDING', (0, 1), (-1, -1), 5),
-        ('LINEABOVE', (0, 3), (-1, 3), 1.5, NAVY_BLUE),
-        ('LINEBELOW', (0, 3), (-1, 3), 1.5, NAVY_BLUE),
-        ('LINEABOVE', (0, 5), (-1, 5), 1, HexColor('#9ca3af')),
-    ]))
-    
-    # Create a table to position summary on right
-    positioning_data = [['', summary_table]]
-    positioning_table = Table(positioning_data, colWidths=[4*inch, 3.7*inch])
-    positioning_table.setStyle(TableStyle([
-        ('ALIGN', (1, 0), (1, 0), 'RIGHT'),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-    ]))
-    
-    elements.append(positioning_table)
-    elements.append(Spacer(1, 0.3*inch))
-    
-    # KEY TERMS box
-    terms_title = Paragraph('<b>KEY TERMS</b>', 
-                           ParagraphStyle('TermsTitle', 
-                                        parent=styles['Heading3'],
-                                        fontSize=11,
-                                        textColor=NAVY_BLUE,
-                                        spaceAfter=5))
-    
-    terms_text = """
-    • Storage: $0.75/pallet/day (60 pallets)<br/>
-    • Container receiving: $350 flat fee (one-time)<br/>
-    • Billing: Storage billed monthly<br/>
-    • Minimum commitment: None
+
+        if invoice['terms']:
+            elements.append(copy.copy(self.box('KEY TERMS', invoice['terms'])))
+            elements.append(Spacer(1, 0.15*inch))
+
+        elements.append(copy.copy(self.box('IMPORTANT NOTES', invoice['notes'])))
+        elements.append(Spacer(1, 0.3*inch))
+        elements.append(copy.copy(self.footer))
+        return elements
+
+    def render(self, invoice, target):
+        """
+        Lay out a normalized invoice into `target`. Returns the page count.
+
+        `target` is a path or any binary file-like object (BytesIO, an
+        archive member, an upload stream); file-likes are written to and
+        left open.
+        """
+        pdf = SimpleDocTemplate(
+            target if hasattr(target, 'write') else str(target),
+            pagesize=letter,
+            rightMargin=PAGE_MARGIN,
+            leftMargin=PAGE_MARGIN,
+            topMargin=PAGE_MARGIN,
+            bottomMargin=PAGE_MARGIN
+        )
+        pdf.build(self.flowables(invoice))
+        return pdf.page
+
+
+def _stack_height(flowables):
+    """Vertical space a run of flowables takes at the top of a page."""
+    height = 0
+    for flowable in flowables:
+        height += flowable.wrap(FRAME_WIDTH, FRAME_HEIGHT)[1]
+        height += flowable.getSpaceBefore() + flowable.getSpaceAfter()
+    return height
+
+
+_template = None
+
+
+def get_template():
+    """The process-wide InvoiceTemplate, built on first use."""
+    global _template
+    if _template is None:
+        _template = InvoiceTemplate()
+    return _template
+
+
+def create_invoice(record, output_dir=DEFAULT_OUTPUT_DIR, pricing=None):
+    """Generate the invoice PDF for one record. Returns (output_path, invoice_number)."""
+    invoice = build_invoice_model(record, pricing)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    output_path = output_dir / invoice_filename(invoice['invoice_number'])
+
+    get_template().render(invoice, output_path)
+
+    return output_path, invoice['invoice_number']
+
+
+def render_invoice_bytes(record, pricing=None):
+    """Render one record in memory. Returns (pdf_bytes, invoice_number, pages)."""
+    invoice = build_invoice_model(record, pricing)
+    buffer = BytesIO()
+    pages = get_template().render(invoice, buffer)
+    return buffer.getvalue(), invoice['invoice_number'], pages
+
+
+def render_invoices(records, output_dir=DEFAULT_OUTPUT_DIR, pricing=None):
+    """Render every record. Returns a list of (output_path, invoice_number, error)."""
+    results = []
+    for record in records:
+        try:
+            output_path, invoice_number = create_invoice(record, output_dir, pricing)
+            results.append((output_path, invoice_number, None))
+        except Exception as exc:
+            label = record.get('invoice_number') or record.get('id', '?')
+            results.append((None, label, exc))
+    return results
+
+
+# ─── ARCHIVES ────────────────────────────────────────────────────────────────
+
+ARCHIVE_FORMATS = {'.zip': 'zip', '.tar': 'tar', '.tgz': 'tar.gz', '.gz': 'tar.gz'}
+
+
+class InvoiceArchive:
+    """
+    A zip or tar archive that rendered invoices are streamed into.
+
+    Members are written straight from memory, so a batch produces one
+    archive file in a single sequential write pass and no per-invoice
+    files. The format follows the target's suffix (.zip, .tar, .tar.gz /
+    .tgz) unless `fmt` is given; `target` may also be an open binary file.
+    PDF streams are already compressed, so zip members are stored as-is.
+    """
+
+    def __init__(self, target, fmt=None):
+        if fmt is None:
+            fmt = ARCHIVE_FORMATS.get(Path(str(getattr(target, 'name', target))).suffix.lower())
+        if fmt not in ('zip', 'tar', 'tar.gz'):
+            raise ValueError(f"Unsupported archive format for {target!r} (use .zip, .tar or .tar.gz)")
+        self.fmt = fmt
+        self.target = target
+        self.members = 0
+        self.bytes = 0
+        if fmt == 'zip':
+            self._archive = zipfile.ZipFile(target, 'w', compression=zipfile.ZIP_STORED)
+        else:
+            mode = 'w:gz' if fmt == 'tar.gz' else 'w'
+            if hasattr(target, 'write'):
+                self._archive = tarfile.open(fileobj=target, mode=mode)
+            else:
+                self._archive = tarfile.open(target, mode=mode)
+
+    def add(self, name, data):
+        """Append one member from bytes."""
+        if self.fmt == 'zip':
+            info = zipfile.ZipInfo(name, date_time=datetime.now().timetuple()[:6])
+            info.compress_type = zipfile.ZIP_STORED
+            self._archive.writestr(info, data)
+        else:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = int(time.time())
+            self._archive.addfile(info, BytesIO(data))
+        self.members += 1
+        self.bytes += len(data)
+
+    def close(self):
+        self._archive.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def render_invoices_to_archive(records, archive, pricing=None):
+    """Render every record into `archive`. Returns a list of (member_name, invoice_number, error)."""
+    results = []
+    for record in records:
+        try:
+            data, invoice_number, _ = render_invoice_bytes(record, pricing)
+            name = invoice_filename(invoice_number)
+            archive.add(name, data)
+            results.append((name, invoice_number, None))
+        except Exception as exc:
+            label = record.get('invoice_number') or record.get('id', '?')
+            results.append((None, label, exc))
+    return results
+
+
+# ─── INVOICE NUMBERING ───────────────────────────────────────────────────────
+
+def invoice_series(invoice_type, issue_date):
     """
-    
-    terms_para = Paragraph(terms_text, small_style)
-    
-    terms_data = [[terms_title], [terms_para]]
-    terms_table = Table(terms_data, colWidths=[7.5*inch])
-    terms_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), YELLOW_BG),
-        ('BOX', (0, 0), (-1, -1), 1, HexColor('#d97706')),
-        ('LEFTPADDING', (0, 0), (-1, -1), 15),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 15),
-        ('TOPPADDING', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-    ]))
-    
-    elements.append(terms_table)
-    elements.append(Spacer(1, 0.15*inch))
-    
-    # IMPORTANT NOTES box
-    notes_title = Paragraph('<b>IMPORTANT NOTES</b>', 
-                           ParagraphStyle('NotesTitle', 
-                                        parent=styles['Heading3'],
-                                        fontSize=11,
-                                        textColor=NAVY_BLUE,
-                                        spaceAfter=5))
-    
-    notes_text = """
-    • This pro forma invoice is an estimate. Final billing is based on actual services rendered.<br/>
-    • Storage billed at $0.75/pallet/day ongoing. No intake or wrapping fees included.<br/>
-    • All prices are in USD. Payment terms: Net 15. This quote is valid for 30 days from issue date.
+    Sequence series an invoice number belongs to.
+
+    Pro formas keep the MA3PL-PF-YYYYMMDD format and invoices the
+    INV-YYYY-MM format already used in Firestore. A new series counts from 1,
+    or from above the highest number already issued in it.
     """
-    
-    notes_para = Paragraph(notes_text, small_style)
-    
-    notes_data = [[notes_title], [notes_para]]
-    notes_table = Table(notes_data, colWidths=[7.5*inch])
-    notes_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), YELLOW_BG),
-        ('BOX', (0, 0), (-1, -1), 1, HexColor('#d97706')),
-        ('LEFTPADDING', (0, 0), (-1, -1), 15),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 15),
-        ('TOPPADDING', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-    ]))
-    
-    elements.append(notes_table)
-    elements.append(Spacer(1, 0.3*inch))
-    
-    # Footer
-    footer_text = """
-    <b>Miami Alliance 3PL</b> | 8780 NW 100th ST, Medley, FL 33178<br/>
-    contact@miamialliance3pl.com | www.miamialliance3pl.com
+    if invoice_type == 'proforma':
+        return f"MA3PL-PF-{issue_date:%Y%m%d}"
+    return f"INV-{issue_date:%Y-%m}"
+
+
+def format_invoice_number(series, sequence):
+    return f"{series}-{sequence:0{INVOICE_SEQUENCE_WIDTH}d}"
+
+
+def invoice_sequence(invoice_number, series):
+    """Sequence part of `invoice_number` if it belongs to `series`, else None."""
+    prefix = f"{series}-"
+    if not invoice_number or not invoice_number.startswith(prefix):
+        return None
+    sequence = invoice_number[len(prefix):]
+    return int(sequence) if sequence.isdigit() else None
+
+
+class LocalSequenceStore:
     """
-    
-    footer_para = Paragraph(footer_text, 
-                           ParagraphStyle('Footer', 
-                                        parent=small_style,
-                                        alignment=TA_CENTER,
-                                        textColor=HexColor('#6b7280')))
-    
-    footer_data = [[footer_para]]
-    footer_table = Table(footer_data, colWidths=[7.5*inch])
-    footer_table.setStyle(TableStyle([
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('TOPPADDING', (0, 0), (-1, -1), 10),
-        ('LINEABOVE', (0, 0), (-1, 0), 1, HexColor('#e5e7eb')),
-    ]))
-    
-    elements.append(footer_table)
-    
-    # Build PDF
-    pdf.build(elements)
-    
-    return output_path, INVOICE_NUM
+    Sequence counters in a local JSON file, for runs without Firestore.
+
+    Every reservation is a read-modify-write under an exclusive file lock,
+    so concurrent local runs never hand out the same number.
+    """
+
+    def __init__(self, path=DEFAULT_SEQUENCE_FILE):
+        self.path = Path(path)
+
+    def _update(self, mutate):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a+', encoding='utf-8') as handle:
+            if fcntl:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+            handle.seek(0)
+            raw = handle.read()
+            data = json.loads(raw) if raw.strip() else {}
+            result = mutate(data)
+            handle.seek(0)
+            handle.truncate()
+            json.dump(data, handle, indent=2)
+            handle.flush()
+            os.fsync(handle.fileno())
+        return result
+
+    def reserve(self, series, count, issued=0):
+        def mutate(data):
+            counter = data.setdefault(series, {'next': 1, 'gaps': []})
+            start = max(counter['next'], issued + 1)
+            counter['next'] = start + count
+            counter['updated_at'] = datetime.now().isoformat()
+            return start
+        return self._update(mutate)
+
+    def record_gap(self, series, start, end, reason):
+        def mutate(data):
+            counter = data.setdefault(series, {'next': 1, 'gaps': []})
+            counter.setdefault('gaps', []).append({
+                'start': start, 'end': end, 'reason': reason,
+                'recorded_at': datetime.now().isoformat(),
+            })
+        self._update(mutate)
+
+    def gaps(self, series):
+        if not self.path.exists():
+            return []
+        data = json.loads(self.path.read_text(encoding='utf-8') or '{}')
+        return data.get(series, {}).get('gaps', [])
+
+
+class FirestoreSequenceStore:
+    """Sequence counters in Firestore `counters/{series}`, shared with create_client_requests.js."""
+
+    def __init__(self, db):
+        from firebase_admin import firestore
+        self.db = db
+        self.firestore = firestore
+
+    def _highest_issued(self, series, transaction):
+        """Highest number already on an invoice in `series` (0 if none)."""
+        query = (self.db.collection('invoices')
+                 .where('invoice_number', '>=', f"{series}-")
+                 .where('invoice_number', '<', f"{series}."))
+        sequences = (invoice_sequence((doc.to_dict() or {}).get('invoice_number'), series)
+                     for doc in transaction.get(query))
+        return max((sequence for sequence in sequences if sequence), default=0)
+
+    def reserve(self, series, count, issued=0):
+        ref = self.db.collection(SEQUENCE_COLLECTION).document(series)
+
+        @self.firestore.transactional
+        def reserve_block(transaction):
+            snapshot = ref.get(transaction=transaction)
+            if snapshot.exists:
+                start = (snapshot.to_dict() or {}).get('next', 1)
+            else:
+                # Seed a new counter above the randomly numbered invoices
+                # issued in this series before counters existed
+                start = self._highest_issued(series, transaction) + 1
+            start = max(start, issued + 1)
+            transaction.set(ref, {
+                'next': start + count,
+                'updated_at': datetime.now().isoformat(),
+            }, merge=True)
+            return start
+
+        return reserve_block(self.db.transaction())
+
+    def record_gap(self, series, start, end, reason):
+        ref = self.db.collection(SEQUENCE_COLLECTION).document(series)
+        ref.set({'gaps': self.firestore.ArrayUnion([{
+            'start': start, 'end': end, 'reason': reason,
+            'recorded_at': datetime.now().isoformat(),
+        }])}, merge=True)
+
+    def gaps(self, series):
+        snapshot = self.db.collection(SEQUENCE_COLLECTION).document(series).get()
+        return (snapshot.to_dict() or {}).get('gaps', []) if snapshot.exists else []
+
+
+class InvoiceNumberAllocator:
+    """
+    Allocates invoice numbers in blocks.
+
+    A block of any size costs one store transaction, so numbering a batch
+    of 500 invoices touches the shared counter once per series instead of
+    500 times. Numbers that are handed out but never used on a rendered
+    invoice can be released; they are recorded as gaps rather than reused,
+    keeping the sequence unique and every hole explained.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.reserved = {}
+
+    def allocate(self, series, count, issued=0):
+        """
+        Reserve `count` consecutive numbers in `series` with one transaction,
+        all above `issued` (the highest number already known to be in use).
+        """
+        if count <= 0:
+            return []
+        start = self.store.reserve(series, count, issued)
+        self.reserved.setdefault(series, []).append((start, start + count - 1))
+        return [format_invoice_number(series, start + offset) for offset in range(count)]
+
+    def release(self, invoice_numbers, reason='not rendered'):
+        """Record allocated-but-unused numbers as gaps, one entry per consecutive run."""
+        by_series = {}
+        for invoice_number in invoice_numbers:
+            series, _, sequence = invoice_number.rpartition('-')
+            by_series.setdefault(series, []).append(int(sequence))
+
+        for series, sequences in by_series.items():
+            sequences.sort()
+            run_start = previous = sequences[0]
+            for sequence in sequences[1:] + [None]:
+                if sequence is not None and sequence == previous + 1:
+                    previous = sequence
+                    continue
+                self.store.record_gap(series, run_start, previous, reason)
+                if sequence is not None:
+                    run_start = previous = sequence
+
+
+def assign_invoice_numbers(records, allocator):
+    """
+    Give every record without an invoice_number the next number in its series.
+
+    Records are grouped by series and each group is allocated as one block,
+    above any number the records already carry in that series.
+    Returns {record index: invoice_number} for the records that were numbered.
+    """
+    pending = {}
+    for index, record in enumerate(records):
+        if record.get('invoice_number'):
+            continue
+        issue_date = record.get('issue_date') or record.get('created_at') or date.today()
+        if isinstance(issue_date, str):
+            issue_date = datetime.fromisoformat(issue_date.replace('Z', '+00:00'))
+        series = invoice_series(record.get('invoice_type', 'invoice'), issue_date)
+        pending.setdefault(series, []).append(index)
+
+    assigned = {}
+    for series, indexes in pending.items():
+        issued = max((invoice_sequence(record.get('invoice_number'), series) or 0
+                      for record in records), default=0)
+        numbers = allocator.allocate(series, len(indexes), issued)
+        for index, invoice_number in zip(indexes, numbers):
+            records[index]['invoice_number'] = invoice_number
+            assigned[index] = invoice_number
+    return assigned
+
+
+def save_assigned_numbers_firestore(db, records, assigned):
+    """Persist newly assigned numbers on their Firestore invoices in batched writes."""
+    indexes = [index for index in assigned if records[index].get('id')]
+    for offset in range(0, len(indexes), FIRESTORE_BATCH_LIMIT):
+        batch = db.batch()
+        for index in indexes[offset:offset + FIRESTORE_BATCH_LIMIT]:
+            ref = db.collection('invoices').document(records[index]['id'])
+            batch.update(ref, {'invoice_number': assigned[index]})
+        batch.commit()
+
+
+def save_assigned_numbers_json(path, assigned):
+    """
+    Write newly assigned numbers back into the input JSON file, so a rerun
+    renders the same invoices under the same numbers instead of new ones.
+    `assigned` maps record index (as returned by load_invoices_json) to number.
+    """
+    path = Path(path)
+    data = json.loads(path.read_text(encoding='utf-8'))
+    if isinstance(data, list):
+        targets = data
+    elif 'invoices' in data:
+        targets = data['invoices']
+    else:
+        targets = [data]
+    for index, invoice_number in assigned.items():
+        targets[index]['invoice_number'] = invoice_number
+
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding='utf-8')
+    os.replace(tmp_path, path)
+
+
+# ─── BATCH RENDERING ─────────────────────────────────────────────────────────
+
+_worker_config = {}
+
+
+def _init_render_worker(output_dir, pricing, max_memory_mb, in_memory=False):
+    """Pool initializer: cap the worker's memory, then compile the template once."""
+    if max_memory_mb:
+        try:
+            import resource
+            limit = max_memory_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ImportError, ValueError, OSError):
+            pass  # No RLIMIT_AS on this platform; worker recycling still bounds growth
+    _worker_config['output_dir'] = Path(output_dir) if output_dir else None
+    _worker_config['pricing'] = pricing
+    _worker_config['in_memory'] = in_memory
+    get_template()
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (None where unsupported)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _render_batch_task(record):
+    """Render one record inside a pool worker and report timing."""
+    started = time.perf_counter()
+    result = {
+        'invoice_number': record.get('invoice_number') or record.get('id', '?'),
+        'path': None,
+        'pages': 0,
+        'bytes': 0,
+        'error': None,
+    }
+    try:
+        invoice = build_invoice_model(record, _worker_config['pricing'])
+        name = invoice_filename(invoice['invoice_number'])
+        if _worker_config['in_memory']:
+            buffer = BytesIO()
+            result['pages'] = get_template().render(invoice, buffer)
+            result['data'] = buffer.getvalue()
+            result['path'] = name
+            result['bytes'] = len(result['data'])
+        else:
+            output_path = _worker_config['output_dir'] / name
+            result['pages'] = get_template().render(invoice, output_path)
+            result['path'] = str(output_path)
+            result['bytes'] = output_path.stat().st_size
+    except MemoryError:
+        result['error'] = 'MemoryError: worker memory cap exceeded'
+    except Exception as exc:
+        result['error'] = f"{type(exc).__name__}: {exc}"
+    result['seconds'] = time.perf_counter() - started
+    result['rss_mb'] = peak_rss_mb()
+    return result
+
+
+def render_batch(records, output_dir=DEFAULT_OUTPUT_DIR, pricing=None, jobs=None,
+                 max_memory_mb=DEFAULT_MAX_MEMORY_MB, tasks_per_worker=DEFAULT_TASKS_PER_WORKER,
+                 on_result=None, archive=None):
+    """
+    Render records in parallel across a process pool.
+
+    Each worker compiles one InvoiceTemplate (styles, logo, static
+    flowables) in its initializer and reuses it, is capped at
+    `max_memory_mb` of address space, and is replaced after
+    `tasks_per_worker` invoices. Returns (results, wall_seconds); results
+    arrive in completion order and are also passed to `on_result`.
+
+    With an InvoiceArchive, workers render into memory and send the PDF
+    bytes back; this process appends them to the archive as they arrive
+    and nothing is written to `output_dir`.
+    """
+    if archive is None:
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+    jobs = max(1, jobs or os.cpu_count() or 1)
+    chunksize = max(1, min(16, len(records) // (jobs * 4)))
+
+    started = time.perf_counter()
+    results = []
+    with Pool(processes=jobs, initializer=_init_render_worker,
+              initargs=(None if archive else str(output_dir), pricing, max_memory_mb,
+                        archive is not None),
+              maxtasksperchild=tasks_per_worker or None) as pool:
+        for result in pool.imap_unordered(_render_batch_task, records, chunksize=chunksize):
+            data = result.pop('data', None)
+            if data is not None:
+                archive.add(result['path'], data)
+            results.append(result)
+            if on_result:
+                on_result(result)
+    return results, time.perf_counter() - started
+
+
+def summarize_batch(results, wall_seconds):
+    """Aggregate timing, throughput and size figures for a batch run."""
+    rendered = [result for result in results if not result['error']]
+    timings = sorted(result['seconds'] for result in rendered)
+    pages = sum(result['pages'] for result in rendered)
+    rss = [result['rss_mb'] for result in results if result.get('rss_mb')]
+    return {
+        'invoices': len(rendered),
+        'failed': len(results) - len(rendered),
+        'pages': pages,
+        'bytes': sum(result['bytes'] for result in rendered),
+        'wall_seconds': wall_seconds,
+        'invoices_per_second': len(rendered) / wall_seconds if wall_seconds else 0.0,
+        'pages_per_second': pages / wall_seconds if wall_seconds else 0.0,
+        'mean_ms': 1000 * sum(timings) / len(timings) if timings else 0.0,
+        'p95_ms': 1000 * timings[int(0.95 * (len(timings) - 1))] if timings else 0.0,
+        'peak_worker_rss_mb': max(rss) if rss else None,
+    }
+
+
+# ─── INVOICE SOURCES ─────────────────────────────────────────────────────────
+
+def load_invoices_json(path):
+    """
+    Load invoice records from a JSON file.
+
+    Accepts a single invoice object, a list of invoices, or
+    {"invoices": [...], "pricing": {...}}. Returns (records, pricing).
+    """
+    data = json.loads(Path(path).read_text(encoding='utf-8'))
+    if isinstance(data, list):
+        return data, None
+    if 'invoices' in data:
+        return data['invoices'], data.get('pricing')
+    return [data], None
+
+
+def get_firestore_db():
+    """Firestore client from admin/config.py (imported lazily; needs firebase-admin)."""
+    from admin.config import get_db
+    return get_db()
+
+
+def load_pricing_firestore(db):
+    """Read settings/pricing, the same document update_pricing.py maintains."""
+    doc = db.collection('settings').document('pricing').get()
+    return doc.to_dict() if doc.exists else None
+
+
+def load_invoices_firestore(db, invoice_id=None, status=None):
+    """Load invoice documents from the `invoices` collection."""
+    collection = db.collection('invoices')
+    if invoice_id:
+        doc = collection.document(invoice_id).get()
+        if not doc.exists:
+            raise ValueError(f"Invoice {invoice_id} not found")
+        docs = [doc]
+    else:
+        query = collection.where('status', '==', status) if status else collection
+        docs = query.stream()
+
+    records = []
+    for doc in docs:
+        record = doc.to_dict()
+        record['id'] = doc.id
+        records.append(record)
+    return records
+
+
+def load_records(args):
+    """Resolve (records, pricing, db) from CLI arguments; db is None for JSON input."""
+    pricing = None
+    db = None
+    if args.firestore:
+        db = get_firestore_db()
+        if not db:
+            raise RuntimeError("Firestore is not configured (see admin/config.py)")
+        records = load_invoices_firestore(db, args.invoice_id, args.status)
+        pricing = load_pricing_firestore(db)
+    else:
+        records, pricing = load_invoices_json(args.input)
+
+    if args.pricing:
+        pricing = json.loads(Path(args.pricing).read_text(encoding='utf-8'))
+    return records, pricing, db
+
+
+def add_source_arguments(parser):
+    """Input options shared by the rendering commands."""
+    parser.add_argument('input', nargs='?', help='JSON file with one invoice or a list of invoices')
+    parser.add_argument('--firestore', action='store_true', help='Read invoices from Firestore')
+    parser.add_argument('--invoice-id', help='Firestore invoice document ID')
+    parser.add_argument('--status', help='Only Firestore invoices with this status (e.g. draft)')
+    parser.add_argument('--pricing', help='JSON export of settings/pricing (overrides other pricing)')
+    parser.add_argument('--output-dir', default=str(DEFAULT_OUTPUT_DIR),
+                        help=f'Directory for generated PDFs (default: {DEFAULT_OUTPUT_DIR})')
+    parser.add_argument('--archive', metavar='PATH',
+                        help='Write all PDFs into one .zip, .tar or .tar.gz instead of --output-dir')
+    parser.add_argument('--assign-numbers', action='store_true',
+                        help='Allocate sequential numbers for invoices without an invoice_number')
+    parser.add_argument('--sequence-file', default=str(DEFAULT_SEQUENCE_FILE),
+                        help='Local sequence counters used for JSON input (Firestore input uses counters/)')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Miami Alliance 3PL invoice PDF generator')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    render = commands.add_parser('render', help='Render invoices one after another')
+    add_source_arguments(render)
+
+    batch = commands.add_parser('render-batch', help='Render invoices in parallel with a process pool')
+    add_source_arguments(batch)
+    batch.add_argument('--jobs', type=int, default=os.cpu_count(),
+                       help='Worker processes (default: CPU count)')
+    batch.add_argument('--max-memory-mb', type=int, default=DEFAULT_MAX_MEMORY_MB,
+                       help=f'Address-space cap per worker, 0 to disable (default: {DEFAULT_MAX_MEMORY_MB})')
+    batch.add_argument('--tasks-per-worker', type=int, default=DEFAULT_TASKS_PER_WORKER,
+                       help=f'Recycle a worker after this many invoices (default: {DEFAULT_TASKS_PER_WORKER})')
+
+    args = parser.parse_args(argv)
+    if not args.firestore and not args.input:
+        parser.error('provide an invoice JSON file or --firestore')
+    return args
+
+
+def print_batch_result(result):
+    if result['error']:
+        print(f"✗ {result['invoice_number']}: {result['error']}", file=sys.stderr)
+        return
+    rss = f" | rss {result['rss_mb']:.0f} MB" if result.get('rss_mb') else ''
+    print(f"✓ {result['invoice_number']}: {result['pages']} pages, "
+          f"{result['bytes'] / 1024:.1f} KB in {result['seconds'] * 1000:.0f} ms{rss}")
+
+
+def print_batch_summary(summary, jobs):
+    print("\n" + "=" * 60)
+    print(f"Rendered {summary['invoices']} invoices ({summary['failed']} failed) "
+          f"with {jobs} workers in {summary['wall_seconds']:.2f}s")
+    print(f"  Throughput:   {summary['invoices_per_second']:.1f} invoices/s, "
+          f"{summary['pages_per_second']:.1f} pages/s")
+    print(f"  Per invoice:  mean {summary['mean_ms']:.0f} ms, p95 {summary['p95_ms']:.0f} ms")
+    print(f"  Output:       {summary['pages']} pages, {summary['bytes'] / (1024 * 1024):.2f} MB")
+    if summary['peak_worker_rss_mb']:
+        print(f"  Peak worker RSS: {summary['peak_worker_rss_mb']:.0f} MB")
+
+
+def number_records(args, records, db):
+    """
+    Allocate numbers for unnumbered records and save them on the invoices.
+    Returns (allocator, assigned). If they cannot be saved the numbers are
+    recorded as sequence gaps before the error propagates.
+    """
+    store = FirestoreSequenceStore(db) if db else LocalSequenceStore(args.sequence_file)
+    allocator = InvoiceNumberAllocator(store)
+    assigned = assign_invoice_numbers(records, allocator)
+    if not assigned:
+        return allocator, assigned
+    print(f"Assigned {len(assigned)} invoice numbers "
+          f"({len(allocator.reserved)} series, one transaction each)")
+    try:
+        if db:
+            save_assigned_numbers_firestore(db, records, assigned)
+        else:
+            save_assigned_numbers_json(args.input, assigned)
+            print(f"Saved the new numbers to {args.input}")
+    except Exception:
+        allocator.release(list(assigned.values()), reason='not saved')
+        raise
+    return allocator, assigned
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    records, pricing, db = load_records(args)
+    if not records:
+        print("No invoices found.")
+        return 0
+
+    if args.assign_numbers:
+        number_records(args, records, db)
+
+    archive = InvoiceArchive(args.archive) if args.archive else None
+    destination = args.archive or args.output_dir
+    try:
+        if args.command == 'render-batch':
+            results, wall_seconds = render_batch(
+                records, args.output_dir, pricing,
+                jobs=args.jobs,
+                max_memory_mb=args.max_memory_mb,
+                tasks_per_worker=args.tasks_per_worker,
+                on_result=print_batch_result,
+                archive=archive,
+            )
+            summary = summarize_batch(results, wall_seconds)
+            print_batch_summary(summary, args.jobs)
+            failed_numbers = {result['invoice_number'] for result in results if result['error']}
+        else:
+            if archive:
+                results = render_invoices_to_archive(records, archive, pricing)
+            else:
+                results = render_invoices(records, args.output_dir, pricing)
+            failed_numbers = set()
+            for output_path, invoice_num, error in results:
+                if error:
+                    failed_numbers.add(invoice_num)
+                    print(f"✗ {invoice_num}: {error}", file=sys.stderr)
+                else:
+                    print(f"✓ {invoice_num} -> {output_path}")
+            print(f"\nGenerated {len(records) - len(failed_numbers)} of {len(records)} invoices "
+                  f"in {destination}")
+    finally:
+        if archive:
+            archive.close()
+
+    # Numbers of invoices that failed stay saved on them and are reused on the retry
+    return 1 if failed_numbers else 0
+
 
 if __name__ == "__main__":
-    output_path, invoice_num = create_invoice()
-    print(f"✓ Invoice generated successfully!")
-    print(f"  Invoice #: {invoice_num}")
-    print(f"  Location: {output_path}")
-    print(f"\nFirst month total: $1,700.00")
-    print(f"Ongoing monthly: $1,350.00")
+    sys.exit(main())
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""Unit tests for generate_storage_invoice.py."""
+
+import json
+import tarfile
+import tempfile
+import unittest
+import zipfile
+from io import BytesIO
+from pathlib import Path
+
+import generate_storage_invoice as invoices
+
+SAMPLE_PATH = Path(__file__).resolve().parent.parent / "admin" / "invoice_samples" / "global_cellutions_proforma.json"
+
+
+def make_record(**overrides):
+    record = {
+        "invoice_number": "INV-2026-03-0001",
+        "customer_name": "Test Customer",
+        "line_items": [
+            {"description": "Pallet Storage", "quantity": 10, "days": 30,
+             "unit": "pallet/day", "rate_key": "storage.palletDaily", "frequency": "Monthly"},
+            {"description": "Receiving", "quantity": 10, "rate": 15, "amount": 9999,
+             "frequency": "One-time"},
+        ],
+    }
+    record.update(overrides)
+    return record
+
+
+class InvoiceModelTests(unittest.TestCase):
+    def test_totals_are_computed_from_rates_and_pricing(self):
+        model = invoices.build_invoice_model(
+            make_record(tax_rate=7), pricing={"storage": {"palletDaily": 0.75}}
+        )
+        amounts = [item["amount"] for item in model["line_items"]]
+        self.assertEqual(amounts, [225.0, 150.0])
+        self.assertEqual(model["subtotal"], 375.0)
+        self.assertEqual(model["tax_amount"], 26.25)
+        self.assertEqual(model["total"], 401.25)
+        self.assertEqual(model["recurring_total"], 225.0)
+
+    def test_missing_pricing_key_is_reported(self):
+        with self.assertRaises(ValueError):
+            invoices.build_invoice_model(make_record(), pricing={"storage": {}})
+
+    def test_invoice_number_is_required(self):
+        with self.assertRaises(ValueError):
+            invoices.build_invoice_model(make_record(invoice_number=""), pricing={})
+
+    def test_null_billing_cycle_falls_back_to_one_time(self):
+        record = make_record(billing_cycle=None)
+        record["line_items"][1].pop("frequency")
+        model = invoices.build_invoice_model(record, pricing={"storage": {"palletDaily": 0.75}})
+        self.assertEqual(model["line_items"][1]["frequency"], "One-time")
+
+    def test_load_json_accepts_wrapped_list_with_pricing(self):
+        records, pricing = invoices.load_invoices_json(SAMPLE_PATH)
+        self.assertEqual(len(records), 1)
+        self.assertEqual(pricing["storage"]["palletDaily"], 0.75)
+
+        model = invoices.build_invoice_model(records[0], pricing)
+        self.assertEqual(model["total"], 1700.0)
+        self.assertEqual(model["recurring_total"], 1350.0)
+
+
+class InvoiceNumberingTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.store = invoices.LocalSequenceStore(Path(self.tmp.name) / "sequences.json")
+
+    def test_numbers_are_sequential_per_series_with_one_reservation_each(self):
+        records = [
+            make_record(invoice_number="", issue_date="2026-03-05"),
+            make_record(invoice_number="INV-2026-03-0042", issue_date="2026-03-05"),
+            make_record(invoice_number="", invoice_type="proforma", issue_date="2026-03-05"),
+            make_record(invoice_number="", issue_date="2026-03-20"),
+        ]
+        allocator = invoices.InvoiceNumberAllocator(self.store)
+        assigned = invoices.assign_invoice_numbers(records, allocator)
+
+        # New numbers start above the one already issued in the series
+        self.assertEqual(assigned, {
+            0: "INV-2026-03-0043",
+            2: "MA3PL-PF-20260305-0001",
+            3: "INV-2026-03-0044",
+        })
+        self.assertEqual(records[1]["invoice_number"], "INV-2026-03-0042")
+        self.assertEqual(allocator.reserved["INV-2026-03"], [(43, 44)])
+
+        again = invoices.InvoiceNumberAllocator(self.store).allocate("INV-2026-03", 2)
+        self.assertEqual(again, ["INV-2026-03-0045", "INV-2026-03-0046"])
+
+    def test_random_legacy_numbers_seed_the_series_counter(self):
+        records = [
+            make_record(invoice_number="INV-2026-03-4013", issue_date="2026-03-02"),
+            make_record(invoice_number="INV-2026-03-1359", issue_date="2026-03-02"),
+            make_record(invoice_number="INV-2026-04-9000", issue_date="2026-04-01"),
+            make_record(invoice_number="", issue_date="2026-03-05"),
+        ]
+        allocator = invoices.InvoiceNumberAllocator(self.store)
+        self.assertEqual(invoices.assign_invoice_numbers(records, allocator),
+                         {3: "INV-2026-03-4014"})
+        self.assertIsNone(invoices.invoice_sequence("INV-2026-03-4013", "INV-2026-0"))
+
+    def test_released_numbers_are_recorded_as_gap_runs(self):
+        allocator = invoices.InvoiceNumberAllocator(self.store)
+        numbers = allocator.allocate("INV-2026-04", 5)
+        allocator.release([numbers[1], numbers[2], numbers[4]], reason="render failed")
+
+        gaps = [(gap["start"], gap["end"]) for gap in self.store.gaps("INV-2026-04")]
+        self.assertEqual(gaps, [(2, 3), (5, 5)])
+        self.assertEqual(allocator.allocate("INV-2026-04", 1), ["INV-2026-04-0006"])
+
+    def test_assigned_numbers_are_written_back_to_json_input(self):
+        input_path = Path(self.tmp.name) / "invoices.json"
+        input_path.write_text(json.dumps({
+            "pricing": {"storage": {"palletDaily": 0.75}},
+            "invoices": [make_record(invoice_number="", issue_date="2026-03-05"),
+                         make_record(invoice_number="INV-2026-03-0042", issue_date="2026-03-05")],
+        }), encoding="utf-8")
+        argv = ["render", str(input_path), "--assign-numbers",
+                "--sequence-file", str(self.store.path), "--output-dir", self.tmp.name]
+
+        self.assertEqual(invoices.main(argv), 0)
+        saved = json.loads(input_path.read_text(encoding="utf-8"))
+        numbers = [record["invoice_number"] for record in saved["invoices"]]
+        self.assertEqual(numbers, ["INV-2026-03-0043", "INV-2026-03-0042"])
+
+        # A rerun renders the same invoice under the same number
+        self.assertEqual(invoices.main(argv), 0)
+        self.assertEqual(json.loads(input_path.read_text(encoding="utf-8")), saved)
+        self.assertEqual(invoices.InvoiceNumberAllocator(self.store).allocate("INV-2026-03", 1),
+                         ["INV-2026-03-0044"])
+
+
+class InvoiceRenderTests(unittest.TestCase):
+    def test_render_invoices_writes_one_pdf_per_record(self):
+        records = [make_record(invoice_number=f"INV-2026-03-000{i}") for i in range(1, 3)]
+        records.append(make_record(invoice_number="INV-BROKEN", line_items=[]))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            results = invoices.render_invoices(
+                records, tmp, pricing={"storage": {"palletDaily": 0.75}}
+            )
+            written = sorted(path.name for path in Path(tmp).glob("*.pdf"))
+
+            self.assertEqual(written, [
+                "MiamiAlliance3PL_INV-2026-03-0001.pdf",
+                "MiamiAlliance3PL_INV-2026-03-0002.pdf",
+            ])
+            for name in written:
+                self.assertTrue((Path(tmp) / name).read_bytes().startswith(b"%PDF"))
+
+        errors = [error for _, _, error in results if error]
+        self.assertEqual(len(errors), 1)
+        self.assertIsInstance(errors[0], ValueError)
+
+    def test_shared_template_renders_repeatedly(self):
+        template = invoices.InvoiceTemplate()
+        invoice = invoices.build_invoice_model(
+            make_record(terms=["Net 15"] * 6), pricing={"storage": {"palletDaily": 0.75}}
+        )
+
+        with tempfile.TemporaryDirectory() as tmp:
+            pages = [template.render(invoice, Path(tmp) / f"{i}.pdf") for i in range(3)]
+
+        self.assertEqual(len(set(pages)), 1)
+        self.assertIs(template.box("KEY TERMS", invoice["terms"]),
+                      template.box("KEY TERMS", list(invoice["terms"])))
+
+    def test_render_batch_reports_timing_and_failures(self):
+        records = [make_record(invoice_number=f"INV-2026-03-01{i:02d}") for i in range(4)]
+        records.append(make_record(invoice_number="INV-BROKEN", line_items=[]))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            results, wall_seconds = invoices.render_batch(
+                records, tmp, pricing={"storage": {"palletDaily": 0.75}}, jobs=2
+            )
+            self.assertEqual(len(list(Path(tmp).glob("*.pdf"))), 4)
+
+        summary = invoices.summarize_batch(results, wall_seconds)
+        self.assertEqual(summary["invoices"], 4)
+        self.assertEqual(summary["failed"], 1)
+        self.assertGreater(summary["pages"], 0)
+        self.assertGreater(summary["invoices_per_second"], 0)
+        for result in results:
+            self.assertGreater(result["seconds"], 0)
+
+    def test_long_invoices_are_paginated_with_page_subtotals(self):
+        line_items = [
+            {"description": f"Pick & Pack {i}", "quantity": 1, "rate": 2.5, "unit": "order",
+             "days": 30 if i % 4 == 0 else None}
+            for i in range(400)
+        ]
+        invoice = invoices.build_invoice_model(make_record(line_items=line_items))
+
+        chunks = invoices.paginate_line_items(invoice["line_items"], first_page_height=300)
+        self.assertEqual(chunks[0][0], 0)
+        self.assertEqual(chunks[-1][1], 400)
+        for (_, end), (start, _) in zip(chunks, chunks[1:]):
+            self.assertEqual(end, start)
+
+        tables = [flowable for flowable in invoices.InvoiceTemplate().flowables(invoice)
+                  if isinstance(flowable, invoices.LongTable)]
+        subtotals = [float(table._cellvalues[-1][-1].strip("$").replace(",", ""))
+                     for table in tables]
+        self.assertGreater(len(tables), 10)
+        self.assertAlmostEqual(sum(subtotals), invoice["subtotal"])
+
+        data, _, pages = invoices.render_invoice_bytes(make_record(line_items=line_items))
+        # One page per chunk (no chunk overflowed), plus at most one for the summary
+        self.assertIn(pages, (len(tables), len(tables) + 1))
+
+
+class InvoiceArchiveTests(unittest.TestCase):
+    pricing = {"storage": {"palletDaily": 0.75}}
+
+    def test_render_into_file_like_buffer(self):
+        data, number, pages = invoices.render_invoice_bytes(make_record(), self.pricing)
+        self.assertEqual(number, "INV-2026-03-0001")
+        self.assertEqual(pages, 1)
+        self.assertTrue(data.startswith(b"%PDF"))
+
+    def test_zip_and_tar_archives_hold_one_member_per_invoice(self):
+        records = [make_record(invoice_number=f"INV-2026-03-020{i}") for i in range(3)]
+        records.append(make_record(invoice_number="INV-BROKEN", line_items=[]))
+
+        for suffix, open_members in (
+            (".zip", lambda buf: zipfile.ZipFile(buf).namelist()),
+            (".tar.gz", lambda buf: tarfile.open(fileobj=buf).getnames()),
+        ):
+            buffer = BytesIO()
+            buffer.name = f"month-end{suffix}"
+            with invoices.InvoiceArchive(buffer) as archive:
+                results = invoices.render_invoices_to_archive(records, archive, self.pricing)
+            buffer.seek(0)
+
+            self.assertEqual(sorted(open_members(buffer)), [
+                f"MiamiAlliance3PL_INV-2026-03-020{i}.pdf" for i in range(3)
+            ])
+            self.assertEqual(sum(1 for _, _, error in results if error), 1)
+
+    def test_render_batch_streams_into_archive(self):
+        records = [make_record(invoice_number=f"INV-2026-03-030{i}") for i in range(4)]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            target = Path(tmp) / "batch.zip"
+            with invoices.InvoiceArchive(target) as archive:
+                results, _ = invoices.render_batch(
+                    records, tmp, pricing=self.pricing, jobs=2, archive=archive
+                )
+            self.assertEqual([path.name for path in Path(tmp).iterdir()], ["batch.zip"])
+            with zipfile.ZipFile(target) as bundle:
+                self.assertEqual(len(bundle.namelist()), 4)
+                for name in bundle.namelist():
+                    self.assertTrue(bundle.read(name).startswith(b"%PDF"))
+
+        self.assertTrue(all("data" not in result for result in results))
+
+
+if __name__ == "__main__":
+    unittest.main()